@@ -0,0 +1,295 @@
+#! /usr/bin/env python
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+"""
+Offline benchmark suite for zfdb.
+
+Builds a local toc FDB filled with synthetic GRIB messages and measures view
+open time, single chunk latency, full scan throughput and concurrent throughput
+for each extractor. With '--backend fake' the data is served from memory by
+zfdb.utils.fakes instead, with the latency, bandwidth and jitter given on the
+command line. Results are written as JSON and can be compared against a
+previous run with --baseline.
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import platform
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import eccodes
+import numpy as np
+
+import zfdb
+from zfdb.utils import fakes, synthetic
+
+logger = logging.getLogger(__name__)
+
+SURFACE_PARAMS = [
+    "10u",
+    "10v",
+    "2t",
+    "2d",
+    "msl",
+    "sp",
+    "tcw",
+    "skt",
+    "sst",
+    "tcc",
+    "lsm",
+    "z",
+]
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    values = np.asarray(samples)
+    return {
+        "min": float(values.min()),
+        "mean": float(values.mean()),
+        "p50": float(np.percentile(values, 50)),
+        "p90": float(np.percentile(values, 90)),
+        "p99": float(np.percentile(values, 99)),
+        "max": float(values.max()),
+    }
+
+
+def run_benchmarks(fdb, gribjump, request: dict, extractor: str, args) -> dict:
+    t0 = time.perf_counter()
+    source = zfdb.FdbSource(
+        fdb=fdb,
+        gribjump=gribjump,
+        extractor=extractor,
+        request=zfdb.Request(request=request, chunk_axis=zfdb.ChunkAxisType.DateTime),
+    )
+    view_open = time.perf_counter() - t0
+
+    num_chunks = source.chunks()[0]
+    keys = [(idx, 0, 0, 0) for idx in range(num_chunks)]
+    chunk_nbytes = source.chunk_nbytes(keys[0])
+
+    # Warm up caches of the libraries, not measured
+    source[keys[0]]
+
+    rng = random.Random(args.seed)
+    latencies = []
+    for _ in range(args.iterations):
+        key = rng.choice(keys)
+        t0 = time.perf_counter()
+        source[key]
+        latencies.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    for key in keys:
+        source[key]
+    full_scan = time.perf_counter() - t0
+
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        t0 = time.perf_counter()
+        list(pool.map(source.__getitem__, keys))
+        concurrent_scan = time.perf_counter() - t0
+
+    total_bytes = chunk_nbytes * num_chunks
+    return {
+        "view_open_seconds": view_open,
+        "chunk_count": num_chunks,
+        "chunk_nbytes": chunk_nbytes,
+        "single_chunk_latency_seconds": percentiles(latencies),
+        "full_scan_seconds": full_scan,
+        "full_scan_bytes_per_second": total_bytes / full_scan,
+        "concurrent_scan_seconds": concurrent_scan,
+        "concurrent_scan_bytes_per_second": total_bytes / concurrent_scan,
+    }
+
+
+def compare_with_baseline(results: dict, baseline: dict) -> None:
+    def flatten(d, prefix=""):
+        for k, v in d.items():
+            if isinstance(v, dict):
+                yield from flatten(v, f"{prefix}{k}.")
+            elif isinstance(v, (int, float)):
+                yield f"{prefix}{k}", v
+
+    current = dict(flatten(results["results"]))
+    previous = dict(flatten(baseline["results"]))
+    print(f"{'metric':<70} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, value in current.items():
+        if name not in previous or previous[name] == 0:
+            continue
+        change = (value - previous[name]) / previous[name] * 100
+        print(f"{name:<70} {previous[name]:>12.4g} {value:>12.4g} {change:>+7.1f}%")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument(
+        "-v", "--verbose", help="Enables verbose output", action="store_true"
+    )
+    parser.add_argument(
+        "--grid",
+        help="Regular lat/lon increment in degrees or reduced gaussian grid 'N<n>'",
+        default="1.0",
+    )
+    parser.add_argument(
+        "--start-date", help="First date of the dataset", default="2020-01-01"
+    )
+    parser.add_argument("--dates", help="Number of dates", type=int, default=8)
+    parser.add_argument(
+        "--times",
+        help="Times per date",
+        nargs="+",
+        default=["0000", "0600", "1200", "1800"],
+    )
+    parser.add_argument(
+        "--fields",
+        help=f"Number of surface fields per chunk (max {len(SURFACE_PARAMS)})",
+        type=int,
+        default=4,
+    )
+    parser.add_argument(
+        "--extractor",
+        choices=["eccodes", "gribjump"],
+        nargs="+",
+        default=["eccodes", "gribjump"],
+    )
+    parser.add_argument(
+        "--iterations", help="Samples for chunk latency", type=int, default=64
+    )
+    parser.add_argument(
+        "--workers", help="Threads for concurrent throughput", type=int, default=4
+    )
+    parser.add_argument(
+        "--seed", help="Seed for data and access order", type=int, default=0
+    )
+    parser.add_argument(
+        "--backend",
+        help="Local toc FDB or in-memory fake with injected latency",
+        choices=["fdb", "fake"],
+        default="fdb",
+    )
+    parser.add_argument(
+        "--fake-latency", help="Seconds per fake call", type=float, default=0.0
+    )
+    parser.add_argument(
+        "--fake-bandwidth", help="Bytes per second of the fake", type=float
+    )
+    parser.add_argument(
+        "--fake-jitter",
+        help="Max additional seconds per fake call",
+        type=float,
+        default=0.0,
+    )
+    parser.add_argument(
+        "--workdir",
+        help="Directory for the FDB, a temporary directory is used if not set",
+        type=Path,
+    )
+    parser.add_argument(
+        "-o", "--output", help="Result file", type=Path, default="benchmark.json"
+    )
+    parser.add_argument(
+        "--baseline", help="Previous result file to compare against", type=Path
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    logging.basicConfig(
+        format="%(asctime)s %(message)s",
+        stream=sys.stdout,
+        level=logging.INFO if args.verbose else logging.WARNING,
+    )
+    if args.fields > len(SURFACE_PARAMS):
+        raise SystemExit(f"At most {len(SURFACE_PARAMS)} fields are supported")
+
+    start = np.datetime64(args.start_date, "D")
+    dataset = synthetic.SyntheticDataset(
+        grid=args.grid,
+        dates=[
+            str(d).replace("-", "")
+            for d in np.arange(start, start + np.timedelta64(args.dates, "D"))
+        ],
+        times=args.times,
+        params=SURFACE_PARAMS[: args.fields],
+        seed=args.seed,
+    )
+
+    with tempfile.TemporaryDirectory(prefix="zfdb-bench-") as tmp:
+        if args.backend == "fake":
+            latency = fakes.LatencyModel(
+                latency=args.fake_latency,
+                bandwidth=args.fake_bandwidth,
+                jitter=args.fake_jitter,
+                seed=args.seed,
+            )
+            fdb = fakes.FakeFdb(retrieve_latency=latency, list_latency=latency)
+            gribjump = fakes.FakeGribJump(fdb, latency=latency)
+        else:
+            workdir = args.workdir or Path(tmp)
+            synthetic.configure_environment(*synthetic.create_fdb_config(workdir))
+            # Imported late, the fake backend runs without FDB and GribJump
+            import pyfdb
+            import pygribjump
+
+            fdb = pyfdb.FDB()
+            gribjump = pygribjump.GribJump()
+
+        logger.info(f"Archiving synthetic data into {args.backend}")
+        t0 = time.perf_counter()
+        message_count = synthetic.archive(fdb, dataset.messages())
+        archive_seconds = time.perf_counter() - t0
+
+        request = dataset.mars_request()
+        results = {}
+        for extractor in args.extractor:
+            logger.info(f"Running benchmarks with {extractor}")
+            results[extractor] = run_benchmarks(fdb, gribjump, request, extractor, args)
+
+    output = {
+        "config": {
+            "backend": args.backend,
+            "fake_latency": args.fake_latency,
+            "fake_bandwidth": args.fake_bandwidth,
+            "fake_jitter": args.fake_jitter,
+            "grid": args.grid,
+            "dates": args.dates,
+            "times": args.times,
+            "fields": args.fields,
+            "iterations": args.iterations,
+            "workers": args.workers,
+            "seed": args.seed,
+            "messages": message_count,
+            "archive_seconds": archive_seconds,
+        },
+        "environment": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "eccodes": eccodes.codes_get_api_version(),
+        },
+        "results": results,
+    }
+    args.output.write_text(json.dumps(output, indent=2))
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        compare_with_baseline(output, json.loads(args.baseline.read_text()))
+
+
+if __name__ == "__main__":
+    main()
@@ -307,25 +307,19 @@ def demo_aggeration(
 ) -> None:
     print(f"Running aggregation example on {dataset.name}")
     print("Opening fdb view")
-    fdb_view = zarr.open_group(
-        zfdb.make_anemoi_dataset_like_view(
-            recipe=yaml.safe_load(dataset.recipe.read_text()),
-            fdb=fdb,
-            gribjump=gribjump,
-        ),
-        mode="r",
-        zarr_format=3,
+    store = zfdb.make_anemoi_dataset_like_view(
+        recipe=yaml.safe_load(dataset.recipe.read_text()),
+        fdb=fdb,
+        gribjump=gribjump,
     )
+    fdb_view = zarr.open_group(store, mode="r", zarr_format=3)
     variable_names = fdb_view["data"].attrs["variables"]
-    means_per_sample = []
     print(
         f"Computing means for {len(variable_names)} variables on {fdb_view['data'].shape[0]} dates with {fdb_view['data'].shape[3]} values per field"
     )
     print(fdb_view["data"])
-    for sample in tqdm.tqdm(fdb_view["data"]):
-        means_per_variable = np.mean(sample, axis=2).squeeze()
-        means_per_sample.append(means_per_variable)
-    means = np.mean(means_per_sample, axis=0)
+    # Reduced next to the data, only one value per variable is returned
+    means = store.datasource("data").reduce("mean", axes=(0, 2, 3))
     print("Means for each vaiable:")
     print("\n".join([f"\t{name} = {val}" for name, val in zip(variable_names, means)]))
 
@@ -0,0 +1,238 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+"""
+Batched chunk transfer between the zfdb server and clients.
+
+A batch response is a sequence of length-prefixed frames, one per requested
+key and in request order. Each frame starts with a little-endian signed 64 bit
+length followed by that many bytes of payload. A length of -1 marks a key that
+does not exist.
+"""
+
+import asyncio
+import json
+import struct
+from typing import AsyncIterator, Iterable
+
+import aiohttp
+from zarr.abc import store
+from zarr.core.buffer import Buffer, BufferPrototype, default_buffer_prototype
+
+_LENGTH = struct.Struct("<q")
+_MISSING = -1
+
+
+def pack_frames(values: Iterable[bytes | None]) -> bytes:
+    parts = []
+    for value in values:
+        if value is None:
+            parts.append(_LENGTH.pack(_MISSING))
+        else:
+            parts.append(_LENGTH.pack(len(value)))
+            parts.append(value)
+    return b"".join(parts)
+
+
+def unpack_frames(data: bytes) -> list[bytes | None]:
+    view = memoryview(data)
+    values = []
+    offset = 0
+    while offset < len(view):
+        (length,) = _LENGTH.unpack_from(view, offset)
+        offset += _LENGTH.size
+        if length == _MISSING:
+            values.append(None)
+        else:
+            values.append(bytes(view[offset : offset + length]))
+            offset += length
+    return values
+
+
+class BatchHttpStore(store.Store):
+    """
+    Read-only zarr store for a view opened on the zfdb server.
+
+    Concurrent `get` calls, as issued by zarr when reading a selection that
+    spans several chunks, are collected and sent as a single request to the
+    batch endpoint. Byte range requests bypass batching.
+
+    Parameters
+    ----------
+    url : str
+        Base url of the server, e.g. 'http://localhost:5000'
+    view_hash : int | str
+        Hash of the view as returned by '/create'
+    max_batch_size : int
+        Upper limit of keys sent in one batch request
+    """
+
+    def __init__(self, url: str, view_hash: int | str, max_batch_size: int = 256):
+        super().__init__(read_only=True)
+        self._url = url.rstrip("/")
+        self._view_hash = view_hash
+        self._max_batch_size = max_batch_size
+        self._session: aiohttp.ClientSession | None = None
+        self._pending: dict[str, list[asyncio.Future]] = {}
+        self._flush_scheduled = False
+        # The event loop only keeps weak references to tasks, in flight
+        # batches are kept alive here until they completed
+        self._tasks: set[asyncio.Task] = set()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    async def close_session(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _chunk_url(self, key: str) -> str:
+        return f"{self._url}/get/zarr/{self._view_hash}/{key}"
+
+    def _batch_url(self) -> str:
+        return f"{self._url}/get/batch/{self._view_hash}"
+
+    def __eq__(self, value: object) -> bool:
+        return (
+            isinstance(value, BatchHttpStore)
+            and self._url == value._url
+            and self._view_hash == value._view_hash
+        )
+
+    async def get(
+        self,
+        key: str,
+        prototype: BufferPrototype = default_buffer_prototype(),
+        byte_range: store.ByteRequest | None = None,
+    ) -> Buffer | None:
+        if byte_range is not None:
+            return await self._get_range(key, prototype, byte_range)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(key, []).append(future)
+        if len(self._pending) >= self._max_batch_size:
+            self._flush()
+        elif not self._flush_scheduled:
+            # Defer sending until all gets issued in this loop iteration are queued
+            self._flush_scheduled = True
+            loop.call_soon(self._flush)
+        value = await future
+        return None if value is None else prototype.buffer.from_bytes(value)
+
+    def _flush(self) -> None:
+        self._flush_scheduled = False
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        task = asyncio.ensure_future(self._send_batch(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send_batch(self, pending: dict[str, list[asyncio.Future]]) -> None:
+        keys = list(pending)
+        try:
+            session = await self._get_session()
+            async with session.post(
+                self._batch_url(),
+                data=json.dumps({"keys": keys}),
+                headers={"Content-Type": "application/json"},
+            ) as response:
+                response.raise_for_status()
+                values = unpack_frames(await response.read())
+            if len(values) != len(keys):
+                raise RuntimeError(
+                    f"Batch response contains {len(values)} values for {len(keys)} keys"
+                )
+        except Exception as e:
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+        for key, value in zip(keys, values):
+            for future in pending[key]:
+                if not future.done():
+                    future.set_result(value)
+
+    async def _get_range(
+        self, key: str, prototype: BufferPrototype, byte_range: store.ByteRequest
+    ) -> Buffer | None:
+        if isinstance(byte_range, store.RangeByteRequest):
+            header = f"bytes={byte_range.start}-{byte_range.end - 1}"
+        elif isinstance(byte_range, store.OffsetByteRequest):
+            header = f"bytes={byte_range.offset}-"
+        else:
+            header = f"bytes=-{byte_range.suffix}"
+        session = await self._get_session()
+        async with session.get(self._chunk_url(key), headers={"Range": header}) as r:
+            if r.status == 404:
+                return None
+            r.raise_for_status()
+            return prototype.buffer.from_bytes(await r.read())
+
+    async def get_partial_values(
+        self,
+        prototype: BufferPrototype,
+        key_ranges: Iterable[tuple[str, store.ByteRequest | None]],
+    ) -> list[Buffer | None]:
+        return await asyncio.gather(
+            *[self.get(key, prototype, byte_range) for key, byte_range in key_ranges]
+        )
+
+    async def exists(self, key: str) -> bool:
+        """
+        Requests only the first byte of the chunk, an empty chunk exists but
+        cannot satisfy the range (416).
+        """
+        session = await self._get_session()
+        async with session.get(
+            self._chunk_url(key), headers={"Range": "bytes=0-0"}
+        ) as r:
+            if r.status == 404:
+                return False
+            if r.status != 416:
+                r.raise_for_status()
+            return True
+
+    @property
+    def supports_writes(self) -> bool:
+        return False
+
+    async def set(self, key: str, value: Buffer) -> None:
+        raise NotImplementedError()
+
+    @property
+    def supports_deletes(self) -> bool:
+        return False
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError()
+
+    @property
+    def supports_partial_writes(self) -> bool:
+        return False
+
+    async def set_partial_values(self, key_start_values) -> None:
+        raise NotImplementedError()
+
+    @property
+    def supports_listing(self) -> bool:
+        return False
+
+    def list(self) -> AsyncIterator[str]:
+        raise NotImplementedError()
+
+    def list_prefix(self, prefix: str) -> AsyncIterator[str]:
+        raise NotImplementedError()
+
+    def list_dir(self, prefix: str) -> AsyncIterator[str]:
+        raise NotImplementedError()
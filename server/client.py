@@ -14,6 +14,7 @@ import json
 
 import requests
 import zarr
+from batch import BatchHttpStore
 
 view = {
     "requests": [
@@ -69,6 +70,23 @@ async def main():
 
     await session.close()
 
+    # Same access through the batch endpoint, all chunks are fetched in one request
+    batch_store = BatchHttpStore("http://localhost:5000", hash)
+    z_grp = await zarr.api.asynchronous.open_group(
+        store=batch_store, mode="r", zarr_format=3, use_consolidated=False
+    )
+    data = await z_grp.getitem("data")
+    print(await data.getitem((slice(0, 5), 0, 0, slice(0, 10))))
+    await batch_store.close_session()
+
+    # Mean of every field over all grid points, computed on the server
+    response = requests.post(
+        f"http://localhost:5000/reduce/{hash}",
+        headers=headers,
+        data=json.dumps({"operation": "mean", "axes": [2, 3]}),
+    )
+    print(response.json()["values"])
+
 
 if __name__ == "__main__":
     loop = asyncio.get_event_loop()
@@ -15,17 +15,112 @@ import logging
 import os
 import pathlib
 import sys
+import time
 
+import numpy as np
 import pyfdb
 import pygribjump
-from flask import Flask, Response, jsonify, request
+from batch import pack_frames
+from flask import Flask, Response, g, jsonify, request
+from metrics import Registry
+from zarr.abc.store import RangeByteRequest
 
 import zfdb
+from zfdb.error import ZfdbError
+from zfdb.grids import set_grid_cache_directory
 
 app = Flask(__name__)
+logger = logging.getLogger(__name__)
 
 view_hashes = {}
 
+metrics = Registry()
+requests_total = metrics.counter(
+    "zfdb_http_requests_total",
+    "Number of handled HTTP requests",
+    ("route", "method", "status"),
+)
+request_duration = metrics.histogram(
+    "zfdb_http_request_duration_seconds",
+    "Time from receiving a request until the response is ready to be written",
+    ("route",),
+)
+stage_duration = metrics.histogram(
+    "zfdb_stage_duration_seconds",
+    "Time spent in each processing stage of a request",
+    ("stage",),
+)
+bytes_served = metrics.counter(
+    "zfdb_bytes_served_total", "Number of response body bytes served", ("route",)
+)
+requests_in_flight = metrics.gauge(
+    "zfdb_http_requests_in_flight", "Number of requests currently being processed"
+)
+open_views = metrics.gauge("zfdb_open_views", "Number of views currently opened")
+view_cache_requests = metrics.counter(
+    "zfdb_view_cache_requests_total",
+    "Lookups of views on '/create', by result (hit or miss)",
+    ("result",),
+)
+
+
+def observe_chunk_span(span: zfdb.ChunkSpan):
+    for stage, seconds in span.stages.items():
+        stage_duration.observe(seconds, stage=f"chunk_{stage}")
+
+
+chunk_tracer = zfdb.CallbackTracer(observe_chunk_span)
+
+# Set with --chunk-log, records every chunk access of every view
+chunk_log: zfdb.JsonlTracer | None = None
+
+
+def make_chunk_tracer(view: str) -> zfdb.Tracer:
+    if chunk_log is None:
+        return chunk_tracer
+    view_log = chunk_log.with_view(view)
+
+    def on_chunk(span: zfdb.ChunkSpan):
+        observe_chunk_span(span)
+        view_log.on_chunk(span)
+
+    return zfdb.CallbackTracer(on_chunk)
+
+
+@app.before_request
+def start_request_metrics():
+    g.request_start = time.perf_counter()
+    requests_in_flight.inc()
+
+
+@app.after_request
+def record_request_metrics(response):
+    route = request.url_rule.rule if request.url_rule else "<unmatched>"
+    ready = time.perf_counter()
+    request_duration.observe(ready - g.request_start, route=route)
+    requests_total.inc(route=route, method=request.method, status=response.status_code)
+    if response.content_length:
+        bytes_served.inc(response.content_length, route=route)
+    response.call_on_close(
+        lambda: stage_duration.observe(
+            time.perf_counter() - ready, stage="response_write"
+        )
+    )
+    return response
+
+
+@app.teardown_request
+def finish_request_metrics(_exception):
+    requests_in_flight.dec()
+
+
+@app.route("/metrics", methods=["GET"])
+def export_metrics():
+    open_views.set(len(view_hashes))
+    return Response(
+        response=metrics.render(), status=200, content_type=Registry.CONTENT_TYPE
+    )
+
 
 def map_requests_from_json(json) -> list[zfdb.Request]:
     return [
@@ -42,22 +137,28 @@ def process_json():
     hashed_request = hash(json.dumps(data))
 
     if hashed_request not in view_hashes:
+        view_cache_requests.inc(result="miss")
         try:
             requests = map_requests_from_json(data)
-            mapping = zfdb.make_forecast_data_view(
-                request=requests,
-                fdb=fdb,
-                gribjump=gribjump,
-            )
+            with stage_duration.time(stage="view_create"):
+                mapping = zfdb.make_forecast_data_view(
+                    request=requests,
+                    fdb=fdb,
+                    gribjump=gribjump,
+                    tracer=make_chunk_tracer(str(hashed_request)),
+                    data_type=data.get("data_type", "float32"),
+                )
         except Exception as e:
             logger.info(f"Create view failed with exception: {e}")
             return jsonify({"error": f"Invalid Request - {e}"}), 400
 
         view_hashes[hashed_request] = mapping
+        open_views.set(len(view_hashes))
         logger.debug(
             f"Created new zfdb view {hashed_request}, {len(view_hashes)} views are now opened"
         )
     else:
+        view_cache_requests.inc(result="hit")
         logger.debug("Using create request")
 
     return Response(
@@ -74,15 +175,111 @@ async def retrieve_zarr(hash, zarr_path):
     except KeyError:
         return Response(response=f"Couldn't find hash in {hash}", status=500)
 
+    byte_range = request.range
+    if byte_range is not None and len(byte_range.ranges) != 1:
+        return Response(response="Only single byte ranges are supported", status=416)
+
+    t0 = time.perf_counter()
     try:
-        content = await mapping[zarr_path]
+        if byte_range is None:
+            content = await mapping[zarr_path]
+        else:
+            size = await mapping.getsize(zarr_path)
+            content_range = byte_range.make_content_range(size)
+            if content_range is None:
+                return Response(
+                    status=416, headers={"Content-Range": f"bytes */{size}"}
+                )
+            content = await mapping.get(
+                zarr_path,
+                byte_range=RangeByteRequest(content_range.start, content_range.stop),
+            )
     except KeyError:
         return Response(
             response=f"Didn't find {zarr_path} for mapping of hash {int(hash)}",
             status=404,
         )
+    stage_duration.observe(time.perf_counter() - t0, stage="assembly")
+
+    if byte_range is None:
+        return Response(response=content.to_bytes(), status=200)
+    return Response(
+        response=content.to_bytes(),
+        status=206,
+        headers={"Content-Range": content_range.to_header()},
+    )
+
+
+@app.route("/get/batch/<hash>", methods=["POST"])
+async def retrieve_zarr_batch(hash):
+    """
+    Returns all requested keys of a view in one response, see `batch.pack_frames`
+    for the framing. Chunks of the same array are extracted in a single batch.
+    """
+    try:
+        mapping = view_hashes[int(hash)]
+    except KeyError:
+        return Response(response=f"Couldn't find hash in {hash}", status=500)
+
+    data = request.get_json()
+    if not data or not isinstance(data.get("keys"), list):
+        return jsonify({"error": "Expected a list of 'keys'"}), 400
+    keys = data["keys"]
+
+    t0 = time.perf_counter()
+    # Unknown or malformed keys are returned as missing frames
+    known = [key for key in keys if isinstance(key, str) and key in mapping]
+    values = dict(zip(known, await mapping.get_many(known)))
+    values = [values.get(key) if isinstance(key, str) else None for key in keys]
+    stage_duration.observe(time.perf_counter() - t0, stage="assembly")
+
+    logger.debug(f"Serving batch of {len(keys)} keys for view {int(hash)}")
+    return Response(
+        response=pack_frames(None if v is None else v.to_bytes() for v in values),
+        status=200,
+        content_type="application/octet-stream",
+    )
+
+
+@app.route("/reduce/<hash>", methods=["POST"])
+def reduce_array(hash):
+    """
+    Reduces an array of a view next to the data and returns only the result.
+
+    Expects {"operation": "mean", "axes": [0, 2, 3]} with the optional keys
+    "array" (defaults to "data") and "selection", indices per axis the
+    reduction is restricted to, e.g. {"3": [0, 1, 2]}. Responds with
+    {"shape": [...], "values": [...]}, NaN results are returned as null.
+    """
+    try:
+        mapping = view_hashes[int(hash)]
+    except KeyError:
+        return Response(response=f"Couldn't find hash in {hash}", status=500)
 
-    return Response(response=content.to_bytes(), status=200)
+    data = request.get_json()
+    if not data or "operation" not in data:
+        return jsonify({"error": "Expected an 'operation'"}), 400
+    try:
+        datasource = mapping.datasource(data.get("array", "data"))
+    except KeyError:
+        return jsonify({"error": f"Unknown array {data.get('array')}"}), 404
+    if not hasattr(datasource, "reduce"):
+        return jsonify({"error": "Array does not support reductions"}), 400
+
+    try:
+        with stage_duration.time(stage="reduce"):
+            result = datasource.reduce(
+                data["operation"],
+                data.get("axes", []),
+                selection=data.get("selection"),
+            )
+    except ZfdbError as e:
+        return jsonify({"error": f"Invalid reduction - {e}"}), 400
+
+    values = result.astype(object)
+    if result.dtype.kind == "f":
+        values[np.isnan(result)] = None
+    return jsonify({"shape": list(result.shape), "values": values.tolist()})
 
 
 def log_environment():
@@ -146,6 +343,20 @@ def parse_args():
         type=pathlib.Path,
         default=None,
     )
+    parser.add_argument(
+        "--chunk-log",
+        help="Appends every chunk access as a JSON line to this file, see tools/retracer",
+        type=pathlib.Path,
+        default=None,
+    )
+
+    parser.add_argument(
+        "--grid-cache",
+        help="Directory in which grid coordinates are stored and shared between workers, "
+        "defaults to ZFDB_GRID_CACHE",
+        type=pathlib.Path,
+        default=None,
+    )
 
     return parser.parse_args()
 
@@ -162,8 +373,10 @@ if __name__ == "__main__":
     logging.basicConfig(
         format="%(asctime)s %(message)s", stream=sys.stdout, level=log_level
     )
-    global logger
-    logger = logging.getLogger(__name__)
     logger.info("Statring ZFDB Server")
     connect_to_fdb(args)
+    if args.chunk_log:
+        chunk_log = zfdb.JsonlTracer(args.chunk_log)
+    if args.grid_cache:
+        set_grid_cache_directory(args.grid_cache)
     app.run(debug=args.debug)
@@ -9,28 +9,49 @@
 from .datasources import (
     ConstantValue,
     ConstantValueField,
+    FdbAxesSource,
+    FdbPointsSource,
     FdbSource,
     make_dates_source,
 )
+from .federation import FederatedFdb, FederatedGribJump, Route
 from .mapping import (
     FdbZarrArray,
     FdbZarrGroup,
     FdbZarrStore,
     make_anemoi_dataset_like_view,
     make_forecast_data_view,
+    make_points_view,
 )
+from .region import BoundingBox, Polygon
 from .request import ChunkAxisType, Request
+from .tracing import CallbackTracer, ChunkSpan, JsonlTracer, RecordingTracer, Tracer
+from .utils.chunk_mapper import Axis
 
 __all__ = [
+    "Axis",
+    "BoundingBox",
     "ChunkAxisType",
     "FdbZarrArray",
     "FdbZarrGroup",
     "FdbZarrStore",
+    "FederatedFdb",
+    "FederatedGribJump",
     "Request",
+    "Route",
     "make_anemoi_dataset_like_view",
     "make_forecast_data_view",
+    "make_points_view",
+    "Polygon",
     "ConstantValue",
     "ConstantValueField",
+    "FdbAxesSource",
+    "FdbPointsSource",
     "FdbSource",
     "make_dates_source",
+    "CallbackTracer",
+    "ChunkSpan",
+    "JsonlTracer",
+    "RecordingTracer",
+    "Tracer",
 ]
@@ -11,10 +11,14 @@
 Contains implementations of datasources and factory functions for crating them.
 """
 
+import hashlib
 import itertools
+import json
 import logging
 import math
-from functools import cache
+import operator
+from collections.abc import Iterable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from typing import override
 
 import eccodes
@@ -23,17 +27,32 @@ import pyfdb
 import pygribjump
 from zarr.core.buffer.cpu import Buffer as CpuBuffer
 
+from .decoding import decode_values
 from .error import ZfdbError
+from .grids import grid_coordinates, grid_index
+from .region import GridSelection, Region
 from .request import Request, into_mars_request_dict
+from .tracing import NULL_TRACER, Tracer
+from .utils.chunk_mapper import Axis, ChunkMapper
 from .zarr import (
     ChunkGridMetadata,
     DataSource,
     DotZarrArrayJson,
+    MetadataConfiguration,
     to_cpu_buffer,
 )
 
 log = logging.getLogger(__name__)
 
+REDUCTIONS = ("mean", "sum", "min", "max", "count")
+
+# Data types FDB backed sources can serve, bfloat16 is neither a numpy nor a
+# zarr v3 core data type
+OUTPUT_DTYPES = ("float16", "float32")
+
+# Grid points per chunk of the latitudes and longitudes arrays
+COORDINATES_CHUNK = 1 << 20
+
 
 class ConstantValue(DataSource):
     """
@@ -106,52 +125,152 @@ class ConstantValueField(DataSource):
         return CpuBuffer.from_bytes(self._data.tobytes())
 
     def __contains__(self, key) -> bool:
-        return False
+        return len(key) == len(self._shape) and all(
+            0 <= k < n for k, n in zip(key, self._chunk_counts)
+        )
+
+
+def axis_index(axis) -> int:
+    """
+    Index of an axis given as an integer or a string of digits, e.g. a JSON
+    object key.
+    """
+    try:
+        if isinstance(axis, str):
+            return int(axis)
+        if isinstance(axis, bool):
+            raise TypeError
+        return operator.index(axis)
+    except (TypeError, ValueError):
+        raise ZfdbError(f"Invalid axis {axis!r}, expected an integer")
+
+
+def output_dtype(data_type: str) -> np.dtype:
+    """
+    Data type of the values served by FDB backed sources, one of
+    OUTPUT_DTYPES.
+    """
+    if data_type not in OUTPUT_DTYPES:
+        raise ZfdbError(
+            f"Unsupported output data type '{data_type}', expected one of {OUTPUT_DTYPES}"
+        )
+    return np.dtype(data_type)
+
+
+def check_output_range(values: np.ndarray, key) -> None:
+    """
+    Raises if `values` of chunk `key` overflowed when converted to float16,
+    whose finite range ends at +-65504. GRIB fields hold no infinite values,
+    so every infinite value is an overflow.
+    """
+    if values.dtype == np.float16 and np.isinf(values).any():
+        raise ZfdbError(
+            f"Values of chunk {key} exceed the float16 range of +-65504, "
+            "serve this data as float32"
+        )
+
+
+def zarr_data_type(dtype: np.dtype) -> str | MetadataConfiguration:
+    """
+    Zarr v3 data type of a numpy `dtype`.
+    """
+    dtype = np.dtype(dtype)
+    if dtype.kind in "biuf":
+        return dtype.name
+    if dtype.kind == "M":
+        unit, scale_factor = np.datetime_data(dtype)
+        return MetadataConfiguration(
+            name="numpy.datetime64",
+            configuration={"unit": unit, "scale_factor": scale_factor},
+        )
+    raise ZfdbError(f"Unsupported data type {dtype}")
 
 
 class NDarraySource(DataSource):
     """
     Uses a numpy.ndarray as backend.
+
+    Chunks of `chunk_shape`, by default one chunk for the whole array, are
+    served as views of the array where they are contiguous in memory, e.g.
+    when chunking along the first dimension only. The data type is taken from
+    the array unless `data_type` is given.
     """
 
-    def __init__(self, array: np.ndarray) -> None:
-        self._array = array
+    def __init__(
+        self,
+        array: np.ndarray,
+        data_type: str | None = None,
+        chunk_shape: Sequence[int] | None = None,
+    ) -> None:
+        array = np.asarray(array)
+        dtype = np.dtype(data_type) if data_type else array.dtype
+        self._array = array.astype(dtype.newbyteorder("<"), copy=False)
+        self._data_type = zarr_data_type(dtype)
+        if chunk_shape is None:
+            chunk_shape = array.shape
+        if len(chunk_shape) != array.ndim:
+            raise ZfdbError(
+                f"Chunk shape {tuple(chunk_shape)} does not match array shape {array.shape}"
+            )
+        self._chunk_shape = tuple(max(1, int(c)) for c in chunk_shape)
+        self._chunks = tuple(
+            math.ceil(n / c) for n, c in zip(array.shape, self._chunk_shape)
+        )
 
     @override
     def create_dot_zarr_json(self) -> CpuBuffer:
+        if self._array.dtype.kind == "M":
+            fill_value = int(np.iinfo(np.int64).min)
+        else:
+            fill_value = np.zeros((), dtype=self._array.dtype).item()
         return to_cpu_buffer(
             DotZarrArrayJson(
                 shape=self._array.shape,
-                chunk_grid=ChunkGridMetadata(self._array.shape),
-                data_type="int32",
+                chunk_grid=ChunkGridMetadata(self._chunk_shape),
+                data_type=self._data_type,
+                fill_value=fill_value,
             )
         )
 
     def chunks(self) -> tuple[int, ...]:
-        return (1,) * len(self._array.shape)
+        return self._chunks
+
+    def chunk_shape(self) -> tuple[int, ...]:
+        return self._chunk_shape
 
-    @cache
     def __getitem__(self, key: tuple[int, ...]) -> CpuBuffer:
-        # TODO(kkratz): Currently duplicates memory used because of the caced copy of bytes,
-        # but zarr does not work on a memoryview
-        if len(key) != self._array.ndim:
+        if key not in self:
             raise KeyError
-        if any(x != 0 for x in key):
-            raise KeyError
-        return CpuBuffer.from_array_like(self._array)
+        chunk = self._array[
+            tuple(slice(i * c, (i + 1) * c) for i, c in zip(key, self._chunk_shape))
+        ]
+        if chunk.shape != self._chunk_shape:
+            # Chunks at the end of a dimension are padded to the full chunk shape
+            padded = np.zeros(self._chunk_shape, dtype=self._array.dtype)
+            padded[tuple(slice(0, n) for n in chunk.shape)] = chunk
+            chunk = padded
+        return CpuBuffer.from_array_like(
+            np.ascontiguousarray(chunk).reshape(-1).view(dtype="B")
+        )
 
     def __contains__(self, key) -> bool:
-        if len(key) != self._array.ndim:
-            return False
-        if any(x != 0 for x in key):
-            return False
-        return True
+        return len(key) == len(self._chunks) and all(
+            0 <= i < n for i, n in zip(key, self._chunks)
+        )
 
 
 class FdbSource(DataSource):
     """
     Uses FDB as a backend.
     Data is retrieved from FDB and assembled on each access.
+
+    Values are converted to `data_type` while a chunk is assembled, float16
+    halves the size of chunks. Its finite range ends at +-65504, chunks with
+    larger values, e.g. of surface pressure in Pa or geopotential, raise a
+    ZfdbError instead of serving infinite values.
+
+    With the eccodes extractor, `decoder='numpy'` unpacks simple packed fields
+    with numpy straight into the chunk, other packings are decoded by eccodes.
     """
 
     def __init__(
@@ -161,11 +280,26 @@ class FdbSource(DataSource):
         fdb: pyfdb.FDB | None = None,
         gribjump: pygribjump.GribJump | None = None,
         request: Request | list[Request],
+        tracer: Tracer | None = None,
+        region: Region | None = None,
+        data_type: str = "float32",
+        decoder: str = "eccodes",
     ) -> None:
+        if decoder not in ("eccodes", "numpy"):
+            raise ZfdbError(f"Unknown decoder '{decoder}'")
+        self._decoder = decoder
+        self._dtype = output_dtype(data_type)
+        self._extractor = extractor
+        self._tracer = tracer or NULL_TRACER
+        self._region = region
         if extractor == "eccodes":
             self.extract = self._extract_with_eccodes
+            self.extract_fields = self._extract_fields_with_eccodes
+            self.extract_many = self._extract_many_with_eccodes
         elif extractor == "gribjump":
             self.extract = self._extract_with_gribjump
+            self.extract_fields = self._extract_fields_with_gribjump
+            self.extract_many = self._extract_many_with_gribjump
         else:
             raise ZfdbError("Unkown extractor specified.")
         if not fdb:
@@ -192,8 +326,11 @@ class FdbSource(DataSource):
         field_count = 0
         self._field_names = []
         field_size = None
+        first_message = None
         for msg in messages:
             field_count += 1
+            if first_message is None:
+                first_message = msg.get_buffer()
             self._field_names.append(
                 {"level": msg.get("level"), "name": msg.get("shortName")}
             )
@@ -205,6 +342,14 @@ class FdbSource(DataSource):
                     f"Found different field sizes {field_size} and {this_field_size}"
                 )
 
+        self._selection = None
+        if region is not None:
+            self._selection = GridSelection.from_region(
+                region, *grid_coordinates(first_message)
+            )
+            self._points = self._selection.indices()
+            field_size = self._selection.size
+
         # TODO(kkratz): This needs to be made generic
         num_chunks = len(self._requests[0].chunk_axis())
         self._shape = (num_chunks, field_count, int(1), field_size)
@@ -219,13 +364,37 @@ class FdbSource(DataSource):
             DotZarrArrayJson(
                 shape=self._shape,
                 chunk_grid=ChunkGridMetadata(chunks=self._chunks),
-                data_type="float32",
+                data_type=self._dtype.name,
+                fill_value="NaN",
             )
         )
 
     def chunks(self) -> tuple[int, ...]:
         return self._chunks_per_dimension
 
+    def chunk_shape(self) -> tuple[int, ...]:
+        return self._chunks
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._dtype
+
+    def fingerprint(self) -> str:
+        """
+        Identifies the data of this view: the planned requests and the fields
+        found for them.
+        """
+        description = json.dumps(
+            [
+                [r.fingerprint() for r in self._requests],
+                self._shape,
+                self._field_names,
+                repr(self._region),
+                self._dtype.name,
+            ]
+        )
+        return hashlib.sha256(description.encode()).hexdigest()
+
     def __getitem__(self, key: tuple[int, ...]) -> CpuBuffer:
         if len(key) != len(self._shape):
             raise KeyError
@@ -244,32 +413,618 @@ class FdbSource(DataSource):
             return False
         return True
 
-    def _extract_with_eccodes(self, key) -> CpuBuffer:
-        buffer = np.zeros(self._chunks, dtype="float32")
-        streams = [
-            eccodes.StreamReader(self._fdb.retrieve(r[key[0]])) for r in self._requests
-        ]
-        for idx, msg in enumerate(itertools.chain.from_iterable(streams)):
-            buffer[0, idx, 0, :] = msg.data
-        return CpuBuffer(np.ravel(buffer).view(dtype="b"))
+    @override
+    def get_many(self, keys: list[tuple[int, ...]]) -> list[CpuBuffer]:
+        if any(key not in self for key in keys):
+            raise KeyError
+        return self.extract_many(keys)
 
-    def _extract_with_gribjump(self, key) -> CpuBuffer:
-        polyrequests = [
-            [
-                (list_result["keys"], [(0, self._shape[3])])
-                for list_result in self._fdb.list(r[key[0]], keys=True)
+    @override
+    def chunk_nbytes(self, key: tuple[int, ...]) -> int:
+        if key not in self:
+            raise KeyError
+        return math.prod(self._chunks) * self._dtype.itemsize
+
+    @override
+    def get_byte_range(self, key: tuple[int, ...], byte_range: slice) -> CpuBuffer:
+        """
+        Only the fields overlapping `byte_range` are extracted, with gribjump
+        the extraction is further limited to the overlapping values.
+        """
+        nbytes = self.chunk_nbytes(key)
+        start, stop, _ = byte_range.indices(nbytes)
+        if start >= stop:
+            return CpuBuffer.from_bytes(b"")
+        if start == 0 and stop == nbytes:
+            return self.extract(key)
+
+        itemsize = self._dtype.itemsize
+        field_size = self._shape[3]
+        first_value = start // itemsize
+        last_value = (stop - 1) // itemsize
+        first_field = first_value // field_size
+        last_field = last_value // field_size
+
+        with self._tracer.span(key, self._extractor) as span:
+            with span.stage("list"):
+                fields = self._list_fields(key[0])[first_field : last_field + 1]
+            value_ranges = [
+                (
+                    max(first_value - idx * field_size, 0),
+                    min(last_value + 1 - idx * field_size, field_size),
+                )
+                for idx in range(first_field, last_field + 1)
             ]
+            values = self.extract_fields(list(zip(fields, value_ranges)), span)
+            with span.stage("copy"):
+                values = np.concatenate(values).astype(self._dtype)
+                check_output_range(values, key)
+                offset = start - first_value * itemsize
+                result = CpuBuffer.from_bytes(
+                    values.view(dtype="b")[offset : offset + stop - start].tobytes()
+                )
+            span.nbytes = stop - start
+            span.field_count = len(fields)
+        return result
+
+    def reduce(
+        self,
+        operation: str,
+        axes: Sequence[int] = (),
+        *,
+        selection: dict[int, Sequence[int]] | None = None,
+        workers: int = 4,
+    ) -> np.ndarray:
+        """
+        Reduces the data with `operation` over `axes` without materialising
+        it, every chunk is reduced to a partial aggregate right after it was
+        extracted.
+
+        Parameters
+        ----------
+        operation : str
+            One of 'mean', 'sum', 'min', 'max' or 'count', missing values (NaN)
+            are ignored.
+        axes : Sequence[int]
+            Axes reduced over, all other axes are kept.
+        selection : dict[int, Sequence[int]] | None
+            Indices per axis the reduction is restricted to, e.g. {3: [0, 5]}
+            only considers the first and sixth grid point.
+        workers : int
+            Number of chunks extracted and reduced concurrently.
+
+        Returns
+        -------
+        np.ndarray
+            float64 array without the reduced axes, int64 for 'count'.
+        """
+        if operation not in REDUCTIONS:
+            raise ZfdbError(
+                f"Unknown reduction '{operation}', expected one of {REDUCTIONS}"
+            )
+        if isinstance(axes, str | bytes) or not isinstance(axes, Iterable):
+            raise ZfdbError(f"Expected a list of axes, got {axes!r}")
+        axes = tuple(sorted({axis_index(a) for a in axes}))
+        if any(a < 0 or a >= len(self._shape) for a in axes):
+            raise ZfdbError(f"Axes {axes} out of range for shape {self._shape}")
+        if selection is not None and not isinstance(selection, Mapping):
+            raise ZfdbError(f"Expected indices per axis, got {selection!r}")
+        indices = [np.arange(n) for n in self._shape]
+        for axis, selected in (selection or {}).items():
+            axis = axis_index(axis)
+            if not 0 <= axis < len(self._shape):
+                raise ZfdbError(f"Axis {axis} out of range for shape {self._shape}")
+            try:
+                selected = np.asarray(selected)
+            except ValueError:
+                selected = None
+            if (
+                selected is None
+                or selected.ndim != 1
+                or selected.size == 0
+                or selected.dtype.kind not in "iu"
+            ):
+                raise ZfdbError(
+                    f"Selection on axis {axis} must be a non empty list of indices"
+                )
+            if np.any((selected < 0) | (selected >= self._shape[axis])):
+                raise ZfdbError(f"Selection on axis {axis} out of range")
+            indices[axis] = selected.astype(np.int64)
+        # Axes of a chunk without the chunked first axis
+        chunk_axes = tuple(a - 1 for a in axes if a != 0)
+        with_sum = operation in ("mean", "sum")
+
+        def partial_aggregate(idx: int) -> list[np.ndarray]:
+            values = self[(int(idx), 0, 0, 0)].as_numpy_array().view(self._dtype)
+            values = values.reshape(self._chunks)[0][np.ix_(*indices[1:])]
+            valid = ~np.isnan(values)
+            if operation == "min":
+                return [np.fmin.reduce(values, axis=chunk_axes, keepdims=True)]
+            if operation == "max":
+                return [np.fmax.reduce(values, axis=chunk_axes, keepdims=True)]
+            partial = [valid.sum(axis=chunk_axes, keepdims=True)]
+            if with_sum:
+                partial.append(
+                    np.where(valid, values, 0).sum(
+                        axis=chunk_axes, keepdims=True, dtype=np.float64
+                    )
+                )
+            return partial
+
+        combine = {"min": np.fmin, "max": np.fmax}.get(operation, np.add)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            partials = pool.map(partial_aggregate, indices[0])
+            if 0 in axes:
+                # Partial aggregates are folded in as they arrive
+                aggregate = next(partials)
+                for partial in partials:
+                    aggregate = [combine(a, p) for a, p in zip(aggregate, partial)]
+                aggregate = [a[np.newaxis] for a in aggregate]
+            else:
+                aggregate = [np.stack(a) for a in zip(*partials)]
+
+        if operation == "mean":
+            count, total = aggregate
+            result = np.full(total.shape, np.nan)
+            np.divide(total, count, out=result, where=count > 0)
+        elif operation == "sum":
+            result = aggregate[1]
+        elif operation == "count":
+            result = aggregate[0].astype(np.int64)
+        else:
+            result = aggregate[0].astype(np.float64)
+        return result.squeeze(axis=axes)
+
+    def _list_fields(self, idx: int) -> list[dict]:
+        """
+        Keys of all fields in chunk `idx`, in the order they appear in the chunk.
+        """
+        return [
+            list_result["keys"]
             for r in self._requests
+            for list_result in self._fdb.list(r[idx], keys=True)
         ]
 
-        gj_results = [
-            self._gribjump.extract(polyrequest) for polyrequest in polyrequests
+    def _extract_fields_with_eccodes(
+        self, fields: list[tuple[dict, tuple[int, int]]], span
+    ) -> list[np.ndarray]:
+        result = []
+        for keys, (begin, end) in fields:
+            with span.stage("retrieve"):
+                stream = self._fdb.retrieve(keys)
+            with span.stage("read"):
+                msg = next(iter(eccodes.StreamReader(stream)))
+            with span.stage("decode"):
+                result.append(self._select_values(msg.data, begin, end))
+        return result
+
+    def _extract_fields_with_gribjump(
+        self, fields: list[tuple[dict, tuple[int, int]]], span
+    ) -> list[np.ndarray]:
+        polyrequest = [
+            (keys, self._value_ranges(*value_range)) for keys, value_range in fields
         ]
-        buffer = np.zeros(self._chunks, dtype="float32")
-        for idx, field in enumerate(itertools.chain.from_iterable(gj_results)):
-            buffer[0, idx, 0, :] = field.values
+        with span.stage("extract"):
+            results = self._gribjump.extract(polyrequest)
+        return [gribjump_values(field) for field in results]
+
+    def _value_ranges(self, begin: int, end: int) -> list[tuple[int, int]]:
+        """
+        Grid point index ranges of values [begin, end) of a field.
+        """
+        if self._selection is None:
+            return [(begin, end)]
+        return self._selection.ranges_for(begin, end)
+
+    def _select_values(self, values: np.ndarray, begin: int, end: int) -> np.ndarray:
+        if self._selection is None:
+            return values[begin:end]
+        return values[self._points[begin:end]]
+
+    def _extract_with_eccodes(self, key) -> CpuBuffer:
+        with self._tracer.span(key, self._extractor) as span:
+            buffer = np.zeros(self._chunks, dtype=self._dtype)
+            with span.stage("retrieve"):
+                streams = [
+                    eccodes.StreamReader(self._fdb.retrieve(r[key[0]]))
+                    for r in self._requests
+                ]
+            messages = span.iterate("read", itertools.chain.from_iterable(streams))
+            for idx, msg in enumerate(messages):
+                if self._decoder == "numpy" and self._selection is None:
+                    with span.stage("decode"):
+                        decode_values(msg, buffer[0, idx, 0, :])
+                    continue
+                with span.stage("decode"):
+                    if self._decoder == "numpy":
+                        values = decode_values(
+                            msg,
+                            np.empty(msg.get("numberOfDataPoints"), dtype=self._dtype),
+                        )
+                    else:
+                        values = msg.data
+                    values = self._select_values(values, 0, self._shape[3])
+                with span.stage("copy"):
+                    buffer[0, idx, 0, :] = values
+            check_output_range(buffer, key)
+            span.nbytes = buffer.nbytes
+            span.field_count = self._chunks[1]
+        return CpuBuffer(np.ravel(buffer).view(dtype="B"))
+
+    def _extract_with_gribjump(self, key) -> CpuBuffer:
+        with self._tracer.span(key, self._extractor) as span:
+            with span.stage("list"):
+                polyrequests = [
+                    [
+                        (list_result["keys"], self._value_ranges(0, self._shape[3]))
+                        for list_result in self._fdb.list(r[key[0]], keys=True)
+                    ]
+                    for r in self._requests
+                ]
+
+            with span.stage("extract"):
+                gj_results = [
+                    self._gribjump.extract(polyrequest) for polyrequest in polyrequests
+                ]
+            buffer = np.zeros(self._chunks, dtype=self._dtype)
+            with span.stage("copy"):
+                for idx, field in enumerate(itertools.chain.from_iterable(gj_results)):
+                    buffer[0, idx, 0, :] = gribjump_values(field)
+            check_output_range(buffer, key)
+            span.nbytes = buffer.nbytes
+            span.field_count = self._chunks[1]
         return CpuBuffer.from_bytes(np.ravel(buffer).view(dtype="b"))
 
+    def _extract_many_with_eccodes(self, keys) -> list[CpuBuffer]:
+        return [self._extract_with_eccodes(key) for key in keys]
+
+    def _extract_many_with_gribjump(self, keys) -> list[CpuBuffer]:
+        """
+        Extracts the fields of all chunks with a single gribjump call.
+        """
+        with self._tracer.span(tuple(keys), self._extractor) as span:
+            field_count = self._chunks[1]
+            polyrequest = []
+            for key in keys:
+                with span.stage("list"):
+                    fields = self._list_fields(key[0])
+                if len(fields) != field_count:
+                    raise ZfdbError(
+                        f"Expected {field_count} fields for chunk {key}, found {len(fields)}"
+                    )
+                value_ranges = self._value_ranges(0, self._shape[3])
+                polyrequest += [(f, value_ranges) for f in fields]
+
+            with span.stage("extract"):
+                results = self._gribjump.extract(polyrequest)
+            buffer = np.zeros((len(keys), *self._chunks[1:]), dtype=self._dtype)
+            with span.stage("copy"):
+                for idx, field in enumerate(results):
+                    buffer[idx // field_count, idx % field_count, 0, :] = (
+                        gribjump_values(field)
+                    )
+            check_output_range(buffer, tuple(keys))
+            span.nbytes = buffer.nbytes
+            span.field_count = len(polyrequest)
+        return [CpuBuffer(np.ravel(chunk).view(dtype="B")) for chunk in buffer]
+
+
+class FdbAxesSource(DataSource):
+    """
+    Uses FDB as a backend with one dimension per `Axis` followed by the grid
+    points of the fields, e.g. axes number, step and param result in the
+    shape (members, steps, params, points).
+
+    Every axis and the grid points are chunked independently, so the layout can
+    follow the access pattern, e.g. one chunk per member. Fields are addressed
+    by their fully specified MARS request, chunks on the edge of the view are
+    padded with NaN.
+
+    With the eccodes extractor all fields of a chunk are retrieved with one
+    request and placed by their MARS keys. `data_type` and `decoder` are
+    handled as by `FdbSource`.
+    """
+
+    def __init__(
+        self,
+        *,
+        extractor: str = "gribjump",
+        fdb: pyfdb.FDB | None = None,
+        gribjump: pygribjump.GribJump | None = None,
+        request: dict,
+        axes: list[Axis],
+        points_chunk: int | None = None,
+        tracer: Tracer | None = None,
+        region: Region | None = None,
+        data_type: str = "float32",
+        decoder: str = "eccodes",
+    ) -> None:
+        if extractor not in ("eccodes", "gribjump"):
+            raise ZfdbError("Unkown extractor specified.")
+        if decoder not in ("eccodes", "numpy"):
+            raise ZfdbError(f"Unknown decoder '{decoder}'")
+        self._decoder = decoder
+        self._dtype = output_dtype(data_type)
+        self._extractor = extractor
+        self._tracer = tracer or NULL_TRACER
+        self._fdb = fdb or pyfdb.FDB()
+        self._gribjump = gribjump or pygribjump.GribJump()
+        self._mapper = ChunkMapper(request, axes)
+
+        _, first_field = next(self._mapper.field_requests((0,) * len(axes)))
+        stream = self._fdb.retrieve(first_field)
+        if stream.size() == 0:
+            raise ZfdbError(f"No data found for {first_field}")
+        first_message = next(iter(eccodes.StreamReader(stream)))
+        field_size = first_message.get("numberOfDataPoints")
+        self._selection = None
+        if region is not None:
+            self._selection = GridSelection.from_region(
+                region, *grid_coordinates(first_message.get_buffer())
+            )
+            self._points = self._selection.indices()
+            field_size = self._selection.size
+        points_chunk = min(points_chunk or field_size, field_size)
+
+        self._dimension_names = [*self._mapper.keys, "values"]
+        self._shape = (*self._mapper.shape, field_size)
+        self._chunks = (*self._mapper.chunks, points_chunk)
+        self._chunks_per_dimension = (
+            *self._mapper.chunk_dimensions,
+            math.ceil(field_size / points_chunk),
+        )
+
+    @override
+    def create_dot_zarr_json(self) -> CpuBuffer:
+        return to_cpu_buffer(
+            DotZarrArrayJson(
+                shape=self._shape,
+                chunk_grid=ChunkGridMetadata(chunks=self._chunks),
+                data_type=self._dtype.name,
+                fill_value="NaN",
+                dimension_names=self._dimension_names,
+            )
+        )
+
+    def chunks(self) -> tuple[int, ...]:
+        return self._chunks_per_dimension
+
+    def chunk_shape(self) -> tuple[int, ...]:
+        return self._chunks
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._dtype
+
+    def __contains__(self, key: tuple[int, ...]) -> bool:
+        return len(key) == len(self._shape) and all(
+            0 <= k < limit for k, limit in zip(key, self._chunks_per_dimension)
+        )
+
+    @override
+    def chunk_nbytes(self, key: tuple[int, ...]) -> int:
+        if key not in self:
+            raise KeyError
+        return math.prod(self._chunks) * self._dtype.itemsize
+
+    def __getitem__(self, key: tuple[int, ...]) -> CpuBuffer:
+        if key not in self:
+            raise KeyError
+        with self._tracer.span(key, self._extractor) as span:
+            begin = key[-1] * self._chunks[-1]
+            end = min(begin + self._chunks[-1], self._shape[-1])
+            field_count = math.prod(
+                s.stop - s.start for s in self._mapper.map(key[:-1]).values()
+            )
+            buffer = np.full(self._chunks, np.nan, dtype=self._dtype)
+            if self._extractor == "gribjump":
+                fields = list(self._mapper.field_requests(key[:-1]))
+                if self._selection is None:
+                    value_ranges = [(begin, end)]
+                else:
+                    value_ranges = self._selection.ranges_for(begin, end)
+                with span.stage("extract"):
+                    results = self._gribjump.extract(
+                        [(request, value_ranges) for _, request in fields]
+                    )
+                with span.stage("copy"):
+                    for (position, _), result in zip(fields, results, strict=True):
+                        buffer[position][: end - begin] = gribjump_values(result)
+            else:
+                request = self._mapper.chunk_request(key[:-1])
+                with span.stage("retrieve"):
+                    stream = self._fdb.retrieve(request)
+                messages = span.iterate("read", eccodes.StreamReader(stream))
+                found = 0
+                for msg in messages:
+                    with span.stage("decode"):
+                        field = {k: message_values(msg, k) for k in self._mapper.keys}
+                        position = self._mapper.field_position(key[:-1], field)
+                        if self._decoder == "numpy":
+                            values = decode_values(
+                                msg,
+                                np.empty(
+                                    msg.get("numberOfDataPoints"), dtype=self._dtype
+                                ),
+                            )
+                        else:
+                            values = msg.data
+                        if self._selection is None:
+                            values = values[begin:end]
+                        else:
+                            values = values[self._points[begin:end]]
+                    with span.stage("copy"):
+                        buffer[position][: end - begin] = values
+                    found += 1
+                if found != field_count:
+                    raise ZfdbError(
+                        f"Expected {field_count} fields for {request}, found {found}"
+                    )
+            check_output_range(buffer, key)
+            span.nbytes = buffer.nbytes
+            span.field_count = field_count
+        return CpuBuffer(np.ravel(buffer).view(dtype="B"))
+
+
+class FdbPointsSource(DataSource):
+    """
+    Uses FDB as a backend, serving the values of all fields at a list of
+    points, e.g. stations, with shape (time, field, point).
+
+    Every point is resolved to its nearest grid point once. With gribjump only
+    the values at these grid points are extracted, so the cost of a chunk
+    depends on the number of points rather than on the grid size. Chunks hold
+    `time_chunk` consecutive chunks of the requests, padded with NaN at the
+    end of the view.
+    """
+
+    def __init__(
+        self,
+        *,
+        extractor: str = "gribjump",
+        fdb: pyfdb.FDB | None = None,
+        gribjump: pygribjump.GribJump | None = None,
+        request: Request | list[Request],
+        points: Sequence[tuple[float, float]],
+        time_chunk: int = 32,
+        tracer: Tracer | None = None,
+    ) -> None:
+        if extractor not in ("eccodes", "gribjump"):
+            raise ZfdbError("Unkown extractor specified.")
+        if len(points) == 0:
+            raise ZfdbError("At least one point is required")
+        self._extractor = extractor
+        self._tracer = tracer or NULL_TRACER
+        self._fdb = fdb or pyfdb.FDB()
+        self._gribjump = gribjump or pygribjump.GribJump()
+        self._requests = [request] if isinstance(request, Request) else request
+
+        streams = [self._fdb.retrieve(r[0]) for r in self._requests]
+        if any(x.size() == 0 for x in streams):
+            raise ZfdbError(
+                "No data found for at least one of the MARS requests defining the view."
+            )
+        messages = list(
+            itertools.chain.from_iterable(eccodes.StreamReader(s) for s in streams)
+        )
+        self._field_names = [
+            {"level": msg.get("level"), "name": msg.get("shortName")}
+            for msg in messages
+        ]
+
+        first_message = messages[0].get_buffer()
+        grid_lat, grid_lon = grid_coordinates(first_message)
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        self.grid_points = grid_index(first_message).nearest(points[:, 0], points[:, 1])
+        self.latitudes = grid_lat[self.grid_points]
+        self.longitudes = grid_lon[self.grid_points]
+        # Points sharing a grid point are extracted once
+        unique_points = np.unique(self.grid_points)
+        self._value_ranges = [
+            (int(b), int(e))
+            for b, e in GridSelection.from_indices(unique_points).ranges
+        ]
+        self._order = np.searchsorted(unique_points, self.grid_points)
+
+        num_times = len(self._requests[0])
+        time_chunk = min(time_chunk, num_times)
+        self._shape = (num_times, len(messages), len(points))
+        self._chunks = (time_chunk, len(messages), len(points))
+        self._chunks_per_dimension = (math.ceil(num_times / time_chunk), 1, 1)
+
+    @override
+    def create_dot_zarr_json(self) -> CpuBuffer:
+        return to_cpu_buffer(
+            DotZarrArrayJson(
+                shape=self._shape,
+                chunk_grid=ChunkGridMetadata(chunks=self._chunks),
+                data_type="float32",
+                fill_value="NaN",
+                dimension_names=["time", "field", "point"],
+            )
+        )
+
+    def chunks(self) -> tuple[int, ...]:
+        return self._chunks_per_dimension
+
+    def __contains__(self, key: tuple[int, ...]) -> bool:
+        return len(key) == len(self._shape) and all(
+            0 <= k < limit for k, limit in zip(key, self._chunks_per_dimension)
+        )
+
+    @override
+    def chunk_nbytes(self, key: tuple[int, ...]) -> int:
+        if key not in self:
+            raise KeyError
+        return math.prod(self._chunks) * np.dtype("float32").itemsize
+
+    def __getitem__(self, key: tuple[int, ...]) -> CpuBuffer:
+        if key not in self:
+            raise KeyError
+        with self._tracer.span(key, self._extractor) as span:
+            begin = key[0] * self._chunks[0]
+            times = range(begin, min(begin + self._chunks[0], self._shape[0]))
+            field_count = self._shape[1]
+            buffer = np.full(self._chunks, np.nan, dtype="float32")
+            if self._extractor == "gribjump":
+                polyrequest = []
+                for idx in times:
+                    with span.stage("list"):
+                        fields = [
+                            list_result["keys"]
+                            for r in self._requests
+                            for list_result in self._fdb.list(r[idx], keys=True)
+                        ]
+                    if len(fields) != field_count:
+                        raise ZfdbError(
+                            f"Expected {field_count} fields for time {idx}, found {len(fields)}"
+                        )
+                    polyrequest += [(f, self._value_ranges) for f in fields]
+                with span.stage("extract"):
+                    results = self._gribjump.extract(polyrequest)
+                with span.stage("copy"):
+                    for idx, result in enumerate(results):
+                        buffer[idx // field_count, idx % field_count] = gribjump_values(
+                            result
+                        )[self._order]
+            else:
+                for time_idx, idx in enumerate(times):
+                    with span.stage("retrieve"):
+                        streams = [
+                            eccodes.StreamReader(self._fdb.retrieve(r[idx]))
+                            for r in self._requests
+                        ]
+                    messages = span.iterate(
+                        "read", itertools.chain.from_iterable(streams)
+                    )
+                    for field_idx, msg in enumerate(messages):
+                        with span.stage("decode"):
+                            buffer[time_idx, field_idx] = msg.data[self.grid_points]
+            span.nbytes = buffer.nbytes
+            span.field_count = len(times) * field_count
+        return CpuBuffer(np.ravel(buffer).view(dtype="B"))
+
+
+def message_values(msg: eccodes.Message, key: str) -> list[str]:
+    """
+    Representations of the value of the MARS keyword `key` of `msg`, params
+    are given by shortName and paramId.
+    """
+    if key == "param":
+        return [msg.get("shortName"), msg.get("paramId", ktype=str)]
+    return [msg.get(key, ktype=str)]
+
+
+def gribjump_values(result) -> np.ndarray:
+    """
+    Values of a gribjump extraction result as one flat array, results of
+    several ranges are concatenated.
+    """
+    values = result.values
+    if isinstance(values, list):
+        return np.concatenate([np.ravel(v) for v in values])
+    return np.ravel(values)
+
 
 def make_dates_source(
     start: np.datetime64, stop: np.datetime64, interval: np.timedelta64
@@ -284,20 +1039,23 @@ def make_dates_source(
 def make_lat_long_sources(
     fdb: pyfdb.FDB,
     request: dict,
+    region: Region | None = None,
 ) -> tuple[NDarraySource, NDarraySource]:
+    """
+    Coordinates of the grid points of the first field of `request`, limited to
+    the points inside `region` if given.
+    """
     request = into_mars_request_dict(request)
-    msg = fdb.retrieve(request)
-    content = msg.read()
-    gid = eccodes.codes_new_from_message(bytes(content))
-    length = int(eccodes.codes_get(gid, "numberOfDataPoints"))
-    lat = np.ndarray(
-        length, dtype="float64", buffer=eccodes.codes_get_double_array(gid, "latitudes")
-    )
-    lon = np.ndarray(
-        length,
-        dtype="float64",
-        buffer=eccodes.codes_get_double_array(gid, "longitudes"),
-    )
-    eccodes.codes_release(gid)
+    stream = fdb.retrieve(request)
+    first_message = next(iter(eccodes.StreamReader(stream)), None)
+    if first_message is None:
+        raise ZfdbError(f"No field found for {request}")
+    lat, lon = grid_coordinates(first_message.get_buffer())
+    if region is not None:
+        points = GridSelection.from_region(region, lat, lon).indices()
+        lat, lon = lat[points], lon[points]
 
-    return NDarraySource(lat), NDarraySource(lon)
+    chunk_shape = (min(len(lat), COORDINATES_CHUNK),)
+    return NDarraySource(lat, chunk_shape=chunk_shape), NDarraySource(
+        lon, chunk_shape=chunk_shape
+    )
@@ -0,0 +1,119 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+"""Decoding
+
+Decoder for simple packed GRIB data that unpacks the data section with numpy,
+other packings are decoded by eccodes.
+"""
+
+from dataclasses import dataclass
+
+import eccodes
+import numpy as np
+
+# Widest values a 64 bit word read at the first byte of a value always covers
+MAX_BITS_PER_VALUE = 57
+
+
+@dataclass(frozen=True)
+class SimplePacking:
+    """
+    Packing parameters of a simple packed field, values are decoded as
+    (reference_value + packed * 2**binary_scale_factor) * 10**-decimal_scale_factor.
+    """
+
+    offset: int
+    count: int
+    bits_per_value: int
+    reference_value: float
+    binary_scale_factor: int
+    decimal_scale_factor: int
+
+    @classmethod
+    def from_message(cls, msg: eccodes.Message) -> "SimplePacking | None":
+        """
+        Packing parameters of `msg`, None if it is not simple packed or has a
+        bitmap.
+        """
+        if msg.get("packingType") != "grid_simple" or msg.get("bitmapPresent"):
+            return None
+        bits_per_value = msg.get("bitsPerValue")
+        if bits_per_value > MAX_BITS_PER_VALUE:
+            return None
+        return cls(
+            offset=msg.get("offsetBeforeData"),
+            count=msg.get("numberOfValues"),
+            bits_per_value=bits_per_value,
+            reference_value=msg.get("referenceValue"),
+            binary_scale_factor=msg.get("binaryScaleFactor"),
+            decimal_scale_factor=msg.get("decimalScaleFactor"),
+        )
+
+    def unpack(self, message: bytes, out: np.ndarray) -> np.ndarray:
+        """
+        Unpacks the values of the GRIB `message` into `out`.
+        """
+        decimal = 10.0 ** (-self.decimal_scale_factor)
+        if self.bits_per_value == 0:
+            out[...] = self.reference_value * decimal
+            return out
+        bits = self.bits_per_value
+        nbytes = (self.count * bits + 7) // 8
+        data = np.frombuffer(message, dtype=np.uint8, count=nbytes, offset=self.offset)
+        if bits in (8, 16, 32):
+            packed = data.view(f">u{bits // 8}")
+        else:
+            # 8 values take `bits` bytes, so within groups of 8 values the
+            # first byte and the bit offset of every value are fixed. Every
+            # column of a group is read as a strided big endian word covering
+            # the value and shifted into place.
+            groups = -(-self.count // 8)
+            width = 4 if bits <= 25 else 8
+            word_type = np.uint32 if width == 4 else np.uint64
+            padded = np.zeros(groups * bits + width, dtype=np.uint8)
+            padded[:nbytes] = data
+            packed = np.empty((groups, 8), dtype=word_type)
+            for column in range(8):
+                first, shift = divmod(column * bits, 8)
+                words = np.ndarray(
+                    (groups,),
+                    dtype=f">u{width}",
+                    buffer=padded,
+                    offset=first,
+                    strides=(bits,),
+                )
+                np.right_shift(
+                    words,
+                    word_type(width * 8 - shift - bits),
+                    out=packed[:, column],
+                    casting="unsafe",
+                )
+            packed &= word_type((1 << bits) - 1)
+            packed = packed.reshape(-1)[: self.count]
+        # Same order of float64 operations as eccodes, rounded once into `out`
+        values = packed * 2.0**self.binary_scale_factor
+        if self.decimal_scale_factor == 0:
+            np.add(values, self.reference_value, out=out, casting="unsafe")
+        else:
+            values += self.reference_value
+            np.multiply(values, decimal, out=out, casting="unsafe")
+        return out
+
+
+def decode_values(msg: eccodes.Message, out: np.ndarray) -> np.ndarray:
+    """
+    Values of the GRIB message `msg` written into `out`, which holds
+    numberOfDataPoints values. Simple packed fields are unpacked with numpy,
+    all others, including fields with a bitmap, are decoded by eccodes.
+    """
+    packing = SimplePacking.from_message(msg)
+    if packing is None:
+        out[...] = msg.data
+        return out
+    return packing.unpack(msg.get_buffer(), out)
@@ -0,0 +1,297 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+"""Federation
+
+Several FDB instances, e.g. one per year or per class, behind the subset of
+`pyfdb.FDB` and `pygribjump.GribJump` used by zfdb. Requests are split by
+routing rules on MARS keys and the parts are fetched concurrently.
+
+    with FederatedFdb(
+        [
+            Route({"date": lambda d: d < "20200101"}, fdb_archive, gribjump_archive),
+            Route({}, fdb_recent, gribjump_recent),
+        ]
+    ) as federation:
+        source = FdbSource(
+            fdb=federation, gribjump=FederatedGribJump(federation), request=...
+        )
+"""
+
+import functools
+import io
+import itertools
+import math
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import eccodes
+import pyfdb
+import pygribjump
+
+from .error import ZfdbError
+from .request import into_mars_representations, is_sequence
+
+Rule = str | Sequence[str] | Callable[[str], bool]
+
+
+@dataclass(frozen=True)
+class Route:
+    """
+    FDB (and GribJump) instance holding the fields whose MARS keys match all
+    rules of `match`. A rule is a value, a sequence of values or a predicate
+    on the value as written in the request, e.g. {"date": lambda d: d < "2020"}.
+    Params are compared by shortName, rules and requests may name a param by
+    shortName or paramId.
+    """
+
+    match: dict[str, Rule]
+    fdb: pyfdb.FDB
+    gribjump: pygribjump.GribJump | None = None
+
+    def accepts(self, key: str, value: str) -> bool:
+        rule = self.match[key]
+        value = _canonical(key, value)
+        if callable(rule):
+            return bool(rule(value))
+        rule = into_mars_representations(rule if is_sequence(rule) else [rule])
+        return value in (_canonical(key, v) for v in rule)
+
+
+@functools.lru_cache(maxsize=None)
+def _short_name(param_id: int) -> str:
+    handle = eccodes.codes_grib_new_from_samples("GRIB2")
+    try:
+        eccodes.codes_set(handle, "paramId", param_id)
+        return eccodes.codes_get(handle, "shortName").lower()
+    finally:
+        eccodes.codes_release(handle)
+
+
+def _canonical(key: str, value: str) -> str:
+    """
+    Representation of `value` routes are matched on, params given by paramId
+    (with or without table) are replaced by their shortName.
+    """
+    if key == "param":
+        param_id = value.split(".")[0]
+        if param_id.isdigit():
+            return _short_name(int(param_id))
+        return value.lower()
+    return value
+
+
+class FederatedDataHandle(io.BytesIO):
+    """
+    Result of `FederatedFdb.retrieve` spanning several FDB instances.
+    """
+
+    def size(self) -> int:
+        return len(self.getbuffer())
+
+
+def _values(key: str, value) -> list[str]:
+    values = (
+        into_mars_representations(value)
+        if is_sequence(value)
+        else str(value).split("/")
+    )
+    if any(v.lower() in ("to", "by") for v in values):
+        raise ZfdbError(f"Ranges cannot be routed, found {key}={value}")
+    return values
+
+
+def _hyperrectangles(
+    combinations: list[tuple[str, ...]],
+) -> list[tuple[str, ...]]:
+    """
+    Covers consecutive `combinations` of a product by as few hyperrectangles as
+    possible while keeping their order, values of a key are joined by "/".
+    """
+    per_key = [list(dict.fromkeys(c)) for c in zip(*combinations)]
+    if len(combinations) == math.prod(len(v) for v in per_key):
+        return [tuple("/".join(v) for v in per_key)]
+    return [
+        (value, *rest)
+        for value, group in itertools.groupby(combinations, key=lambda c: c[0])
+        for rest in _hyperrectangles([c[1:] for c in group])
+    ]
+
+
+class FederatedFdb:
+    """
+    Routes requests to the FDB instances of `routes`.
+
+    Requests are split along the keys used in routing rules, every combination
+    of their values is served by the first route accepting it. A route whose
+    keys are not all specified in a request is asked as well, together with
+    the following ones, e.g. to list partial requests across all instances.
+    Parts of a request are retrieved or listed concurrently with up to
+    `workers` threads and returned in the order of the request expansion.
+    The threads are stopped by `close`, or on leaving a with block.
+    """
+
+    def __init__(self, routes: Sequence[Route], *, workers: int = 4) -> None:
+        if not routes:
+            raise ZfdbError("A federation needs at least one route")
+        self.routes = list(routes)
+        self._keys = list(dict.fromkeys(k for r in self.routes for k in r.match))
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+
+    def close(self) -> None:
+        self._pool.shutdown()
+
+    def __enter__(self) -> "FederatedFdb":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _routes_for(self, values: dict[str, str]) -> list[Route]:
+        routes = []
+        for route in self.routes:
+            if all(route.accepts(k, values[k]) for k in route.match if k in values):
+                routes.append(route)
+                if all(k in values for k in route.match):
+                    return routes
+        if not routes:
+            raise ZfdbError(f"No route accepts {values}")
+        return routes
+
+    def _parts(self, request: dict) -> list[tuple[list[Route], dict]]:
+        """
+        Parts of `request` in the order of its expansion and the routes asked
+        for each of them.
+
+        A request served by several routes is split along all its keys up to
+        the last routed one, following the order of keys in the request, so
+        that consecutive parts continue the expansion of the request.
+        """
+        present = [k for k, v in request.items() if v not in (None, "")]
+        routed = [k for k in present if k in self._keys]
+        values = [_values(k, request[k]) for k in routed]
+        routes_of = {
+            tuple(map(id, routes)): routes
+            for routes in (
+                self._routes_for(dict(zip(routed, c)))
+                for c in itertools.product(*values)
+            )
+        }
+        if len(routes_of) == 1:
+            return [(next(iter(routes_of.values())), request)]
+
+        keys = present[: present.index(routed[-1]) + 1]
+        runs: list[tuple[list[Route], list[tuple[str, ...]]]] = []
+        for combination in itertools.product(*(_values(k, request[k]) for k in keys)):
+            routes = self._routes_for(
+                {k: v for k, v in zip(keys, combination) if k in self._keys}
+            )
+            if runs and list(map(id, runs[-1][0])) == list(map(id, routes)):
+                runs[-1][1].append(combination)
+            else:
+                runs.append((routes, [combination]))
+        return [
+            (routes, request | dict(zip(keys, c)))
+            for routes, combinations in runs
+            for c in _hyperrectangles(combinations)
+        ]
+
+    def split(self, request: dict) -> list[tuple[Route, dict]]:
+        """
+        Parts of `request` and the route serving each of them, in the order of
+        the request expansion.
+        """
+        return [
+            (route, part) for routes, part in self._parts(request) for route in routes
+        ]
+
+    def retrieve(self, request: dict):
+        parts = self._parts(request)
+        if len(parts) == 1 and len(parts[0][0]) == 1:
+            (route,), part = parts[0]
+            return route.fdb.retrieve(part)
+
+        def retrieve(p: tuple[list[Route], dict]) -> bytes:
+            routes, part = p
+            data = b"".join(route.fdb.retrieve(part).read() for route in routes)
+            if not data:
+                raise ZfdbError(f"No data found for {part}")
+            return data
+
+        return FederatedDataHandle(b"".join(self._pool.map(retrieve, parts)))
+
+    def list(self, request: dict, keys: bool = False, **kwargs) -> Iterator[dict]:
+        results = self._pool.map(
+            lambda p: list(p[0].fdb.list(p[1], keys=keys, **kwargs)),
+            self.split(request),
+        )
+        return itertools.chain.from_iterable(results)
+
+    def archive(self, data: bytes, request=None) -> None:
+        """
+        Archives every message of `data` in the instance of its route.
+        """
+        parts: dict[int, tuple[Route, list[bytes]]] = {}
+        for msg in eccodes.StreamReader(io.BytesIO(data)):
+            values = {
+                k: msg.get("shortName" if k == "param" else k, ktype=str)
+                for k in self._keys
+            }
+            values = {k: v for k, v in values.items() if v is not None}
+            route = self._routes_for(values)[-1]
+            parts.setdefault(id(route), (route, []))[1].append(msg.get_buffer())
+        for route, messages in parts.values():
+            route.fdb.archive(b"".join(messages))
+
+    def flush(self) -> None:
+        for route in self.routes:
+            route.fdb.flush()
+
+
+class FederatedGribJump:
+    """
+    Routes the fields of an extraction to the GribJump instances of the routes
+    of `federation`, every instance is called once and concurrently.
+    """
+
+    def __init__(self, federation: FederatedFdb) -> None:
+        if any(route.gribjump is None for route in federation.routes):
+            raise ZfdbError("Every route of the federation needs a GribJump instance")
+        self._federation = federation
+
+    def extract(self, polyrequest, *args, **kwargs) -> list:
+        groups: dict[int, tuple[Route, list[int]]] = {}
+        for idx, (request, _) in enumerate(polyrequest):
+            parts = self._federation.split(request)
+            if len(parts) != 1:
+                raise ZfdbError(
+                    f"Extracted fields must be served by one route: {request}"
+                )
+            route = parts[0][0]
+            groups.setdefault(id(route), (route, []))[1].append(idx)
+
+        def extract(group: tuple[Route, list[int]]) -> list:
+            route, indices = group
+            results = route.gribjump.extract(
+                [polyrequest[idx] for idx in indices], *args, **kwargs
+            )
+            if len(results) != len(indices):
+                raise ZfdbError(
+                    f"Expected {len(indices)} extraction results, got {len(results)}"
+                )
+            return results
+
+        results = [None] * len(polyrequest)
+        groups = list(groups.values())
+        for (_, indices), extracted in zip(
+            groups, self._federation._pool.map(extract, groups)
+        ):
+            for idx, result in zip(indices, extracted):
+                results[idx] = result
+        return results
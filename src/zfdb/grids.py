@@ -0,0 +1,150 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+"""Grids
+
+Process wide cache of the coordinates of the grid points of GRIB grids. Views
+on the same grid share one read only copy of the coordinates, optionally
+memory mapped from a directory that several processes can share, and one
+nearest point index built on first use.
+"""
+
+import hashlib
+import os
+import pathlib
+import threading
+
+import eccodes
+import numpy as np
+
+from .region import GridIndex
+
+GridKey = tuple[str, str, str]
+
+
+def grid_key(message: bytes) -> GridKey:
+    """
+    Key identifying the grid of a GRIB message: gridType, N and
+    md5GridSection.
+    """
+    gid = eccodes.codes_new_from_message(bytes(message))
+    try:
+        return tuple(
+            eccodes.codes_get(gid, key, ktype=str)
+            if eccodes.codes_is_defined(gid, key)
+            else ""
+            for key in ("gridType", "N", "md5GridSection")
+        )
+    finally:
+        eccodes.codes_release(gid)
+
+
+def decode_coordinates(message: bytes) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Latitudes and longitudes of the grid points of a GRIB message.
+    """
+    gid = eccodes.codes_new_from_message(bytes(message))
+    try:
+        lat = np.asarray(eccodes.codes_get_double_array(gid, "latitudes"))
+        lon = np.asarray(eccodes.codes_get_double_array(gid, "longitudes"))
+    finally:
+        eccodes.codes_release(gid)
+    return lat, lon
+
+
+class GridCache:
+    """
+    Coordinates of grids keyed by `grid_key`. Coordinates are decoded once per
+    process, if `directory` is set they are also stored there as .npy files
+    and memory mapped by every process using the same directory. The
+    `GridIndex` of a grid is built once per process.
+    """
+
+    def __init__(self, directory: os.PathLike | str | None = None):
+        self.directory = pathlib.Path(directory) if directory else None
+        self._grids: dict[GridKey, tuple[np.ndarray, np.ndarray]] = {}
+        self._indexes: dict[GridKey, GridIndex] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._grids)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._grids.clear()
+            self._indexes.clear()
+
+    def coordinates(self, message: bytes) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Read only latitudes and longitudes of the grid of a GRIB message.
+        """
+        key = grid_key(message)
+        with self._lock:
+            if key not in self._grids:
+                self._grids[key] = self._load(key, message)
+            return self._grids[key]
+
+    def index(self, message: bytes) -> GridIndex:
+        """
+        Nearest point index of the grid of a GRIB message.
+        """
+        key = grid_key(message)
+        with self._lock:
+            if key not in self._indexes:
+                if key not in self._grids:
+                    self._grids[key] = self._load(key, message)
+                self._indexes[key] = GridIndex(*self._grids[key])
+            return self._indexes[key]
+
+    def _path(self, key: GridKey) -> pathlib.Path:
+        digest = hashlib.sha256("/".join(key).encode()).hexdigest()
+        return self.directory / f"grid-{key[0]}-{digest[:32]}.npy"
+
+    def _load(self, key: GridKey, message: bytes) -> tuple[np.ndarray, np.ndarray]:
+        path = self._path(key) if self.directory else None
+        if path is not None and path.exists():
+            coordinates = np.load(path, mmap_mode="r")
+            return coordinates[0], coordinates[1]
+        coordinates = np.stack(decode_coordinates(message))
+        if path is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, "wb") as f:
+                np.save(f, coordinates)
+            os.replace(tmp, path)
+            coordinates = np.load(path, mmap_mode="r")
+        else:
+            coordinates.setflags(write=False)
+        return coordinates[0], coordinates[1]
+
+
+GRID_CACHE = GridCache(os.environ.get("ZFDB_GRID_CACHE"))
+
+
+def set_grid_cache_directory(directory: os.PathLike | str | None) -> None:
+    """
+    Store the coordinates of the process wide grid cache in `directory`,
+    grids already decoded stay cached in memory.
+    """
+    GRID_CACHE.directory = pathlib.Path(directory) if directory else None
+
+
+def grid_coordinates(message: bytes) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Latitudes and longitudes of the grid points of a GRIB message, shared
+    through the process wide grid cache.
+    """
+    return GRID_CACHE.coordinates(message)
+
+
+def grid_index(message: bytes) -> GridIndex:
+    """
+    Nearest point index of the grid of a GRIB message, shared through the
+    process wide grid cache.
+    """
+    return GRID_CACHE.index(message)
@@ -10,6 +10,7 @@ import json
 import logging
 import re
 from collections.abc import Buffer
+from pathlib import Path
 from typing import AsyncIterator, Iterable
 
 import numpy as np
@@ -23,16 +24,35 @@ from zarr.core.buffer.cpu import Buffer as CpuBuffer
 from zarr.core.common import BytesLike
 
 from .datasources import (
+    FdbPointsSource,
     FdbSource,
+    NDarraySource,
     make_lat_long_sources,
 )
 from .error import ZfdbError
+from .region import Region
 from .request import ChunkAxisType, Request
-from .zarr import FdbZarrArray, FdbZarrGroup
+from .statistics import load_or_compute_statistics
+from .tracing import Tracer
+from .zarr import DataSource, FdbZarrArray, FdbZarrGroup
 
 log = logging.getLogger(__name__)
 
 
+def byte_request_to_slice(byte_range: store.ByteRequest) -> slice:
+    """
+    Translates a zarr ByteRequest into a python slice over the bytes of a value.
+    Suffix requests are expressed as a negative start.
+    """
+    if isinstance(byte_range, store.RangeByteRequest):
+        return slice(byte_range.start, byte_range.end)
+    if isinstance(byte_range, store.OffsetByteRequest):
+        return slice(byte_range.offset, None)
+    if isinstance(byte_range, store.SuffixByteRequest):
+        return slice(-byte_range.suffix, None)
+    raise ZfdbError(f"Unsupported byte request {byte_range}")
+
+
 class FdbZarrStore(store.Store):
     """Provide access to FDB with a MutableMapping.
 
@@ -100,6 +120,22 @@ class FdbZarrStore(store.Store):
     def __iter__(self):
         yield from iter(self._known_paths)
 
+    def datasource(self, path: str) -> DataSource:
+        """
+        Datasource of the array at `path`, e.g. 'data'.
+        """
+        node = self._child
+        for name in filter(None, path.split("/")):
+            if not isinstance(node, FdbZarrGroup):
+                raise KeyError(path)
+            children = {c.name: c for c in node.children}
+            if name not in children:
+                raise KeyError(path)
+            node = children[name]
+        if not isinstance(node, FdbZarrArray):
+            raise KeyError(path)
+        return node.datasource
+
     def __len__(self):
         return len(self._known_paths)
 
@@ -112,7 +148,9 @@ class FdbZarrStore(store.Store):
         pass
 
     def __contains__(self, key) -> bool:
-        return key in self._known_paths
+        if key in (".zmetadata", "zarr.json"):
+            return True
+        return tuple(key.split("/")) in self._child
 
     def __eq__(self, value: object) -> bool:
         return self._child == value._child and self._known_paths == value._known_paths
@@ -123,14 +161,67 @@ class FdbZarrStore(store.Store):
         prototype: BufferPrototype = default_buffer_prototype(),
         byte_range: store.ByteRequest | None = None,
     ) -> Buffer | None:
-        return await self.__getitem__(key)
+        if byte_range is None:
+            return await self.__getitem__(key)
+
+        byte_slice = byte_request_to_slice(byte_range)
+        if key == ".zmetadata":
+            return self._zmetadata[byte_slice]
+        if key == "zarr.json":
+            return self._child._metadata[byte_slice]
+
+        keys = key.split("/")
+        return self._child.get_partial(keys, byte_slice)
 
-    def get_partial_values(
+    async def get_partial_values(
         self,
         prototype: BufferPrototype,
         key_ranges: Iterable[tuple[str, store.ByteRequest | None]],
     ) -> list[Buffer | None]:
-        pass
+        return [
+            await self.get(key, prototype, byte_range) for key, byte_range in key_ranges
+        ]
+
+    async def get_many(self, keys: list[str]) -> list[Buffer | None]:
+        """
+        Fetches all `keys` at once, chunks belonging to the same array are
+        retrieved with a single batched extraction.
+        """
+        result: list[Buffer | None] = [None] * len(keys)
+        positions = []
+        for idx, key in enumerate(keys):
+            if key == ".zmetadata":
+                result[idx] = self._zmetadata
+            elif key == "zarr.json":
+                result[idx] = self._child._metadata
+            else:
+                positions.append(idx)
+        values = self._child.get_many(
+            [tuple(keys[idx].split("/")) for idx in positions]
+        )
+        for idx, value in zip(positions, values, strict=True):
+            result[idx] = value
+        return result
+
+    async def _get_many(
+        self, requests: Iterable[tuple[str, BufferPrototype, store.ByteRequest | None]]
+    ) -> AsyncIterator[tuple[str, Buffer | None]]:
+        requests = list(requests)
+        full_reads = [key for key, _, byte_range in requests if byte_range is None]
+        for key, value in zip(full_reads, await self.get_many(full_reads)):
+            yield key, value
+        for key, prototype, byte_range in requests:
+            if byte_range is not None:
+                yield key, await self.get(key, prototype, byte_range)
+
+    async def getsize(self, key: str) -> int:
+        if key == ".zmetadata":
+            return len(self._zmetadata)
+        if key == "zarr.json":
+            return len(self._child._metadata)
+
+        keys = key.split("/")
+        return self._child.getsize(keys)
 
     async def exists(self, key: str) -> bool:
         return key in self._known_paths
@@ -246,7 +337,28 @@ def make_anemoi_dataset_like_view(
     gribjump: pygribjump.GribJump | None = None,
     recipe: dict,
     extractor: str = "eccodes",
+    tracer: Tracer | None = None,
+    statistics: bool = False,
+    statistics_cache: Path | None = None,
+    statistics_workers: int = 4,
+    region: Region | None = None,
+    data_type: str = "float32",
+    decoder: str = "eccodes",
 ) -> FdbZarrStore:
+    """
+    View shaped like an anemoi dataset built from `recipe`.
+
+    With `region` only the grid points inside it are read, the data and
+    coordinate arrays are limited to those points. The data array is served as
+    `data_type`, 'float32' or 'float16', float16 chunks holding values beyond
+    +-65504 raise a ZfdbError. With `decoder='numpy'` simple packed
+    fields read by the eccodes extractor are unpacked with numpy.
+
+    With `statistics` the per variable statistics and tendency statistics are
+    computed in one pass over the data on creation and served as additional
+    arrays. With `statistics_cache` they are stored in that directory and
+    reused by views of the same data.
+    """
     # get common mars request part
     mars_requests = extract_mars_requests_from_recipe(recipe)
     if not fdb:
@@ -262,7 +374,28 @@ def make_anemoi_dataset_like_view(
         for req in mars_requests
     ]
 
-    lat_src, lon_src = make_lat_long_sources(fdb, mars_requests[0])
+    lat_src, lon_src = make_lat_long_sources(fdb, mars_requests[0], region)
+    data_src = FdbSource(
+        fdb=fdb,
+        gribjump=gribjump,
+        request=requests,
+        extractor=extractor,
+        tracer=tracer,
+        region=region,
+        data_type=data_type,
+        decoder=decoder,
+    )
+    statistics_arrays = []
+    if statistics:
+        statistics_arrays = [
+            FdbZarrArray(name=name, datasource=NDarraySource(values))
+            for name, values in load_or_compute_statistics(
+                data_src,
+                cache=statistics_cache,
+                workers=statistics_workers,
+                tendency_frequency=recipe["dates"]["frequency"],
+            ).items()
+        ]
     return FdbZarrStore(
         FdbZarrGroup(
             children=[
@@ -272,15 +405,8 @@ def make_anemoi_dataset_like_view(
                 # ),
                 FdbZarrArray(name="latitudes", datasource=lat_src),
                 FdbZarrArray(name="longitudes", datasource=lon_src),
-                FdbZarrArray(
-                    name="data",
-                    datasource=FdbSource(
-                        fdb=fdb,
-                        gribjump=gribjump,
-                        request=requests,
-                        extractor=extractor,
-                    ),
-                ),
+                FdbZarrArray(name="data", datasource=data_src),
+                *statistics_arrays,
             ]
         )
     )
@@ -291,6 +417,8 @@ def make_forecast_data_view(
     fdb: pyfdb.FDB | None = None,
     gribjump: pygribjump.GribJump | None = None,
     request: Request | list[Request],
+    tracer: Tracer | None = None,
+    data_type: str = "float32",
 ) -> FdbZarrStore:
     requests = request if isinstance(request, list) else [request]
     # if len(requests) > 1 and not all(
@@ -303,8 +431,55 @@ def make_forecast_data_view(
             children=[
                 FdbZarrArray(
                     name="data",
-                    datasource=FdbSource(fdb=fdb, gribjump=gribjump, request=requests),
+                    datasource=FdbSource(
+                        fdb=fdb,
+                        gribjump=gribjump,
+                        request=requests,
+                        tracer=tracer,
+                        data_type=data_type,
+                    ),
+                ),
+            ]
+        )
+    )
+
+
+def make_points_view(
+    *,
+    fdb: pyfdb.FDB | None = None,
+    gribjump: pygribjump.GribJump | None = None,
+    request: Request | list[Request],
+    points: list[tuple[float, float]],
+    time_chunk: int = 32,
+    extractor: str = "gribjump",
+    tracer: Tracer | None = None,
+) -> FdbZarrStore:
+    """
+    Time series of all fields at `points`, given as (lat, lon). 'data' has the
+    shape (time, field, point), 'latitudes' and 'longitudes' hold the
+    coordinates of the grid points nearest to the points.
+    """
+    source = FdbPointsSource(
+        fdb=fdb,
+        gribjump=gribjump,
+        request=request,
+        points=points,
+        time_chunk=time_chunk,
+        extractor=extractor,
+        tracer=tracer,
+    )
+    return FdbZarrStore(
+        FdbZarrGroup(
+            children=[
+                FdbZarrArray(
+                    name="latitudes",
+                    datasource=NDarraySource(source.latitudes),
+                ),
+                FdbZarrArray(
+                    name="longitudes",
+                    datasource=NDarraySource(source.longitudes),
                 ),
+                FdbZarrArray(name="data", datasource=source),
             ]
         )
     )
@@ -0,0 +1,241 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+"""Regions
+
+Selection of the grid points of a region, stored as sorted index ranges that
+can be handed to gribjump.
+"""
+
+import math
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from .error import ZfdbError
+
+
+@dataclass(frozen=True)
+class BoundingBox:
+    """
+    Area between two latitudes and from `west` eastwards to `east`, boxes may
+    cross the antimeridian, e.g. west=170, east=-170.
+    """
+
+    north: float
+    west: float
+    south: float
+    east: float
+
+    def contains(self, lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+        inside = (lat <= self.north) & (lat >= self.south)
+        if self.east - self.west >= 360:
+            return inside
+        width = (self.east - self.west) % 360
+        return inside & ((lon - self.west) % 360 <= width)
+
+
+@dataclass(frozen=True)
+class Polygon:
+    """
+    Area enclosed by the (lat, lon) `vertices`, the polygon is closed
+    implicitly. Longitudes of the grid are compared in the range starting at
+    the westernmost vertex.
+    """
+
+    vertices: Sequence[tuple[float, float]]
+
+    def contains(self, lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+        vertices = np.asarray(self.vertices, dtype=np.float64)
+        if vertices.ndim != 2 or len(vertices) < 3:
+            raise ZfdbError("A polygon needs at least 3 (lat, lon) vertices")
+        lon0 = vertices[:, 1].min()
+        lon = (lon - lon0) % 360 + lon0
+        inside = np.zeros(lat.shape, dtype=bool)
+        # Even-odd rule, a ray towards the east crosses the edges
+        for (lat1, lon1), (lat2, lon2) in zip(vertices, np.roll(vertices, -1, axis=0)):
+            if lat1 == lat2:
+                continue
+            crosses = (lat1 > lat) != (lat2 > lat)
+            lon_at_lat = lon1 + (lat - lat1) * (lon2 - lon1) / (lat2 - lat1)
+            inside ^= crosses & (lon < lon_at_lat)
+        return inside
+
+
+Region = BoundingBox | Polygon
+
+
+class GridSelection:
+    """
+    Sorted grid point indices stored as half open index ranges. Positions in
+    the compact array of selected points are translated back into ranges of
+    grid point indices.
+    """
+
+    def __init__(self, ranges: np.ndarray):
+        self.ranges = np.asarray(ranges, dtype=np.int64).reshape(-1, 2)
+        lengths = self.ranges[:, 1] - self.ranges[:, 0]
+        self._offsets = np.concatenate([[0], np.cumsum(lengths)])
+
+    @classmethod
+    def from_mask(cls, mask: np.ndarray) -> "GridSelection":
+        return cls.from_indices(np.flatnonzero(mask))
+
+    @classmethod
+    def from_indices(cls, indices: np.ndarray) -> "GridSelection":
+        """
+        Selection of the sorted, unique grid point `indices`.
+        """
+        if len(indices) == 0:
+            raise ZfdbError("Region does not contain any grid points")
+        breaks = np.flatnonzero(np.diff(indices) != 1) + 1
+        starts = indices[np.concatenate([[0], breaks])]
+        ends = indices[np.concatenate([breaks - 1, [len(indices) - 1]])] + 1
+        return cls(np.stack([starts, ends], axis=1))
+
+    @classmethod
+    def from_region(
+        cls, region: Region, lat: np.ndarray, lon: np.ndarray
+    ) -> "GridSelection":
+        return cls.from_mask(region.contains(lat, lon))
+
+    @property
+    def size(self) -> int:
+        return int(self._offsets[-1])
+
+    def indices(self) -> np.ndarray:
+        return np.concatenate([np.arange(b, e) for b, e in self.ranges])
+
+    def ranges_for(self, begin: int, end: int) -> list[tuple[int, int]]:
+        """
+        Grid point index ranges of the selected points at positions
+        [begin, end) of the compact array.
+        """
+        starts = self._offsets[:-1]
+        ends = self._offsets[1:]
+        first = np.searchsorted(ends, begin, side="right")
+        last = np.searchsorted(starts, end, side="left")
+        return [
+            (
+                int(self.ranges[i, 0] + max(begin, starts[i]) - starts[i]),
+                int(self.ranges[i, 0] + min(end, ends[i]) - starts[i]),
+            )
+            for i in range(first, last)
+        ]
+
+
+def _unit_vectors(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    lat = np.radians(np.asarray(lat, dtype=np.float64))
+    lon = np.radians(np.asarray(lon, dtype=np.float64))
+    return np.stack(
+        [np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=1
+    )
+
+
+class GridIndex:
+    """
+    Nearest grid point lookup on the sphere. Grid points are sorted into
+    latitude bands and by longitude within every band. A query compares only
+    the points of the bands and longitudes within a search radius around it,
+    the radius grows until it holds the nearest point, so results are exact.
+    """
+
+    # Added to longitude windows, sorted longitudes are stored as float32
+    LONGITUDE_MARGIN = 1e-3
+
+    def __init__(self, lat: np.ndarray, lon: np.ndarray):
+        self._lat = np.asarray(lat)
+        self._lon = np.asarray(lon)
+        count = len(self._lat)
+        if count == 0:
+            raise ZfdbError("Cannot index a grid without points")
+        # About sqrt(2 * count) points per band
+        self._band_count = int(np.clip(round(math.sqrt(count / 2)), 1, 18000))
+        self._band_height = 180 / self._band_count
+        bands = self._band(self._lat)
+        lon = np.mod(self._lon, 360).astype(np.float32)
+        # Longitudes are below 512, one sort key orders by band and longitude
+        self._order = np.argsort(bands * 512.0 + lon).astype(
+            np.int32 if count < 2**31 else np.int64
+        )
+        self._sorted_lon = lon[self._order]
+        self._band_starts = np.searchsorted(
+            bands[self._order], np.arange(self._band_count + 1)
+        )
+        # Mean distance of neighbouring grid points in degrees
+        self._spacing = math.degrees(math.sqrt(4 * math.pi / count))
+
+    def _band(self, lat):
+        bands = np.floor((np.asarray(lat) + 90) / self._band_height)
+        return np.clip(bands, 0, self._band_count - 1).astype(np.int64)
+
+    def _candidates(self, lat: float, lon: float, radius: float) -> np.ndarray:
+        """
+        Indices of a superset of the grid points within `radius` degrees of
+        (lat, lon).
+        """
+        # With hav(x) = sin(x / 2)**2, hav(d) >= cos(lat1) cos(lat2) hav(dlon)
+        # bounds the longitude difference of points within the radius
+        cos_lat = math.cos(math.radians(min(90.0, abs(lat) + radius)))
+        bound = cos_lat * math.cos(math.radians(lat))
+        hav_radius = math.sin(math.radians(radius) / 2) ** 2
+        if radius >= 180 or bound <= hav_radius:
+            windows = [(-1.0, 361.0)]
+        else:
+            width = math.degrees(2 * math.asin(math.sqrt(hav_radius / bound)))
+            width += self.LONGITUDE_MARGIN
+            west, east = lon - width, lon + width
+            if east - west >= 360:
+                windows = [(-1.0, 361.0)]
+            elif west < 0:
+                windows = [(-1.0, east), (west + 360, 361.0)]
+            elif east > 360:
+                windows = [(west, 361.0), (-1.0, east - 360)]
+            else:
+                windows = [(west, east)]
+
+        candidates = []
+        first, last = self._band(lat - radius), self._band(lat + radius)
+        for band in range(first, last + 1):
+            start, end = self._band_starts[band], self._band_starts[band + 1]
+            lons = self._sorted_lon[start:end]
+            for west, east in windows:
+                begin = start + np.searchsorted(lons, west, side="left")
+                stop = start + np.searchsorted(lons, east, side="right")
+                candidates.append(self._order[begin:stop])
+        return np.concatenate(candidates)
+
+    def _nearest(self, lat: float, lon: float) -> int:
+        query = _unit_vectors([lat], [lon])[0]
+        radius = 2 * self._spacing
+        while True:
+            candidates = self._candidates(lat, lon % 360, radius)
+            if len(candidates) == 0:
+                radius = min(2 * radius, 180.0)
+                continue
+            dots = _unit_vectors(self._lat[candidates], self._lon[candidates]) @ query
+            best_dot = dots.max()
+            distance = math.degrees(math.acos(min(1.0, max(-1.0, best_dot))))
+            if distance <= radius or radius >= 180:
+                # Ties are resolved towards the lowest index
+                return int(candidates[dots == best_dot].min())
+            # All points within the distance of the best candidate are compared
+            # in the next round
+            radius = min(distance * (1 + 1e-9) + 1e-9, 180.0)
+
+    def nearest(self, lat: Sequence[float], lon: Sequence[float]) -> np.ndarray:
+        """
+        Index of the grid point nearest to every (lat, lon) query.
+        """
+        lat = np.asarray(lat, dtype=np.float64).reshape(-1)
+        lon = np.asarray(lon, dtype=np.float64).reshape(-1)
+        return np.array(
+            [self._nearest(float(a), float(o)) for a, o in zip(lat, lon)],
+            dtype=np.int64,
+        )
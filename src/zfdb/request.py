@@ -7,9 +7,12 @@
 # nor does it submit to any jurisdiction.
 
 import copy
+import hashlib
+import json
 from abc import ABC, abstractmethod
 from collections.abc import Sequence
 from enum import Enum, auto
+from types import MappingProxyType
 
 import numpy as np
 
@@ -91,7 +94,32 @@ def into_mars_representation(value) -> str:
         return str(value)
 
 
+def into_mars_representations(values) -> list[str]:
+    """
+    `into_mars_representation` of every element of `values`, dates and
+    integers are converted with a single NumPy call.
+    """
+    try:
+        array = np.asarray(values)
+    except ValueError:
+        array = None
+    if array is not None and array.ndim == 1:
+        if array.dtype.kind == "M" and np.datetime_data(array.dtype)[0] == "D":
+            return np.char.replace(np.datetime_as_string(array), "-", "").tolist()
+        if array.dtype.kind in "iuU":
+            return array.astype(str).tolist()
+    return [into_mars_representation(v) for v in values]
+
+
 class Request:
+    """
+    MARS request split into chunks along `chunk_axis`.
+
+    The requests of all chunks are planned on construction: keys shared by all
+    chunks are converted once and the values of the chunked keys are formatted
+    column wise. The request of a chunk is then assembled without conversions.
+    """
+
     def __init__(self, *, request, chunk_axis: ChunkAxisType):
         self._request = request
         self._template = request.copy()
@@ -106,19 +134,43 @@ class Request:
             if not is_sequence(time):
                 time = [time]
             self._chunk_axis = ChunkDateTime(date, time)
+            # Time varies fastest, see ChunkDateTime
+            self._columns = (
+                ("date", tuple(into_mars_representations(date)), len(time)),
+                ("time", tuple(into_mars_representations(time)), 1),
+            )
         elif chunk_axis == ChunkAxisType.Step:
             step = request["step"]
             if not is_sequence(step):
                 step = [step]
             self._chunk_axis = ChunkSteps(step)
+            self._columns = (("step", tuple(into_mars_representations(step)), 1),)
         else:
             raise ZfdbError("Unknown chunking specified")
         for key in self._chunk_axis.keys():
             self._template.pop(key, None)
-        self._template = into_mars_request_dict(self._template)
+        self._template = MappingProxyType(into_mars_request_dict(self._template))
+        self._len = len(self._chunk_axis)
 
     def __getitem__(self, idx) -> dict:
-        return self._template | into_mars_request_dict(self._chunk_axis[idx])
+        if not -self._len <= idx < self._len:
+            raise IndexError(f"Chunk index {idx} out of range for {self._len} chunks")
+        idx %= self._len
+        request = dict(self._template)
+        for key, values, stride in self._columns:
+            request[key] = values[idx // stride % len(values)]
+        return request
+
+    def __len__(self) -> int:
+        return self._len
+
+    def fingerprint(self) -> str:
+        """
+        Digest of the planned chunk requests, requests selecting the same data
+        in the same order have the same fingerprint.
+        """
+        plan = json.dumps([dict(self._template), self._columns])
+        return hashlib.sha256(plan.encode()).hexdigest()
 
     def chunk_axis(self) -> ChunkAxis:
         return self._chunk_axis
@@ -0,0 +1,219 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+"""Statistics
+
+Per variable statistics of a view computed in a single streaming pass, in the
+layout anemoi datasets store them.
+"""
+
+import logging
+import math
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from .datasources import FdbSource
+
+log = logging.getLogger(__name__)
+
+
+class RunningStatistics:
+    """
+    Count, mean, sum of squared differences from the mean, extrema and sums of
+    every variable, updated batch by batch.
+
+    Batches are folded in with the pairwise update of Chan et al., which, unlike
+    accumulating sums of squares, stays accurate for values with a large mean
+    compared to their spread. Missing values (NaN) are excluded and reported in
+    `has_nans`.
+    """
+
+    def __init__(self, variables: int):
+        self.count = np.zeros(variables, dtype=np.int64)
+        self.mean = np.zeros(variables, dtype=np.float64)
+        self.m2 = np.zeros(variables, dtype=np.float64)
+        self.minimum = np.full(variables, np.nan, dtype=np.float64)
+        self.maximum = np.full(variables, np.nan, dtype=np.float64)
+        self.sums = np.zeros(variables, dtype=np.float64)
+        self.squares = np.zeros(variables, dtype=np.float64)
+        self.has_nans = np.zeros(variables, dtype=bool)
+
+    def update(self, values: np.ndarray) -> None:
+        """
+        Adds `values` of shape (variables, n).
+        """
+        values = values.astype(np.float64, copy=False)
+        valid = ~np.isnan(values)
+        batch = RunningStatistics(len(values))
+        batch.count = valid.sum(axis=1)
+        batch.sums = np.where(valid, values, 0).sum(axis=1)
+        np.divide(batch.sums, batch.count, out=batch.mean, where=batch.count > 0)
+        deviations = np.where(valid, values - batch.mean[:, None], 0)
+        batch.m2 = np.einsum("ij,ij->i", deviations, deviations)
+        batch.squares = np.where(valid, values * values, 0).sum(axis=1)
+        # fmin/fmax ignore NaN unless all values are NaN
+        batch.minimum = np.fmin.reduce(values, axis=1)
+        batch.maximum = np.fmax.reduce(values, axis=1)
+        batch.has_nans = ~valid.all(axis=1)
+        self.merge(batch)
+
+    def merge(self, other: "RunningStatistics") -> None:
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        weight = np.zeros_like(self.mean)
+        np.divide(other.count, count, out=weight, where=count > 0)
+        self.mean += delta * weight
+        self.m2 += other.m2 + delta * delta * self.count * weight
+        self.count = count
+        self.minimum = np.fmin(self.minimum, other.minimum)
+        self.maximum = np.fmax(self.maximum, other.maximum)
+        self.sums += other.sums
+        self.squares += other.squares
+        self.has_nans |= other.has_nans
+
+    @property
+    def stdev(self) -> np.ndarray:
+        variance = np.full_like(self.m2, np.nan)
+        np.divide(self.m2, self.count, out=variance, where=self.count > 0)
+        return np.sqrt(variance)
+
+    def result(self) -> dict[str, np.ndarray]:
+        mean = np.where(self.count > 0, self.mean, np.nan)
+        return {
+            "mean": mean,
+            "stdev": self.stdev,
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+            "sums": self.sums,
+            "squares": self.squares,
+            "count": self.count,
+            "has_nans": self.has_nans,
+        }
+
+
+def _variables_first(source: FdbSource, key: tuple[int, ...]) -> np.ndarray:
+    chunk = source[key].as_numpy_array().view(source.dtype)
+    chunk = chunk.reshape(source.chunk_shape())
+    # Variables are the second axis of anemoi like data
+    return np.moveaxis(chunk, 1, 0).reshape(chunk.shape[1], -1)
+
+
+def _accumulate_range(
+    source: FdbSource, start: int, stop: int, tendencies: bool
+) -> tuple[RunningStatistics, RunningStatistics | None]:
+    variables = source.chunk_shape()[1]
+    statistics = RunningStatistics(variables)
+    tendency_statistics = RunningStatistics(variables) if tendencies else None
+    # The tendency of the first chunk needs the last chunk of the previous range
+    previous = (
+        _variables_first(source, (start - 1, 0, 0, 0))
+        if tendencies and start > 0
+        else None
+    )
+    for idx in range(start, stop):
+        values = _variables_first(source, (idx, 0, 0, 0))
+        statistics.update(values)
+        if tendency_statistics is not None and previous is not None:
+            tendency_statistics.update(values - previous)
+        previous = values
+    return statistics, tendency_statistics
+
+
+def compute_statistics(
+    source: FdbSource, *, workers: int = 4, tendency_frequency: str | None = None
+) -> dict[str, np.ndarray]:
+    """
+    Statistics of every variable of `source` over all dates and grid points.
+
+    The dates are split into `workers` contiguous ranges read concurrently,
+    the partial results are merged afterwards.
+
+    Parameters
+    ----------
+    source : FdbSource
+        Source chunked by date, see `make_anemoi_dataset_like_view`.
+    workers : int
+        Number of chunks read concurrently.
+    tendency_frequency : str | None
+        Frequency of the dates, e.g. "6h". If given, statistics of the
+        differences between consecutive dates are computed as well and
+        returned as 'statistics_tendencies_<frequency>_<statistic>'.
+
+    Returns
+    -------
+    dict[str, np.ndarray]
+        Arrays of shape (variables,) named as in anemoi datasets.
+    """
+    num_chunks = source.chunks()[0]
+    workers = max(1, min(workers, num_chunks))
+    per_worker = math.ceil(num_chunks / workers)
+    ranges = [
+        (start, min(start + per_worker, num_chunks))
+        for start in range(0, num_chunks, per_worker)
+    ]
+    log.debug(f"Computing statistics of {num_chunks} chunks in {len(ranges)} ranges")
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        partials = list(
+            pool.map(
+                lambda r: _accumulate_range(source, *r, tendency_frequency is not None),
+                ranges,
+            )
+        )
+
+    variables = source.chunk_shape()[1]
+    statistics = RunningStatistics(variables)
+    tendency_statistics = RunningStatistics(variables)
+    for partial, tendency_partial in partials:
+        statistics.merge(partial)
+        if tendency_partial is not None:
+            tendency_statistics.merge(tendency_partial)
+    result = statistics.result()
+    if tendency_frequency is not None:
+        for name, values in tendency_statistics.result().items():
+            result[f"statistics_tendencies_{tendency_frequency}_{name}"] = values
+    return result
+
+
+def load_or_compute_statistics(
+    source: FdbSource,
+    *,
+    cache: Path | None = None,
+    workers: int = 4,
+    tendency_frequency: str | None = None,
+) -> dict[str, np.ndarray]:
+    """
+    `compute_statistics` with the result stored in the directory `cache`,
+    keyed by the fingerprint of the view.
+    """
+    if cache is None:
+        return compute_statistics(
+            source, workers=workers, tendency_frequency=tendency_frequency
+        )
+    path = Path(cache) / f"statistics-{source.fingerprint()}.npz"
+    if path.exists():
+        with np.load(path) as cached:
+            result = {name: cached[name] for name in cached.files}
+        # Tendencies are only cached when they were requested before
+        if tendency_frequency is None or any(
+            name.startswith(f"statistics_tendencies_{tendency_frequency}_")
+            for name in result
+        ):
+            log.info(f"Loaded statistics from {path}")
+            return result
+    result = compute_statistics(
+        source, workers=workers, tendency_frequency=tendency_frequency
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Written under a temporary name first so readers never see partial files
+    tmp = path.with_suffix(".tmp.npz")
+    np.savez(tmp, **result)
+    tmp.replace(path)
+    log.info(f"Stored statistics in {path}")
+    return result
@@ -0,0 +1,246 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+"""Tracing
+
+Instrumentation of chunk extraction. Datasources open one span per chunk access
+and record how long each stage took, e.g. 'list', 'retrieve', 'decode' or
+'copy'. Finished spans are handed to a `Tracer`.
+
+Without a tracer datasources use `NULL_TRACER`, whose spans do nothing, so
+instrumentation costs a few no-op calls per chunk when disabled.
+"""
+
+import contextlib
+import copy
+import json
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import KW_ONLY, dataclass, field
+from pathlib import Path
+
+
+@dataclass
+class ChunkSpan:
+    """
+    Timings for the extraction of a single chunk.
+
+    `key` is the chunk key, batched extractions report a tuple of chunk keys.
+    `start` and `end` are unix timestamps, stage durations are in seconds.
+    """
+
+    _: KW_ONLY
+    key: tuple
+    extractor: str
+    start: float
+    end: float | None = None
+    pid: int = 0
+    tid: int = 0
+    stages: dict[str, float] = field(default_factory=dict)
+    nbytes: int = 0
+    field_count: int = 0
+    error: bool = False
+
+    @property
+    def duration(self) -> float:
+        return (self.end or time.time()) - self.start
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - t0)
+
+    def iterate(self, name: str, iterable: Iterable) -> Iterator:
+        """
+        Yields from `iterable` attributing the time spent producing each item to
+        stage `name`. Useful for lazy streams where reading happens on iteration.
+        """
+        iterator = iter(iterable)
+        while True:
+            t0 = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add(name, time.perf_counter() - t0)
+                return
+            self.add(name, time.perf_counter() - t0)
+            yield item
+
+
+class _NullSpan:
+    _null_context = contextlib.nullcontext()
+
+    nbytes = 0
+    field_count = 0
+    error = False
+
+    def add(self, stage: str, seconds: float) -> None:
+        pass
+
+    def stage(self, name: str):
+        return self._null_context
+
+    def iterate(self, name: str, iterable: Iterable) -> Iterable:
+        return iterable
+
+    def __setattr__(self, name, value) -> None:
+        # Allows datasources to set nbytes/field_count unconditionally
+        pass
+
+
+class Tracer:
+    """
+    Receives spans from datasources. Subclasses override `on_chunk`.
+    """
+
+    def start(self, key: tuple, extractor: str) -> ChunkSpan:
+        return ChunkSpan(
+            key=key,
+            extractor=extractor,
+            start=time.time(),
+            pid=os.getpid(),
+            tid=threading.get_native_id(),
+        )
+
+    def finish(self, span: ChunkSpan) -> None:
+        span.end = time.time()
+        self.on_chunk(span)
+
+    @contextlib.contextmanager
+    def span(self, key: tuple, extractor: str) -> Iterator[ChunkSpan]:
+        """
+        Span for the extraction of `key`, finished when the block exits. Spans
+        of extractions that raised are finished with `error` set.
+        """
+        span = self.start(key, extractor)
+        try:
+            yield span
+        except BaseException:
+            span.error = True
+            raise
+        finally:
+            self.finish(span)
+
+    def on_chunk(self, span: ChunkSpan) -> None:
+        pass
+
+
+class NullTracer(Tracer):
+    """
+    Tracer used when instrumentation is disabled.
+    """
+
+    _span = _NullSpan()
+    _span_context = contextlib.nullcontext(_span)
+
+    def start(self, key: tuple, extractor: str) -> _NullSpan:
+        return self._span
+
+    def finish(self, span) -> None:
+        pass
+
+    def span(self, key: tuple, extractor: str):
+        return self._span_context
+
+
+NULL_TRACER = NullTracer()
+
+
+class CallbackTracer(Tracer):
+    """
+    Calls `callback` with every finished span, e.g. to feed metrics.
+    """
+
+    def __init__(self, callback: Callable[[ChunkSpan], None]):
+        self._callback = callback
+
+    def on_chunk(self, span: ChunkSpan) -> None:
+        self._callback(span)
+
+
+class RecordingTracer(Tracer):
+    """
+    Keeps all finished spans in memory for offline profiling.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.spans: list[ChunkSpan] = []
+
+    def on_chunk(self, span: ChunkSpan) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """
+        Total and mean duration per stage over all recorded spans.
+        """
+        with self._lock:
+            spans = list(self.spans)
+        totals: dict[str, float] = {}
+        for span in spans:
+            for stage, seconds in span.stages.items():
+                totals[stage] = totals.get(stage, 0.0) + seconds
+        return {
+            stage: {"total": total, "mean": total / len(spans)}
+            for stage, total in totals.items()
+        }
+
+
+class JsonlTracer(Tracer):
+    """
+    Appends one JSON line per finished span to `path`, a chunk access log that
+    can be put on a common timeline with strace output by the retracer tool.
+
+    Each line holds the chunk key, `view`, start and end as unix timestamps,
+    pid and native thread id, bytes, field count, whether the extraction
+    failed and stage durations. Use `with_view` to obtain tracers for further
+    views writing to the same file.
+    """
+
+    def __init__(self, path: str | Path, view: str = ""):
+        # Line buffered so the log can be followed while the process runs
+        self._file = open(path, "a", buffering=1)
+        self._lock = threading.Lock()
+        self._view = view
+
+    def with_view(self, view: str) -> "JsonlTracer":
+        tracer = copy.copy(self)
+        tracer._view = view
+        return tracer
+
+    def on_chunk(self, span: ChunkSpan) -> None:
+        line = json.dumps(
+            {
+                "view": self._view,
+                "key": span.key,
+                "extractor": span.extractor,
+                "start": span.start,
+                "end": span.end,
+                "pid": span.pid,
+                "tid": span.tid,
+                "nbytes": span.nbytes,
+                "field_count": span.field_count,
+                "error": span.error,
+                "stages": span.stages,
+            }
+        )
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
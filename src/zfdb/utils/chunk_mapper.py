@@ -1,23 +1,157 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import itertools
+import math
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass
+
+from zfdb.error import ZfdbError
+from zfdb.request import (
+    into_mars_representations,
+    into_mars_request_dict,
+    is_sequence,
+)
+
+
+def comparable_value(key: str, value) -> str:
+    """
+    Representation MARS values are compared in: numbers lose leading zeros
+    and trailing decimals, e.g. '0000' and '0.0' become '0', and params given
+    as 'paramId.table' lose their table.
+    """
+    value = str(value).strip().lower()
+    if key == "param" and value.split(".")[0].isdigit():
+        return value.split(".")[0]
+    try:
+        number = float(value)
+    except ValueError:
+        return value
+    return str(int(number)) if number.is_integer() else value
+
+
+@dataclass(frozen=True)
+class Axis:
+    """
+    Dimension of a view along the MARS keyword `key`, e.g. 'number' or
+    'step', holding `values` in this order, `chunk` values per chunk.
+    """
+
+    key: str
+    values: Sequence
+    chunk: int = 1
+
+    def __post_init__(self):
+        if not is_sequence(self.values):
+            object.__setattr__(self, "values", [self.values])
+        if len(self.values) == 0:
+            raise ZfdbError(f"Axis '{self.key}' has no values")
+        if self.chunk < 1:
+            raise ZfdbError(f"Chunk size of axis '{self.key}' must be positive")
+
+
 class ChunkMapper:
-    def __init__(self, chunk_dimensions: tuple[int, ...]):
-        self.chunk_dimensions = chunk_dimensions
+    """
+    Maps chunk indices of a view with one dimension per `Axis` onto MARS
+    requests. Keys of `request` that are not an axis are shared by all fields.
+    """
 
-    def map(self, chunk_index: tuple[int, ...]) -> dict[str, slice]:
-        pass
+    def __init__(self, request: dict, axes: Sequence[Axis]):
+        keys = [axis.key for axis in axes]
+        if len(set(keys)) != len(keys):
+            raise ZfdbError(f"Every MARS keyword can only be one axis, got {keys}")
+        self._axes = list(axes)
+        self._template = into_mars_request_dict(
+            {k: v for k, v in request.items() if k not in keys}
+        )
+        self._values = [tuple(into_mars_representations(a.values)) for a in axes]
+        self._indices = [
+            {comparable_value(a.key, v): idx for idx, v in enumerate(values)}
+            for a, values in zip(axes, self._values)
+        ]
+        self.shape = tuple(len(v) for v in self._values)
+        self.chunks = tuple(min(a.chunk, n) for a, n in zip(axes, self.shape))
+        self.chunk_dimensions = tuple(
+            math.ceil(n / c) for n, c in zip(self.shape, self.chunks)
+        )
+
+    @property
+    def keys(self) -> list[str]:
+        return [axis.key for axis in self._axes]
 
+    def __contains__(self, chunk_index: tuple[int, ...]) -> bool:
+        return len(chunk_index) == len(self.chunk_dimensions) and all(
+            0 <= i < n for i, n in zip(chunk_index, self.chunk_dimensions)
+        )
 
-class StepChunkMapper(ChunkMapper):
     def map(self, chunk_index: tuple[int, ...]) -> dict[str, slice]:
-        if len(chunk_index) != len(self.chunk_dimensions):
-            raise RuntimeError(
-                f"Mismatch in dimensions, chunking set up for {len(self.chunk_dimensions)}, but asked for chunk {chunk_index}"
+        """
+        Range of values of every axis covered by the chunk at `chunk_index`.
+        """
+        if chunk_index not in self:
+            raise KeyError(
+                f"Chunk {chunk_index} out of range for {self.chunk_dimensions} chunks"
             )
+        return {
+            key: slice(i * c, min((i + 1) * c, n))
+            for key, i, c, n in zip(self.keys, chunk_index, self.chunks, self.shape)
+        }
 
-        result = {}
+    def chunk_request(self, chunk_index: tuple[int, ...]) -> dict[str, str]:
+        """
+        MARS request covering all fields of the chunk at `chunk_index`.
+        """
+        request = dict(self._template)
+        for (key, values_slice), values in zip(
+            self.map(chunk_index).items(), self._values
+        ):
+            request[key] = "/".join(values[values_slice])
+        return request
 
-        result["step"] = slice(0, 1)
-        result["date"] = slice(0, None)
-        result["time"] = slice(0, None)
-        result["param"] = slice(0, None)
+    def field_requests(
+        self, chunk_index: tuple[int, ...]
+    ) -> Iterator[tuple[tuple[int, ...], dict[str, str]]]:
+        """
+        Position inside the chunk and MARS request of every field of the chunk
+        at `chunk_index`, in C order.
+        """
+        ranges = [range(s.start, s.stop) for s in self.map(chunk_index).values()]
+        starts = [r.start for r in ranges]
+        for position in itertools.product(*ranges):
+            request = dict(self._template)
+            for key, values, idx in zip(self.keys, self._values, position):
+                request[key] = values[idx]
+            yield tuple(p - s for p, s in zip(position, starts)), request
 
-        return result
+    def field_position(
+        self, chunk_index: tuple[int, ...], field: Mapping[str, Sequence[str]]
+    ) -> tuple[int, ...]:
+        """
+        Position inside the chunk at `chunk_index` of the field with the values
+        `field` of every axis. A value can be given in several representations,
+        e.g. the shortName and paramId of a param.
+        """
+        position = []
+        for (key, values_slice), indices in zip(
+            self.map(chunk_index).items(), self._indices
+        ):
+            candidates = (indices.get(comparable_value(key, v)) for v in field[key])
+            idx = next(
+                (
+                    i
+                    for i in candidates
+                    if i is not None and values_slice.start <= i < values_slice.stop
+                ),
+                None,
+            )
+            if idx is None:
+                raise ZfdbError(
+                    f"Field with {key}={field[key]} is not part of chunk {chunk_index}"
+                )
+            position.append(idx - values_slice.start)
+        return tuple(position)
@@ -0,0 +1,300 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+"""In-process FDB and GribJump stand-ins
+
+Implement the subset of `pyfdb.FDB` and `pygribjump.GribJump` used by zfdb and
+serve archived GRIB messages from memory. Each call can be delayed by a
+`LatencyModel` to emulate remote or slow storage, so that concurrency,
+prefetching and caching can be tested and benchmarked reproducibly.
+
+    fdb = FakeFdb(retrieve_latency=LatencyModel(latency=0.05, bandwidth=100e6))
+    gribjump = FakeGribJump(fdb, latency=LatencyModel(latency=0.02))
+    source = FdbSource(fdb=fdb, gribjump=gribjump, request=...)
+"""
+
+import collections
+import io
+import random
+import threading
+import time
+from collections.abc import Iterator
+
+import eccodes
+import numpy as np
+
+from ..error import ZfdbError
+from ..request import is_sequence
+
+
+class LatencyModel:
+    """
+    Delay of a single call: a fixed `latency` in seconds, the transfer time of
+    the payload at `bandwidth` bytes per second and a uniformly distributed
+    jitter of up to `jitter` seconds. The jitter sequence is determined by `seed`.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        bandwidth: float | None = None,
+        jitter: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        if latency < 0 or jitter < 0 or (bandwidth is not None and bandwidth <= 0):
+            raise ZfdbError("Latency and jitter must be >= 0, bandwidth must be > 0")
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.jitter = jitter
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def call_delay(self) -> float:
+        if not self.jitter:
+            return self.latency
+        with self._lock:
+            return self.latency + self._rng.uniform(0, self.jitter)
+
+    def transfer_delay(self, nbytes: int) -> float:
+        return nbytes / self.bandwidth if self.bandwidth else 0.0
+
+    @staticmethod
+    def sleep(seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+NO_LATENCY = LatencyModel()
+
+
+def _normalise(key: str, value) -> str:
+    """
+    Brings MARS values into the form eccodes reports them in.
+    """
+    value = str(value).strip().lower()
+    if key == "date":
+        return value.replace("-", "")
+    if key == "time":
+        value = value.replace(":", "")
+        return f"{int(value):02d}00" if len(value) <= 2 else value.zfill(4)
+    if key == "expver":
+        return value.zfill(4)
+    if key == "param":
+        # Strip the table of 'paramId.table' notation
+        return value.split(".")[0]
+    if key in ("step", "levelist", "number"):
+        number = float(value)
+        return str(int(number)) if number.is_integer() else value
+    return value
+
+
+def _expand(key: str, value) -> list[str]:
+    values = list(value) if is_sequence(value) else str(value).split("/")
+    if any(str(v).lower() in ("to", "by") for v in values):
+        raise ZfdbError(
+            f"Ranges are not supported by the fake FDB, found {key}={value}"
+        )
+    return [_normalise(key, v) for v in values]
+
+
+class _Field:
+    def __init__(self, message: bytes) -> None:
+        self.message = message
+        handle = eccodes.codes_new_from_message(message)
+        try:
+            self.keys: dict[str, str] = {}
+            iterator = eccodes.codes_keys_iterator_new(handle, "mars")
+            while eccodes.codes_keys_iterator_next(iterator):
+                name = eccodes.codes_keys_iterator_get_name(iterator)
+                self.keys[name] = eccodes.codes_get(handle, name, ktype=str)
+            eccodes.codes_keys_iterator_delete(iterator)
+            self.short_name = eccodes.codes_get(handle, "shortName")
+        finally:
+            eccodes.codes_release(handle)
+        self._normalised = {k: _normalise(k, v) for k, v in self.keys.items()}
+        self._values: np.ndarray | None = None
+        self._lock = threading.Lock()
+
+    def position(self, request: dict[str, list[str]]) -> tuple[int, ...] | None:
+        """
+        Position of this field in the expansion of `request`, None if the field
+        is not part of the request.
+        """
+        position = []
+        for key, values in request.items():
+            value = self._normalised.get(key)
+            if key == "param" and value not in values:
+                value = self.short_name.lower()
+            if value not in values:
+                return None
+            position.append(values.index(value))
+        return tuple(position)
+
+    @property
+    def values(self) -> np.ndarray:
+        with self._lock:
+            if self._values is None:
+                handle = eccodes.codes_new_from_message(self.message)
+                try:
+                    self._values = eccodes.codes_get_values(handle)
+                finally:
+                    eccodes.codes_release(handle)
+            return self._values
+
+
+class FakeDataHandle(io.BytesIO):
+    """
+    Result of `FakeFdb.retrieve`, reads are delayed by the transfer time of the
+    returned bytes.
+    """
+
+    def __init__(self, data: bytes, latency: LatencyModel) -> None:
+        super().__init__(data)
+        self._size = len(data)
+        self._latency = latency
+
+    def size(self) -> int:
+        return self._size
+
+    def read(self, size: int | None = -1) -> bytes:
+        data = super().read(size)
+        LatencyModel.sleep(self._latency.transfer_delay(len(data)))
+        return data
+
+
+class FakeFdb:
+    """
+    Stand-in for `pyfdb.FDB` keeping archived messages in memory.
+
+    As with FDB, archived messages become visible after `flush`. Fields are
+    returned in the order of the request expansion, following the order of keys
+    in the request. Params can be requested by paramId or shortName.
+
+    `calls` counts the calls per method, e.g. to assert on batching.
+    """
+
+    def __init__(
+        self,
+        *,
+        retrieve_latency: LatencyModel = NO_LATENCY,
+        list_latency: LatencyModel = NO_LATENCY,
+    ) -> None:
+        self.retrieve_latency = retrieve_latency
+        self.list_latency = list_latency
+        self.calls: collections.Counter[str] = collections.Counter()
+        self._fields: list[_Field] = []
+        self._pending: list[_Field] = []
+        self._lock = threading.Lock()
+
+    def archive(self, data: bytes, request=None) -> None:
+        fields = [
+            _Field(msg.get_buffer()) for msg in eccodes.StreamReader(io.BytesIO(data))
+        ]
+        with self._lock:
+            self.calls["archive"] += 1
+            self._pending.extend(fields)
+
+    def flush(self) -> None:
+        with self._lock:
+            self.calls["flush"] += 1
+            self._fields.extend(self._pending)
+            self._pending = []
+
+    def _match(self, request: dict) -> list[_Field]:
+        request = {
+            k: _expand(k, v) for k, v in request.items() if v is not None and v != ""
+        }
+        with self._lock:
+            fields = list(self._fields)
+        positions = [(field.position(request), field) for field in fields]
+        matches = sorted(
+            ((p, idx, f) for idx, (p, f) in enumerate(positions) if p is not None),
+            key=lambda m: m[:2],
+        )
+        return [f for _, _, f in matches]
+
+    def retrieve(self, request: dict) -> FakeDataHandle:
+        with self._lock:
+            self.calls["retrieve"] += 1
+        LatencyModel.sleep(self.retrieve_latency.call_delay())
+        data = b"".join(f.message for f in self._match(request))
+        return FakeDataHandle(data, self.retrieve_latency)
+
+    def list(self, request: dict, keys: bool = False, **kwargs) -> Iterator[dict]:
+        with self._lock:
+            self.calls["list"] += 1
+        LatencyModel.sleep(self.list_latency.call_delay())
+        return iter(
+            [
+                {"keys": dict(f.keys), "length": len(f.message)}
+                for f in self._match(request)
+            ]
+        )
+
+
+class FakeExtractResult:
+    """
+    Extracted `values` of one field, the requested ranges concatenated.
+    """
+
+    def __init__(self, values: np.ndarray) -> None:
+        self.values = values
+
+
+class FakeGribJump:
+    """
+    Stand-in for `pygribjump.GribJump` extracting value ranges from the
+    messages archived in `fdb`.
+
+    Each extraction is delayed by the latency of `latency` once per call plus
+    the transfer time of the extracted values as float64.
+    """
+
+    def __init__(self, fdb: FakeFdb, *, latency: LatencyModel = NO_LATENCY) -> None:
+        self._fdb = fdb
+        self.latency = latency
+        self.calls: collections.Counter[str] = collections.Counter()
+        self._lock = threading.Lock()
+
+    def extract(self, polyrequest, *args, **kwargs) -> list[FakeExtractResult]:
+        with self._lock:
+            self.calls["extract"] += 1
+        LatencyModel.sleep(self.latency.call_delay())
+        results = []
+        for request, ranges in polyrequest:
+            fields = self._fdb._match(request)
+            if not fields:
+                raise ZfdbError(f"No data found for {request}")
+            for field in fields:
+                values = field.values
+                results.append(
+                    FakeExtractResult(
+                        np.concatenate([values[lo:hi] for lo, hi in ranges])
+                    )
+                )
+        nvalues = sum(len(r.values) for r in results)
+        LatencyModel.sleep(self.latency.transfer_delay(nvalues * 8))
+        return results
+
+
+def make_fakes(
+    messages,
+    *,
+    retrieve_latency: LatencyModel = NO_LATENCY,
+    list_latency: LatencyModel = NO_LATENCY,
+    extract_latency: LatencyModel = NO_LATENCY,
+) -> tuple[FakeFdb, FakeGribJump]:
+    """
+    Creates a `FakeFdb` containing `messages` and a `FakeGribJump` on top of it.
+    """
+    fdb = FakeFdb(retrieve_latency=retrieve_latency, list_latency=list_latency)
+    for message in messages:
+        fdb.archive(message)
+    fdb.flush()
+    return fdb, FakeGribJump(fdb, latency=extract_latency)
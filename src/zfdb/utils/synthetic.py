@@ -0,0 +1,328 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+"""Synthetic datasets
+
+Generates GRIB messages from eccodes samples and archives them into a local FDB.
+Used to test and benchmark zfdb at realistic sizes without network access.
+
+Can be used as a command line tool:
+
+    python -m zfdb.utils.synthetic <path> --grid N96 --start 2020-01-01 --days 30
+"""
+
+import argparse
+import itertools
+import logging
+import os
+import sys
+from collections.abc import Iterator, Sequence
+from dataclasses import KW_ONLY, dataclass
+from pathlib import Path
+
+import eccodes
+import numpy as np
+import yaml
+
+from ..error import ZfdbError
+
+log = logging.getLogger(__name__)
+
+# Same layout as the test schema, extended by 'number' for ensemble members
+SCHEMA = """\
+param:      Param;
+step:       Step;
+date:       Date;
+levelist:   Double;
+expver:     Expver;
+time:       Time;
+number:     Integer;
+
+[ class, expver, stream, date, time, domain?
+       [ type, levtype
+               [ step, number?, levelist?, param ]]
+]
+"""
+
+
+@dataclass(frozen=True)
+class SyntheticDataset:
+    """
+    Describes a synthetic dataset, every combination of dates, times, steps,
+    members, levels and params results in one message.
+
+    `grid` is either a regular lat/lon increment in degrees, e.g. "0.25", or a
+    classic reduced gaussian grid, e.g. "N96". Without `levels` surface fields
+    are created, without `members` deterministic fields.
+    """
+
+    _: KW_ONLY
+    grid: str = "1.0"
+    dates: Sequence[str]
+    times: Sequence[str] = ("0000",)
+    steps: Sequence[int] = (0,)
+    params: Sequence[str] = ("10u", "10v")
+    levels: Sequence[int] = ()
+    members: Sequence[int] = ()
+    mars_class: str = "ea"
+    expver: str = "0001"
+    seed: int = 0
+
+    @property
+    def stream(self) -> str:
+        return "enfo" if self.members else "oper"
+
+    @property
+    def type(self) -> str:
+        if self.members:
+            return "pf"
+        return "fc" if any(s != 0 for s in self.steps) else "an"
+
+    @property
+    def levtype(self) -> str:
+        return "pl" if self.levels else "sfc"
+
+    def __len__(self) -> int:
+        return (
+            len(self.dates)
+            * len(self.times)
+            * len(self.steps)
+            * max(len(self.members), 1)
+            * max(len(self.levels), 1)
+            * len(self.params)
+        )
+
+    def mars_request(self) -> dict:
+        """
+        MARS request covering the full dataset.
+        """
+        request = {
+            "class": self.mars_class,
+            "domain": "g",
+            "expver": self.expver,
+            "stream": self.stream,
+            "type": self.type,
+            "levtype": self.levtype,
+            "date": [d.replace("-", "") for d in self.dates],
+            "time": list(self.times),
+            "step": [str(s) for s in self.steps],
+            "param": list(self.params),
+        }
+        if self.levels:
+            request["levelist"] = [str(level) for level in self.levels]
+        if self.members:
+            request["number"] = [str(m) for m in self.members]
+        return request
+
+    def _grid_template(self) -> int:
+        if self.grid.upper().startswith("N"):
+            sample = f"reduced_gg_pl_{int(self.grid[1:])}_grib2"
+        else:
+            sample = "regular_ll_sfc_grib2"
+        handle = eccodes.codes_grib_new_from_samples(sample)
+        # Local definition 1 provides the MARS keys class, stream, type and expver
+        eccodes.codes_set(handle, "setLocalDefinition", 1)
+        eccodes.codes_set(handle, "localDefinitionNumber", 1)
+        if not self.grid.upper().startswith("N"):
+            increment = float(self.grid)
+            ni = int(round(360 / increment))
+            nj = int(round(180 / increment)) + 1
+            for key, value in {
+                "Ni": ni,
+                "Nj": nj,
+                "iDirectionIncrementInDegrees": increment,
+                "jDirectionIncrementInDegrees": increment,
+                "latitudeOfFirstGridPointInDegrees": 90.0,
+                "latitudeOfLastGridPointInDegrees": -90.0,
+                "longitudeOfFirstGridPointInDegrees": 0.0,
+                "longitudeOfLastGridPointInDegrees": 360.0 - increment,
+            }.items():
+                eccodes.codes_set(handle, key, value)
+            # numberOfDataPoints is only updated once values are encoded
+            eccodes.codes_set_values(handle, np.zeros(ni * nj))
+        return handle
+
+    def _template(self) -> int:
+        handle = self._grid_template()
+        if self.members:
+            # Individual ensemble forecast at a point in time
+            eccodes.codes_set(handle, "productDefinitionTemplateNumber", 1)
+        eccodes.codes_set(handle, "class", self.mars_class)
+        eccodes.codes_set(handle, "expver", self.expver)
+        eccodes.codes_set(handle, "stream", self.stream)
+        eccodes.codes_set(handle, "type", self.type)
+        eccodes.codes_set(
+            handle, "typeOfLevel", "isobaricInhPa" if self.levels else "surface"
+        )
+        return handle
+
+    def messages(self) -> Iterator[bytes]:
+        """
+        Yields all messages of the dataset as encoded GRIB.
+
+        Values are random normal, scaled per param so fields are distinguishable.
+        """
+        template = self._template()
+        try:
+            size = eccodes.codes_get(template, "numberOfDataPoints")
+            rng = np.random.default_rng(self.seed)
+            for date, time, step, member, level, (
+                param_idx,
+                param,
+            ) in itertools.product(
+                self.dates,
+                self.times,
+                self.steps,
+                self.members or [None],
+                self.levels or [None],
+                enumerate(self.params),
+            ):
+                handle = eccodes.codes_clone(template)
+                try:
+                    eccodes.codes_set(handle, "date", int(date.replace("-", "")))
+                    eccodes.codes_set(handle, "time", int(time))
+                    eccodes.codes_set(handle, "step", int(step))
+                    if member is not None:
+                        eccodes.codes_set(handle, "number", int(member))
+                    if level is not None:
+                        eccodes.codes_set(handle, "level", int(level))
+                    eccodes.codes_set(handle, "shortName", param)
+                    eccodes.codes_set_values(
+                        handle, param_idx + rng.standard_normal(size)
+                    )
+                    yield eccodes.codes_get_message(handle)
+                finally:
+                    eccodes.codes_release(handle)
+        finally:
+            eccodes.codes_release(template)
+
+
+def create_fdb_config(path: Path) -> tuple[Path, Path]:
+    """
+    Writes a local toc FDB configuration, its schema and a gribjump
+    configuration to `path`.
+
+    Returns
+    -------
+    tuple[Path, Path]
+        Path of fdb config and gribjump config.
+    """
+    db_store_path = path / "db_store"
+    db_store_path.mkdir(parents=True, exist_ok=True)
+    schema_path = path / "schema"
+    schema_path.write_text(SCHEMA)
+    fdb_config = {
+        "type": "local",
+        "engine": "toc",
+        "schema": str(schema_path),
+        "spaces": [{"handler": "Default", "roots": [{"path": str(db_store_path)}]}],
+    }
+    fdb_config_path = path / "fdb_config.yaml"
+    fdb_config_path.write_text(yaml.dump(fdb_config))
+    gj_config = {"plugin": {"select": "class=(ea|od),stream=(enfo|oper),expver=(00..)"}}
+    gj_config_path = path / "gribjump_config.yaml"
+    gj_config_path.write_text(yaml.dump(gj_config))
+    return fdb_config_path, gj_config_path
+
+
+def configure_environment(fdb_config_path: Path, gj_config_path: Path) -> None:
+    """
+    Points FDB and gribjump to the given configuration. Has to be called before
+    the first `pyfdb.FDB` or `pygribjump.GribJump` is created.
+    """
+    os.environ["FDB5_CONFIG_FILE"] = str(fdb_config_path)
+    os.environ["FDB_ENABLE_GRIBJUMP"] = "1"
+    os.environ["GRIBJUMP_CONFIG_FILE"] = str(gj_config_path)
+    os.environ["GRIBJUMP_IGNORE_GRID"] = "1"
+
+
+def archive(fdb, messages: Iterator[bytes], flush_every: int = 256) -> int:
+    """
+    Archives `messages` into `fdb`, flushing every `flush_every` messages.
+
+    Returns
+    -------
+    int
+        Number of archived messages.
+    """
+    count = 0
+    for count, message in enumerate(messages, start=1):
+        fdb.archive(message)
+        if count % flush_every == 0:
+            fdb.flush()
+    fdb.flush()
+    return count
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Creates a local FDB filled with synthetic GRIB data",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("path", help="Directory of the FDB", type=Path)
+    parser.add_argument(
+        "--grid",
+        help="Regular lat/lon increment in degrees or reduced gaussian grid 'N<n>'",
+        default="1.0",
+    )
+    parser.add_argument("--start", help="First date", default="2020-01-01")
+    parser.add_argument("--days", help="Number of days", type=int, default=1)
+    parser.add_argument("--times", nargs="+", default=["0000"])
+    parser.add_argument("--steps", nargs="+", type=int, default=[0])
+    parser.add_argument("--params", nargs="+", default=["10u", "10v"])
+    parser.add_argument("--levels", nargs="*", type=int, default=[])
+    parser.add_argument("--members", nargs="*", type=int, default=[])
+    parser.add_argument("--class", dest="mars_class", default="ea")
+    parser.add_argument("--expver", default="0001")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--flush-every", help="Flush after n messages", type=int, default=256
+    )
+    parser.add_argument(
+        "-v", "--verbose", help="Enables verbose output", action="store_true"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(
+        format="%(asctime)s %(message)s",
+        stream=sys.stdout,
+        level=logging.INFO if args.verbose else logging.WARNING,
+    )
+    start = np.datetime64(args.start, "D")
+    dataset = SyntheticDataset(
+        grid=args.grid,
+        dates=[
+            str(d).replace("-", "")
+            for d in np.arange(start, start + np.timedelta64(args.days, "D"))
+        ],
+        times=args.times,
+        steps=args.steps,
+        params=args.params,
+        levels=args.levels,
+        members=args.members,
+        mars_class=args.mars_class,
+        expver=args.expver,
+        seed=args.seed,
+    )
+    if len(dataset) == 0:
+        raise ZfdbError("Dataset description results in no messages")
+
+    configure_environment(*create_fdb_config(args.path))
+    import pyfdb
+
+    log.info(f"Archiving {len(dataset)} messages into {args.path}")
+    count = archive(pyfdb.FDB(), dataset.messages(), args.flush_every)
+    print(f"Archived {count} messages into {args.path}")
+    print(f"MARS request: {dataset.mars_request()}")
+
+
+if __name__ == "__main__":
+    main()
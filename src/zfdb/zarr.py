@@ -150,6 +150,30 @@ class DataSource(ABC):
     @abstractmethod
     def __contains__(self, key: tuple[int, ...]) -> bool: ...
 
+    def get_byte_range(self, key: tuple[int, ...], byte_range: slice) -> Buffer:
+        """
+        Bytes `byte_range` of the chunk at `key`.
+
+        The default implementation reads the full chunk and slices it,
+        datasources that can read partial chunks cheaper should override this.
+        """
+        return self[key][byte_range]
+
+    def chunk_nbytes(self, key: tuple[int, ...]) -> int:
+        """
+        Size in bytes of the chunk at `key`.
+        """
+        return len(self[key])
+
+    def get_many(self, keys: list[tuple[int, ...]]) -> list[Buffer]:
+        """
+        Chunks for all `keys`, in order.
+
+        The default implementation reads chunk by chunk, datasources that can
+        fetch several chunks at once should override this.
+        """
+        return [self[key] for key in keys]
+
 
 class FdbZarrArray:
     def __init__(self, *, name: str = "", datasource: DataSource):
@@ -166,10 +190,53 @@ class FdbZarrArray:
             chunk_ids = (int(c) for c in key[1:])
             return self._datasource[*chunk_ids]
 
+    def __contains__(self, key: tuple[str, ...]) -> bool:
+        if tuple(key) == ("zarr.json",):
+            return True
+        if len(key) < 2 or key[0] != "c" or not all(c.isdigit() for c in key[1:]):
+            return False
+        return tuple(int(c) for c in key[1:]) in self._datasource
+
+    def get_partial(self, key: tuple[str, ...], byte_range: slice) -> Buffer | None:
+        if key[0] == "zarr.json":
+            return self._metadata[byte_range]
+        if len(key) > 1:
+            assert key[0] == "c"  # Zarr v3 for chunks
+            chunk_ids = tuple(int(c) for c in key[1:])
+            return self._datasource.get_byte_range(chunk_ids, byte_range)
+
+    def getsize(self, key: tuple[str, ...]) -> int:
+        if key[0] == "zarr.json":
+            return len(self._metadata)
+        if len(key) > 1:
+            assert key[0] == "c"  # Zarr v3 for chunks
+            chunk_ids = tuple(int(c) for c in key[1:])
+            return self._datasource.chunk_nbytes(chunk_ids)
+        raise KeyError(f"Unknown key {key}")
+
+    def get_many(self, keys: list[tuple[str, ...]]) -> list[Buffer | None]:
+        """
+        Batched variant of `__getitem__`, all chunk keys are handed to the
+        datasource at once.
+        """
+        chunk_positions = [idx for idx, key in enumerate(keys) if len(key) > 1]
+        chunks = self._datasource.get_many(
+            [tuple(int(c) for c in keys[idx][1:]) for idx in chunk_positions]
+        )
+        result = [self[key] if len(key) == 1 else None for key in keys]
+        for idx, chunk in zip(chunk_positions, chunks, strict=True):
+            assert keys[idx][0] == "c"  # Zarr v3 for chunks
+            result[idx] = chunk
+        return result
+
     @property
     def name(self) -> str:
         return self._name
 
+    @property
+    def datasource(self) -> DataSource:
+        return self._datasource
+
     @cache
     def paths(self) -> list[str]:
         """
@@ -220,6 +287,45 @@ class FdbZarrGroup:
             return self._children[key[0]][*key[1:]]
         raise KeyError(f"Unknown key {key}")
 
+    def __contains__(self, key: tuple[str, ...]) -> bool:
+        if len(key) == 1:
+            return key[0] == "zarr.json"
+        return key[0] in self._children and tuple(key[1:]) in self._children[key[0]]
+
+    def get_partial(self, key: tuple[str, ...], byte_range: slice) -> Buffer | None:
+        if len(key) == 1:
+            if key[0] == "zarr.json":
+                return self._metadata[byte_range]
+        else:
+            return self._children[key[0]].get_partial(key[1:], byte_range)
+        raise KeyError(f"Unknown key {key}")
+
+    def getsize(self, key: tuple[str, ...]) -> int:
+        if len(key) == 1:
+            if key[0] == "zarr.json":
+                return len(self._metadata)
+        else:
+            return self._children[key[0]].getsize(key[1:])
+        raise KeyError(f"Unknown key {key}")
+
+    def get_many(self, keys: list[tuple[str, ...]]) -> list[Buffer | None]:
+        """
+        Batched variant of `__getitem__`, keys are grouped by child so that each
+        child receives all of its keys in a single call.
+        """
+        result: list[Buffer | None] = [None] * len(keys)
+        positions_per_child: dict[str, list[int]] = {}
+        for idx, key in enumerate(keys):
+            if len(key) == 1:
+                result[idx] = self[key]
+            else:
+                positions_per_child.setdefault(key[0], []).append(idx)
+        for name, positions in positions_per_child.items():
+            values = self._children[name].get_many([keys[i][1:] for i in positions])
+            for idx, value in zip(positions, values, strict=True):
+                result[idx] = value
+        return result
+
     @property
     def name(self) -> str:
         return self._name
@@ -0,0 +1,83 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import pathlib
+import sys
+
+import pytest
+
+# The retracer is run as a script, its modules import each other by name
+sys.path.insert(0, str(pathlib.Path(__file__).parents[2] / "tools" / "retracer"))
+
+# Output of 'strace -ff --decode-fds=path -ttt -qqq -T -s0' for one thread
+# reading two files, the last line does not describe a syscall
+STRACE_LINES = [
+    '1740472038.600000 openat(AT_FDCWD</srv>, "/data/a.grib", O_RDONLY|O_CLOEXEC) = 3</data/a.grib> <0.000020>',
+    "1740472038.600100 fstat(3</data/a.grib>, {st_mode=S_IFREG|0644, st_size=16384, ...}) = 0 <0.000004>",
+    '1740472038.600200 read(3</data/a.grib>, ""..., 4096) = 4096 <0.000087>',
+    '1740472038.600300 read(3</data/a.grib>, ""..., 4096) = 4096 <0.000081>',
+    "1740472038.600400 lseek(3</data/a.grib>, 12288, SEEK_SET) = 12288 <0.000003>",
+    '1740472038.600500 read(3</data/a.grib>, ""..., 8192) = 4096 <0.000052>',
+    '1740472038.600600 openat(AT_FDCWD</srv>, "/data/b.grib", O_RDONLY) = 4</data/b.grib> <0.000018>',
+    "1740472038.600700 lseek(4</data/b.grib>, 1024, SEEK_SET) = 1024 <0.000002>",
+    '1740472038.600800 read(4</data/b.grib>, ""..., 2048) = 2048 <0.000044>',
+    "1740472038.600900 lseek(4</data/b.grib>, 0, SEEK_SET) = 0 <0.000002>",
+    '1740472038.601000 read(4</data/b.grib>, ""..., 512) = 512 <0.000031>',
+    "1740472038.601100 close(4</data/b.grib>) = 0 <0.000005>",
+    "1740472038.601200 close(3</data/a.grib>) = 0 <0.000006>",
+    '1740472038.601300 openat(AT_FDCWD</srv>, "/data/missing", O_RDONLY) = -1 ENOENT (No such file or directory) <0.000009>',
+    "+++ exited with 0 +++",
+]
+
+
+@pytest.fixture
+def strace_lines() -> list[str]:
+    return list(STRACE_LINES)
+
+
+@pytest.fixture
+def strace_file(tmp_path) -> pathlib.Path:
+    """
+    Strace output of pid 4242, repeated so it spans many small chunks.
+    """
+    path = tmp_path / "trace.4242"
+    path.write_text("\n".join(STRACE_LINES * 20) + "\n")
+    return path
+
+
+@pytest.fixture
+def syscall_database(tmp_path, strace_file) -> pathlib.Path:
+    """
+    Database with the events of `strace_file`, as written by parse-strace.
+    """
+    from commands.parsestrace import parse_strace_file_into_database
+    from database import create_database, create_indexes
+
+    path = tmp_path / "events.sqlite"
+    con = create_database(path, force=False)
+    parse_strace_file_into_database([strace_file], con, False)
+    create_indexes(con)
+    con.close()
+    return path
+
+
+@pytest.fixture
+def extracted_database(syscall_database) -> pathlib.Path:
+    """
+    `syscall_database` with the per syscall tables of extract-io-syscalls.
+    """
+    import sqlite3
+
+    from commands.extract import create_tables, extract_syscalls, make_handlers
+
+    con = sqlite3.connect(syscall_database)
+    handlers = make_handlers()
+    create_tables(con, handlers)
+    extract_syscalls(con, handlers, False)
+    con.close()
+    return syscall_database
@@ -0,0 +1,89 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import sqlite3
+
+import numpy as np
+from commands.analyze import (
+    OPEN,
+    PERCENTILES,
+    READ,
+    SEEK,
+    access_pattern,
+    existing_call_tables,
+    file_summary,
+    read_size_histogram,
+    reconstruct_positions,
+)
+
+
+def test_reconstruct_positions() -> None:
+    # First file: open, two reads, seek forward, read
+    # Second file: traced from the middle, read, seek, failed read, read
+    kind = np.array([OPEN, READ, READ, SEEK, READ, READ, SEEK, READ, READ])
+    value = np.array([3, 4096, 4096, 12288, 4096, 100, 50, -1, 20])
+    group_start = np.array([1, 0, 0, 0, 0, 1, 0, 0, 0], dtype=bool)
+
+    before, known = reconstruct_positions(group_start, kind, value)
+    np.testing.assert_array_equal(
+        known, [False, True, True, True, True, False, False, True, True]
+    )
+    np.testing.assert_array_equal(before[known], [0, 4096, 8192, 12288, 50, 50])
+
+
+def test_access_pattern(extracted_database) -> None:
+    con = sqlite3.connect(extracted_database)
+    tables = existing_call_tables(con)
+    pattern = access_pattern(con, tables)
+    # Every repetition of the trace reads a.grib sequentially then skips
+    # forward, b.grib is read after a forward and a backward seek
+    assert pattern["reads_classified"] == 98
+    assert pattern["sequential_reads"] == 20
+    assert pattern["random_reads"] == 78
+    assert pattern["forward_gaps"] == 39
+    assert pattern["backward_gaps"] == 39
+    assert pattern["seeks_classified"] == 60
+    assert pattern["noop_seeks"] == 0
+    assert pattern["forward_seeks"] == 40
+    assert pattern["backward_seeks"] == 20
+    assert list(pattern["seek_distance_bytes"]) == [f"p{p:g}" for p in PERCENTILES]
+
+    with con:
+        con.execute("delete from lseek_calls")
+    pattern = access_pattern(con, tables)
+    assert pattern["seeks_classified"] == 0
+    assert pattern["seek_distance_bytes"] == {f"p{p:g}": 0.0 for p in PERCENTILES}
+    con.close()
+
+
+def test_file_summary_and_read_sizes(extracted_database) -> None:
+    con = sqlite3.connect(extracted_database)
+    files = file_summary(con, existing_call_tables(con))
+    # Failed opens are listed as well
+    assert [f["path"] for f in files] == [
+        "/data/a.grib",
+        "/data/b.grib",
+        "/data/missing",
+    ]
+    assert files[0] == {
+        "path": "/data/a.grib",
+        "reads": 60,
+        "bytes_read": 20 * 3 * 4096,
+        "read_seconds": files[0]["read_seconds"],
+        "seeks": 20,
+        "opens": 20,
+        "closes": 20,
+    }
+    assert files[1]["bytes_read"] == 20 * (2048 + 512)
+    assert (files[2]["reads"], files[2]["opens"]) == (0, 20)
+    assert read_size_histogram(con) == [
+        {"max_size": 512, "reads": 20, "bytes": 20 * 512},
+        {"max_size": 2048, "reads": 20, "bytes": 20 * 2048},
+        {"max_size": 4096, "reads": 60, "bytes": 60 * 4096},
+    ]
+    con.close()
@@ -0,0 +1,83 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import sqlite3
+
+import pytest
+from commands.chunks import attribute_syscalls, create_tables, import_chunk_log
+
+from zfdb import ChunkSpan, JsonlTracer
+
+
+@pytest.fixture
+def chunk_log(tmp_path):
+    """
+    Chunk accesses of thread 4242 covering the reads of a.grib and of
+    b.grib, and one access of a thread without traced syscalls.
+    """
+    path = tmp_path / "chunks.jsonl"
+    tracer = JsonlTracer(path, view="view-a")
+    for key, tid, start, end in [
+        ((0, 0, 0, 0), 4242, 1740472038.60015, 1740472038.60055),
+        ((1, 0, 0, 0), 4242, 1740472038.60055, 1740472038.60095),
+        ((2, 0, 0, 0), 99, 1740472038.6, 1740472038.7),
+    ]:
+        tracer.on_chunk(
+            ChunkSpan(
+                key=key,
+                extractor="eccodes",
+                start=start,
+                end=end,
+                pid=1,
+                tid=tid,
+                stages={"retrieve": end - start},
+                nbytes=4096,
+                field_count=1,
+            )
+        )
+    tracer.close()
+    return path
+
+
+def attribution(database, chunk_log) -> list[tuple]:
+    con = sqlite3.connect(database)
+    create_tables(con)
+    import_chunk_log(con, [chunk_log], False)
+    attribute_syscalls(con)
+    rows = con.execute(
+        """
+        select c.key, c.view, a.syscalls, a.syscall_seconds, a.bytes_read, a.opens,
+            a.files_read
+        from chunk_accesses c join chunk_attribution a on a.chunk_access_id = c.id
+        order by c.id
+        """
+    ).fetchall()
+    con.close()
+    return rows
+
+
+def test_chunk_attribution(extracted_database, chunk_log) -> None:
+    rows = attribution(extracted_database, chunk_log)
+    # Every event of the trace fixture is repeated 20 times
+    assert [row[:3] for row in rows] == [
+        ("[0, 0, 0, 0]", "view-a", 20 * 4),
+        ("[1, 0, 0, 0]", "view-a", 20 * 4),
+        ("[2, 0, 0, 0]", "view-a", 0),
+    ]
+    assert rows[0][3] == pytest.approx(20 * (0.000087 + 0.000081 + 0.000003 + 0.000052))
+    assert [row[4:] for row in rows] == [
+        (20 * 3 * 4096, 0, 1),
+        (20 * 2048, 20, 1),
+        (0, 0, 0),
+    ]
+
+
+def test_chunk_attribution_without_read_calls(syscall_database, chunk_log) -> None:
+    rows = attribution(syscall_database, chunk_log)
+    assert [row[4] for row in rows] == [20 * 3 * 4096, 20 * 2048, 0]
+    assert [row[6] for row in rows] == [None, None, None]
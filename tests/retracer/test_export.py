@@ -0,0 +1,87 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import json
+import sqlite3
+
+import numpy as np
+import pytest
+from commands.export import default_tables, export_table_npy, export_table_parquet
+
+
+def load_npy(directory) -> dict[str, list]:
+    """
+    Columns of an exported table with categorical codes decoded.
+    """
+    schema = json.loads((directory / "schema.json").read_text())
+    columns = {}
+    for name, description in schema["columns"].items():
+        values = np.load(directory / f"{name}.npy", mmap_mode="r")
+        assert len(values) == schema["rows"]
+        assert str(values.dtype) == description["dtype"]
+        if description["encoding"] == "categorical":
+            categories = json.loads((directory / f"{name}.categories.json").read_text())
+            columns[name] = [categories[code] for code in values]
+        else:
+            columns[name] = values.tolist()
+    return columns
+
+
+@pytest.mark.parametrize("batch_size", [7, 1_000_000])
+def test_npy_export_round_trip(tmp_path, extracted_database, batch_size) -> None:
+    con = sqlite3.connect(extracted_database)
+    assert default_tables(con)[0] == "syscall_events"
+    assert "lseek_calls" in default_tables(con)
+
+    for table in ["syscall_events", "read_calls", "lseek_calls"]:
+        export_table_npy(con, table, tmp_path / "out", batch_size, False)
+    events = load_npy(tmp_path / "out" / "syscall_events")
+    # The raw args are not exported
+    assert list(events) == [
+        "id",
+        "pid",
+        "unix_time",
+        "syscall",
+        "return_code",
+        "duration",
+    ]
+    rows = con.execute(
+        "select id, pid, unix_time, syscall, return_code, duration from syscall_events order by id"
+    ).fetchall()
+    assert list(zip(*events.values())) == rows
+
+    reads = load_npy(tmp_path / "out" / "read_calls")
+    expected = con.execute(
+        "select path, cast(size as integer) from read_calls"
+    ).fetchall()
+    assert list(zip(reads["path"], reads["size"])) == expected
+    assert np.load(tmp_path / "out" / "read_calls" / "size.npy").dtype == np.int64
+
+    seeks = load_npy(tmp_path / "out" / "lseek_calls")
+    assert set(seeks["whence"]) == {"SEEK_SET"}
+    assert seeks["offset"][:3] == [12288, 1024, 0]
+    con.close()
+
+
+def test_export_of_unknown_table(tmp_path, extracted_database) -> None:
+    con = sqlite3.connect(extracted_database)
+    with pytest.raises(Exception, match="does not exist"):
+        export_table_npy(con, "missing_calls", tmp_path, 10, False)
+    con.close()
+
+
+def test_parquet_export_round_trip(tmp_path, extracted_database) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    con = sqlite3.connect(extracted_database)
+    export_table_parquet(con, "read_calls", tmp_path, 7, False)
+    table = pq.read_table(tmp_path / "read_calls.parquet").to_pydict()
+    expected = con.execute(
+        "select path, cast(size as integer) from read_calls"
+    ).fetchall()
+    assert list(zip(table["path"], table["size"])) == expected
+    con.close()
@@ -0,0 +1,116 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import argparse
+import shutil
+import sqlite3
+
+import pytest
+from commands.extract import (
+    SyscallHandler,
+    command_extract_io_events,
+    create_tables,
+    extract_range,
+    make_handlers,
+)
+
+
+def read_handler() -> SyscallHandler:
+    (handler,) = [h for h in make_handlers() if h.call == "read"]
+    return handler
+
+
+def test_handle_many_matches_handle() -> None:
+    handler = read_handler()
+    args = ['3</data/a.grib>, ""..., 4096', '4</data/b.grib>, ""..., 512']
+    assert handler.handle_many(args) == [handler.handle(a) for a in args]
+    assert handler.handle_many(args) == [
+        ("/data/a.grib", "4096"),
+        ("/data/b.grib", "512"),
+    ]
+    assert handler.handle_many([]) == []
+
+    close = [h for h in make_handlers() if h.call == "close"][0]
+    assert close.handle_many(["3</data/a.grib>"]) == [("/data/a.grib",)]
+
+
+def test_handle_many_falls_back_per_row() -> None:
+    handler = read_handler()
+    # The newline splits the batched match, the row is matched on its own
+    args = ['3</data/a.grib>, ""..., 4096', '5</data/we\nird.grib>, ""..., 64']
+    assert handler.handle_many(args) == [
+        ("/data/a.grib", "4096"),
+        ("/data/we\nird.grib", "64"),
+    ]
+    with pytest.raises(Exception, match="Cannot match read args"):
+        handler.handle_many(args + ["not a read"])
+
+
+def test_extract_range_only_reads_the_range(syscall_database) -> None:
+    con = sqlite3.connect(syscall_database)
+    handlers = make_handlers()
+    rows, covered = extract_range(con, handlers, 1, 7)
+    assert covered == 6
+    by_call = {h.call: r for h, r in zip(handlers, rows)}
+    assert [row[0] for row in by_call["read"]] == [3, 4, 6]
+    assert by_call["read"][0] == (
+        3,
+        4242,
+        1740472038.6002,
+        "read",
+        4096,
+        0.000087,
+        "/data/a.grib",
+        "4096",
+    )
+    assert [row[-1] for row in by_call["lseek"]] == ["SEEK_SET"]
+    assert by_call["close"] == []
+    con.close()
+
+
+def extract(database, **kwargs) -> dict[str, list[tuple]]:
+    command_extract_io_events(
+        argparse.Namespace(database=database, progress=False, **kwargs)
+    )
+    con = sqlite3.connect(database)
+    tables = {
+        h.table: con.execute(f"select * from {h.table} order by id").fetchall()
+        for h in make_handlers()
+    }
+    con.close()
+    return tables
+
+
+def test_parallel_extraction_matches_serial(tmp_path, syscall_database) -> None:
+    with sqlite3.connect(syscall_database) as con:
+        con.execute(
+            "insert into syscall_events values(null, 4242, 1740472039.0, 'read', ?, 64, 0.00001)",
+            ('5</data/we\nird.grib>, ""..., 64',),
+        )
+    con.close()
+    parallel_database = tmp_path / "parallel.sqlite"
+    shutil.copy(syscall_database, parallel_database)
+
+    serial = extract(syscall_database, jobs=1, batch_size=100_000)
+    parallel = extract(parallel_database, jobs=2, batch_size=7)
+    assert parallel == serial
+    assert len(serial["read_calls"]) == 20 * 5 + 1
+    assert serial["read_calls"][-1][-2:] == ("/data/we\nird.grib", "64")
+    assert len(serial["openat_calls"]) == 20 * 3
+    assert serial["fstat_calls"][0][-1] == "/data/a.grib"
+
+
+def test_create_tables_replaces_previous_extraction(syscall_database) -> None:
+    con = sqlite3.connect(syscall_database)
+    handlers = make_handlers()
+    create_tables(con, handlers)
+    con.execute("insert into read_calls values(null, 1, 1, 1, 'read', 1, 1, 'x', '1')")
+    con.commit()
+    create_tables(con, handlers)
+    assert con.execute("select count(*) from read_calls").fetchone() == (0,)
+    con.close()
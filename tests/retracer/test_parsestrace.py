@@ -0,0 +1,99 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import sqlite3
+
+import pytest
+from commands.parsestrace import (
+    parse_chunk,
+    parse_lines,
+    parse_strace_file_into_database,
+    split_into_chunks,
+)
+from database import configure_bulk_load, create_database, create_indexes
+
+
+def test_parse_lines_counts_unmatched_lines(strace_lines) -> None:
+    data = "\n".join(strace_lines).encode()
+    rows, unmatched = parse_lines(4242, data)
+    assert unmatched == 1
+    assert len(rows) == len(strace_lines) - 1
+    assert rows[2] == (
+        4242,
+        1740472038.6002,
+        "read",
+        '3</data/a.grib>, ""..., 4096',
+        4096,
+        0.000087,
+    )
+    assert rows[-1][4] == -1
+    assert parse_lines(4242, b"") == ([], 0)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 97, 1000, 1 << 20])
+def test_chunks_are_line_aligned_and_lose_no_lines(strace_file, chunk_size) -> None:
+    data = strace_file.read_bytes()
+    chunks = split_into_chunks(strace_file, chunk_size)
+    assert chunks[0][0] == 0
+    assert chunks[-1][1] == len(data)
+    assert all(a[1] == b[0] for a, b in zip(chunks[:-1], chunks[1:]))
+    assert all(data[end - 1 : end] == b"\n" for _, end in chunks)
+
+    rows, unmatched, nbytes = [], 0, 0
+    for start, end in chunks:
+        chunk_rows, chunk_unmatched, chunk_bytes = parse_chunk(strace_file, start, end)
+        rows += chunk_rows
+        unmatched += chunk_unmatched
+        nbytes += chunk_bytes
+    assert (rows, unmatched) == parse_lines(4242, data)
+    assert nbytes == len(data)
+
+
+def test_chunks_without_trailing_newline(tmp_path, strace_lines) -> None:
+    path = tmp_path / "trace.7"
+    path.write_bytes("\n".join(strace_lines[:3]).encode())
+    chunks = split_into_chunks(path, 10)
+    assert len(chunks) == 3
+    rows = [row for chunk in chunks for row in parse_chunk(path, *chunk)[0]]
+    assert [row[2] for row in rows] == ["openat", "fstat", "read"]
+    assert {row[0] for row in rows} == {7}
+
+
+def load(tmp_path, name: str, files, **kwargs) -> list[tuple]:
+    database = create_database(tmp_path / name, force=False)
+    configure_bulk_load(database)
+    assert database.execute("pragma journal_mode").fetchone() == ("off",)
+    parse_strace_file_into_database(files, database, False, **kwargs)
+    # Indexes are only created once all events are loaded
+    assert not database.execute(
+        "select name from sqlite_master where type = 'index'"
+    ).fetchall()
+    create_indexes(database)
+    database.close()
+
+    con = sqlite3.connect(tmp_path / name)
+    indexes = con.execute(
+        "select name from sqlite_master where type = 'index' and tbl_name = 'syscall_events'"
+    ).fetchall()
+    assert len(indexes) == 2
+    rows = con.execute("select * from syscall_events order by id").fetchall()
+    con.close()
+    return rows
+
+
+def test_parallel_parsing_matches_serial(tmp_path, strace_file, strace_lines) -> None:
+    other = tmp_path / "trace.4243"
+    other.write_text("\n".join(strace_lines[:5]) + "\n")
+    files = [strace_file, other]
+
+    serial = load(tmp_path, "serial.sqlite", files, jobs=1, chunk_size=1 << 20)
+    parallel = load(tmp_path, "parallel.sqlite", files, jobs=3, chunk_size=200)
+    assert len(serial) == 20 * (len(strace_lines) - 1) + 5
+    assert parallel == serial
+    # Ids follow the order of the input files
+    assert [row[1] for row in serial[-5:]] == [4243] * 5
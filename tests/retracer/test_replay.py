@@ -0,0 +1,74 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import sqlite3
+import time
+from pathlib import Path
+
+import pytest
+from commands.replay import (
+    PathMapper,
+    ReplayStats,
+    create_replay_indexes,
+    recorded_events,
+    recorded_pids,
+    replay_stream,
+)
+from tqdm import tqdm
+
+
+def test_path_mapper() -> None:
+    mapper = PathMapper(
+        Path("/replay"), ["/data=/scratch/data", "/data/fdb=/fast/fdb", "/x="]
+    )
+    # Longest matching prefix wins, unmapped paths are placed under the target
+    assert mapper("/data/fdb/root/a.grib") == "/fast/fdb/root/a.grib"
+    assert mapper("/data/other/b.grib") == "/scratch/data/other/b.grib"
+    assert mapper("/x/y") == "/y"
+    assert mapper("/home/user/c.grib") == "/replay/home/user/c.grib"
+    assert PathMapper(Path("/replay"), [])("relative") == "/replay/relative"
+
+    with pytest.raises(Exception, match="Invalid path mapping"):
+        PathMapper(Path("/replay"), ["/data"])
+
+
+def test_replay_stream_reads_recorded_files(tmp_path, extracted_database) -> None:
+    target = tmp_path / "replay"
+    (target / "data").mkdir(parents=True)
+    (target / "data" / "a.grib").write_bytes(b"a" * 16384)
+    (target / "data" / "b.grib").write_bytes(b"b" * 4096)
+
+    con = sqlite3.connect(extracted_database)
+    create_replay_indexes(con)
+    assert recorded_pids(con) == [4242]
+    # The failed openat of each repetition is not replayed
+    assert recorded_events(con, [4242]) == (240, 1740472038.6)
+    assert recorded_events(con, [1]) == (0, None)
+    con.close()
+
+    stats = ReplayStats()
+    with tqdm(disable=True) as progress:
+        replay_stream(
+            extracted_database,
+            4242,
+            PathMapper(target, []),
+            0,
+            0.0,
+            time.perf_counter(),
+            stats,
+            progress,
+        )
+    assert stats.errors == 0
+    # Reads replay the recorded number of bytes, not the requested size
+    assert stats.bytes_read == 20 * (3 * 4096 + 2048 + 512)
+    assert {call: len(values) for call, values in stats.latencies.items()} == {
+        "openat": 40,
+        "lseek": 60,
+        "read": 100,
+        "close": 40,
+    }
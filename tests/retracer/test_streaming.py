@@ -0,0 +1,115 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import os
+import queue
+import sqlite3
+import threading
+
+import pytest
+from commands.parsestrace import (
+    FLUSH_INTERVAL,
+    LineAssembler,
+    read_source,
+    stream_strace_into_database,
+)
+from database import configure_streaming, create_database, create_indexes
+
+
+def test_line_assembler_joins_unfinished_calls() -> None:
+    assembler = LineAssembler(7)
+    lines = [
+        "1234 1740472038.600000 read(3</data/x>, <unfinished ...>",
+        "1235 1740472038.600010 close(4</data/y>) = 0 <0.000002>",
+        '1234 1740472038.600087 <... read resumed>""..., 4096) = 4096 <0.000087>',
+        "1740472038.600100 lseek(3</data/x>, 0, SEEK_SET) = 0 <0.000001>",
+        '1236 1740472038.600200 <... read resumed>""..., 1) = 1 <0.000001>',
+        "1236 +++ exited with 0 +++",
+    ]
+    rows = [row for row in map(assembler.feed, lines) if row is not None]
+    assert rows == [
+        (1235, 1740472038.60001, "close", "4</data/y>", 0, 0.000002),
+        # The call is recorded at the time it started
+        (1234, 1740472038.6, "read", '3</data/x>, ""..., 4096', 4096, 0.000087),
+        # Lines without pid prefix belong to the default pid
+        (7, 1740472038.6001, "lseek", "3</data/x>, 0, SEEK_SET", 0, 0.000001),
+    ]
+    # A resumed call without its start and the exit line are skipped
+    assert assembler.unmatched == 2
+
+
+def next_batch(rows: queue.Queue) -> list[tuple]:
+    return rows.get(timeout=10 * FLUSH_INTERVAL)
+
+
+def test_read_source_follows_growing_file(tmp_path, strace_lines) -> None:
+    path = tmp_path / "trace.4242"
+    path.write_text(strace_lines[0] + "\n")
+    rows: queue.Queue = queue.Queue()
+    reader = threading.Thread(
+        target=read_source,
+        args=(str(path), rows, 2 * FLUSH_INTERVAL, threading.Event()),
+    )
+    reader.start()
+    # The partial batch is flushed while the file does not grow
+    assert [row[2] for row in next_batch(rows)] == ["openat"]
+
+    with open(path, "a") as f:
+        # A line written in two parts is only parsed once complete
+        f.write(strace_lines[1][:20])
+        f.flush()
+        with pytest.raises(queue.Empty):
+            rows.get(timeout=2 * FLUSH_INTERVAL)
+        f.write(strace_lines[1][20:] + "\n" + strace_lines[2] + "\n")
+    batch = next_batch(rows)
+    if len(batch) == 1:
+        batch += next_batch(rows)
+    assert [row[2] for row in batch] == ["fstat", "read"]
+    assert {row[0] for row in batch} == {4242}
+
+    reader.join(timeout=10)
+    assert not reader.is_alive()
+    assert rows.empty()
+
+
+def test_read_source_flushes_idle_fifo(tmp_path, strace_lines) -> None:
+    path = tmp_path / "fifo"
+    os.mkfifo(path)
+    rows: queue.Queue = queue.Queue()
+    reader = threading.Thread(
+        target=read_source, args=(str(path), rows, 60, threading.Event())
+    )
+    reader.start()
+    with open(path, "w") as f:
+        f.write(strace_lines[0] + "\n" + strace_lines[2][:10])
+        f.flush()
+        # The writer keeps the pipe open, the complete line is still delivered
+        assert [row[2] for row in next_batch(rows)] == ["openat"]
+        f.write(strace_lines[2][10:] + "\n")
+    reader.join(timeout=10)
+    assert not reader.is_alive()
+    assert [row[2] for row in next_batch(rows)] == ["read"]
+    assert rows.empty()
+
+
+def test_stream_into_database(tmp_path, strace_file, strace_lines) -> None:
+    database = create_database(tmp_path / "stream.sqlite", force=False)
+    configure_streaming(database)
+    create_indexes(database)
+    stream_strace_into_database(
+        [str(tmp_path / "trace.*")],
+        database,
+        False,
+        idle_timeout=FLUSH_INTERVAL,
+        commit_interval=0,
+    )
+    database.close()
+    con = sqlite3.connect(tmp_path / "stream.sqlite")
+    (count,) = con.execute("select count(*) from syscall_events").fetchone()
+    con.close()
+    assert count == 20 * (len(strace_lines) - 1)
@@ -0,0 +1,13 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import pathlib
+import sys
+
+# The server is run as a script, its modules import each other by name
+sys.path.insert(0, str(pathlib.Path(__file__).parents[2] / "server"))
@@ -0,0 +1,77 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import asyncio
+
+from batch import pack_frames, unpack_frames
+
+import server
+from zfdb import (
+    ChunkAxisType,
+    FdbSource,
+    FdbZarrArray,
+    FdbZarrGroup,
+    FdbZarrStore,
+    Request,
+)
+from zfdb.utils.fakes import make_fakes
+from zfdb.utils.synthetic import SyntheticDataset
+
+
+def test_frames_round_trip() -> None:
+    values = [b"abc", None, b"", b"\x00" * 17, None]
+    assert unpack_frames(pack_frames(values)) == values
+    assert unpack_frames(pack_frames([])) == []
+
+
+def test_batch_route_serves_keys_in_order() -> None:
+    dataset = SyntheticDataset(grid="N32", dates=["20200101"], steps=[0, 6, 12])
+    fdb, gribjump = make_fakes(dataset.messages())
+    source = FdbSource(
+        extractor="gribjump",
+        fdb=fdb,
+        gribjump=gribjump,
+        request=Request(request=dataset.mars_request(), chunk_axis=ChunkAxisType.Step),
+    )
+    mapping = FdbZarrStore(
+        FdbZarrGroup(children=[FdbZarrArray(name="data", datasource=source)])
+    )
+    server.view_hashes[42] = mapping
+    client = server.app.test_client()
+    try:
+        keys = ["data/c/2/0/0/0", "data/zarr.json", "data/c/0/0/0/0"]
+        gribjump.calls.clear()
+        response = client.post("/get/batch/42", json={"keys": keys})
+        assert response.status_code == 200
+        # Both chunks were extracted in a single call
+        assert gribjump.calls["extract"] == 1
+        expected = [asyncio.run(mapping.get(key)).to_bytes() for key in keys]
+        assert unpack_frames(response.data) == expected
+
+        # Unknown and malformed keys are returned as missing frames, the known
+        # keys are still extracted in a single call
+        gribjump.calls.clear()
+        response = client.post(
+            "/get/batch/42",
+            json={
+                "keys": ["data/c/9/0/0/0", keys[0], "data/c/x", "other/c/0", keys[2]]
+            },
+        )
+        assert response.status_code == 200
+        assert gribjump.calls["extract"] == 1
+        assert unpack_frames(response.data) == [
+            None,
+            expected[0],
+            None,
+            None,
+            expected[2],
+        ]
+
+        assert client.post("/get/batch/42", json={"key": keys}).status_code == 400
+    finally:
+        del server.view_hashes[42]
@@ -0,0 +1,110 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import json
+
+import pytest
+from metrics import Counter, Gauge, Histogram, Registry
+
+import server
+from zfdb.utils.fakes import make_fakes
+from zfdb.utils.synthetic import SyntheticDataset
+
+
+def sample(text: str, name: str) -> float:
+    """
+    Value of the sample `name`, including its labels, in rendered metrics.
+    """
+    for line in text.splitlines():
+        if line.rpartition(" ")[0] == name:
+            return float(line.rpartition(" ")[2])
+    return 0.0
+
+
+def test_counter_escapes_label_values() -> None:
+    counter = Counter("zfdb_test_total", "Test counter", ("path",))
+    counter.inc(path='a"b\\c\nd')
+    counter.inc(2, path='a"b\\c\nd')
+    counter.inc(path="plain")
+    assert counter.render() == [
+        "# HELP zfdb_test_total Test counter",
+        "# TYPE zfdb_test_total counter",
+        'zfdb_test_total{path="a\\"b\\\\c\\nd"} 3',
+        'zfdb_test_total{path="plain"} 1',
+    ]
+    with pytest.raises(ValueError):
+        counter.inc(route="plain")
+
+
+def test_gauge_renders_current_value() -> None:
+    gauge = Gauge("zfdb_test_open", "Test gauge")
+    gauge.set(5)
+    gauge.inc()
+    gauge.dec(2)
+    assert gauge.render()[-1] == "zfdb_test_open 4"
+
+
+def test_histogram_buckets_are_cumulative() -> None:
+    histogram = Histogram(
+        "zfdb_test_seconds", "Test histogram", ("stage",), buckets=(2.0, 1.0)
+    )
+    for value in (0.5, 1.0, 1.5, 3.0):
+        histogram.observe(value, stage="read")
+    assert histogram.render()[2:] == [
+        'zfdb_test_seconds_bucket{stage="read",le="1.0"} 2',
+        'zfdb_test_seconds_bucket{stage="read",le="2.0"} 3',
+        'zfdb_test_seconds_bucket{stage="read",le="+Inf"} 4',
+        'zfdb_test_seconds_sum{stage="read"} 6.0',
+        'zfdb_test_seconds_count{stage="read"} 4',
+    ]
+
+
+def test_registry_renders_all_metrics() -> None:
+    registry = Registry()
+    registry.counter("zfdb_a_total", "A").inc()
+    registry.gauge("zfdb_b", "B").set(1)
+    text = registry.render()
+    assert text.endswith("\n")
+    assert sample(text, "zfdb_a_total") == 1
+    assert sample(text, "zfdb_b") == 1
+    assert "# TYPE zfdb_b gauge" in text
+
+
+def test_requests_update_server_metrics(monkeypatch) -> None:
+    dataset = SyntheticDataset(grid="N32", dates=["20200101"], steps=[0, 6])
+    fdb, gribjump = make_fakes(dataset.messages())
+    monkeypatch.setattr(server, "fdb", fdb, raising=False)
+    monkeypatch.setattr(server, "gribjump", gribjump, raising=False)
+    client = server.app.test_client()
+
+    def metric(name: str) -> float:
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.content_type == Registry.CONTENT_TYPE
+        return sample(response.get_data(as_text=True), name)
+
+    create = 'zfdb_http_requests_total{route="/create",method="POST",status="200"}'
+    chunk = 'zfdb_bytes_served_total{route="/get/zarr/<hash>/<path:zarr_path>"}'
+    miss = 'zfdb_view_cache_requests_total{result="miss"}'
+    hit = 'zfdb_view_cache_requests_total{result="hit"}'
+    before = {name: metric(name) for name in (create, chunk, miss, hit)}
+
+    body = {"requests": [dataset.mars_request()], "metrics_test": True}
+    view = json.loads(client.post("/create", json=body).data)["hash"]
+    try:
+        assert json.loads(client.post("/create", json=body).data)["hash"] == view
+        response = client.get(f"/get/zarr/{view}/data/c/1/0/0/0")
+        assert response.status_code == 200
+
+        assert metric(create) == before[create] + 2
+        assert metric(miss) == before[miss] + 1
+        assert metric(hit) == before[hit] + 1
+        assert metric(chunk) == before[chunk] + len(response.data)
+        assert metric("zfdb_open_views") == len(server.view_hashes)
+    finally:
+        del server.view_hashes[view]
@@ -0,0 +1,74 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import numpy as np
+import pytest
+
+import server
+from zfdb import ChunkAxisType, Request, make_forecast_data_view
+from zfdb.utils.fakes import make_fakes
+from zfdb.utils.synthetic import SyntheticDataset
+
+
+@pytest.fixture
+def client():
+    dataset = SyntheticDataset(grid="N32", dates=["20200101"], steps=[0, 6])
+    fdb, gribjump = make_fakes(dataset.messages())
+    server.view_hashes[43] = make_forecast_data_view(
+        fdb=fdb,
+        gribjump=gribjump,
+        request=Request(request=dataset.mars_request(), chunk_axis=ChunkAxisType.Step),
+    )
+    try:
+        yield server.app.test_client()
+    finally:
+        del server.view_hashes[43]
+
+
+def test_reduce_route(client) -> None:
+    response = client.post(
+        "/reduce/43",
+        json={"operation": "count", "axes": [0, 3], "selection": {"3": [0, 1, 2]}},
+    )
+    assert response.status_code == 200
+    # Both steps at three grid points for every field
+    fields = server.view_hashes[43].datasource("data").chunk_shape()[1]
+    assert response.get_json() == {"shape": [fields, 1], "values": [[6]] * fields}
+
+    response = client.post("/reduce/43", json={"operation": "mean", "axes": [3]})
+    source = server.view_hashes[43].datasource("data")
+    np.testing.assert_allclose(
+        response.get_json()["values"], source.reduce("mean", [3])
+    )
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"axes": [0]},
+        {"operation": "median", "axes": [0]},
+        {"operation": "mean", "axes": [7]},
+        {"operation": "mean", "axes": ["x"]},
+        {"operation": "mean", "axes": [1.5]},
+        {"operation": "mean", "axes": 3},
+        {"operation": "mean", "axes": [0], "selection": {"3": []}},
+        {"operation": "mean", "axes": [0], "selection": {"3": [0.5]}},
+        {"operation": "mean", "axes": [0], "selection": {"x": [0]}},
+        {"operation": "mean", "axes": [0], "selection": {"3": [10**9]}},
+        {"operation": "mean", "axes": [0], "selection": [3, 0]},
+    ],
+)
+def test_reduce_route_rejects_invalid_requests(client, body) -> None:
+    response = client.post("/reduce/43", json=body)
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+
+def test_reduce_route_unknown_array(client) -> None:
+    response = client.post("/reduce/43", json={"operation": "mean", "array": "x"})
+    assert response.status_code == 404
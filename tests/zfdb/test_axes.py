@@ -0,0 +1,109 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import math
+
+import eccodes
+import numpy as np
+import pytest
+import zarr
+
+from zfdb import Axis, FdbAxesSource, FdbZarrArray, FdbZarrGroup, FdbZarrStore
+from zfdb.error import ZfdbError
+from zfdb.utils.chunk_mapper import ChunkMapper
+from zfdb.utils.fakes import make_fakes
+from zfdb.utils.synthetic import SyntheticDataset
+
+
+def test_chunk_mapper_maps_chunks_to_requests() -> None:
+    mapper = ChunkMapper(
+        {"class": "od", "date": "20200101", "step": [0, 6, 12], "number": [1, 2]},
+        [Axis("number", [1, 2]), Axis("step", [0, 6, 12], chunk=2)],
+    )
+    assert mapper.shape == (2, 3)
+    assert mapper.chunk_dimensions == (2, 2)
+    assert mapper.map((1, 1)) == {"number": slice(1, 2), "step": slice(2, 3)}
+    assert mapper.chunk_request((0, 0)) == {
+        "class": "od",
+        "date": "20200101",
+        "number": "1",
+        "step": "0/6",
+    }
+    assert [(p, r["step"]) for p, r in mapper.field_requests((1, 0))] == [
+        ((0, 0), "0"),
+        ((0, 1), "6"),
+    ]
+    assert mapper.field_position((1, 1), {"number": ["2"], "step": ["12"]}) == (0, 0)
+    assert mapper.field_position((0, 0), {"number": ["1.0"], "step": ["6"]}) == (0, 1)
+    with pytest.raises(ZfdbError):
+        mapper.field_position((0, 0), {"number": ["1"], "step": ["12"]})
+    with pytest.raises(KeyError):
+        mapper.map((2, 0))
+
+
+@pytest.mark.parametrize(
+    "extractor, data_type, decoder",
+    [
+        ("eccodes", "float32", "eccodes"),
+        ("eccodes", "float16", "numpy"),
+        ("gribjump", "float32", "eccodes"),
+        ("gribjump", "float16", "eccodes"),
+    ],
+)
+def test_axes_source_chunks_by_member(extractor, data_type, decoder) -> None:
+    dataset = SyntheticDataset(
+        grid="N32", dates=["20200101"], steps=[0, 6, 12], members=[1, 2, 3]
+    )
+    fdb, gribjump = make_fakes(dataset.messages())
+    expected = {}
+    for message in dataset.messages():
+        handle = eccodes.codes_new_from_message(message)
+        key = tuple(
+            eccodes.codes_get(handle, k) for k in ["number", "step", "shortName"]
+        )
+        expected[key] = eccodes.codes_get_values(handle)
+        eccodes.codes_release(handle)
+
+    source = FdbAxesSource(
+        extractor=extractor,
+        fdb=fdb,
+        gribjump=gribjump,
+        request=dataset.mars_request(),
+        axes=[
+            Axis("number", [2, 3, 1]),
+            Axis("step", [0, 6, 12], chunk=2),
+            Axis("param", ["10v", "10u"], chunk=2),
+        ],
+        points_chunk=4000,
+        data_type=data_type,
+        decoder=decoder,
+    )
+    array = zarr.open_group(
+        FdbZarrStore(
+            FdbZarrGroup(children=[FdbZarrArray(name="x", datasource=source)])
+        ),
+        mode="r",
+        zarr_format=3,
+    )["x"]
+    assert array.shape == (3, 3, 2, 6114)
+    assert array.chunks == (1, 2, 2, 4000)
+    assert array.metadata.dimension_names == ("number", "step", "param", "values")
+    assert array.dtype == np.dtype(data_type)
+
+    values = array[:]
+    if extractor == "eccodes":
+        # One retrieve for the first field and one per chunk
+        assert fdb.calls["retrieve"] == 1 + math.prod(source.chunks())
+    for i, number in enumerate([2, 3, 1]):
+        for j, step in enumerate([0, 6, 12]):
+            for k, param in enumerate(["10v", "10u"]):
+                np.testing.assert_allclose(
+                    values[i, j, k],
+                    expected[(number, step, param)].astype(data_type),
+                    rtol=1e-6,
+                )
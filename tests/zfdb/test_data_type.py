@@ -0,0 +1,92 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import eccodes
+import numpy as np
+import pytest
+import zarr
+
+from zfdb import (
+    ChunkAxisType,
+    FdbSource,
+    FdbZarrArray,
+    FdbZarrGroup,
+    FdbZarrStore,
+    Request,
+)
+from zfdb.error import ZfdbError
+from zfdb.utils.fakes import make_fakes
+from zfdb.utils.synthetic import SyntheticDataset
+
+
+@pytest.mark.parametrize("extractor", ["eccodes", "gribjump"])
+def test_float16_view_halves_chunks(extractor) -> None:
+    dataset = SyntheticDataset(grid="N32", dates=["20200101"], steps=[0, 6])
+    fdb, gribjump = make_fakes(dataset.messages())
+
+    def open_data(data_type):
+        source = FdbSource(
+            extractor=extractor,
+            fdb=fdb,
+            gribjump=gribjump,
+            request=Request(
+                request=dataset.mars_request(), chunk_axis=ChunkAxisType.Step
+            ),
+            data_type=data_type,
+        )
+        store = FdbZarrStore(
+            FdbZarrGroup(children=[FdbZarrArray(name="data", datasource=source)])
+        )
+        return source, zarr.open_group(store, mode="r", zarr_format=3)["data"]
+
+    full_source, full = open_data("float32")
+    half_source, half = open_data("float16")
+    assert half.dtype == np.float16
+    assert half_source.chunk_nbytes((0, 0, 0, 0)) * 2 == full_source.chunk_nbytes(
+        (0, 0, 0, 0)
+    )
+    np.testing.assert_array_equal(half[:], full[:].astype(np.float16))
+    np.testing.assert_allclose(
+        half_source.reduce("mean", (0, 2, 3)),
+        full[:].astype(np.float16).astype(np.float64).mean(axis=(0, 2, 3)),
+    )
+
+    with pytest.raises(ZfdbError):
+        open_data("bfloat16")
+
+
+@pytest.mark.parametrize("extractor", ["eccodes", "gribjump"])
+def test_float16_view_rejects_values_beyond_its_range(extractor) -> None:
+    dataset = SyntheticDataset(grid="N32", dates=["20200101"], steps=[0, 6])
+    messages = []
+    for message in dataset.messages():
+        # Surface pressure like values in Pa
+        handle = eccodes.codes_new_from_message(message)
+        eccodes.codes_set_values(handle, eccodes.codes_get_values(handle) + 101325)
+        messages.append(eccodes.codes_get_message(handle))
+        eccodes.codes_release(handle)
+    fdb, gribjump = make_fakes(messages)
+
+    def source(data_type):
+        return FdbSource(
+            extractor=extractor,
+            fdb=fdb,
+            gribjump=gribjump,
+            request=Request(
+                request=dataset.mars_request(), chunk_axis=ChunkAxisType.Step
+            ),
+            data_type=data_type,
+        )
+
+    assert np.all(
+        source("float32")[(0, 0, 0, 0)].as_numpy_array().view(np.float32) > 65504
+    )
+    with pytest.raises(ZfdbError, match="float16"):
+        source("float16")[(0, 0, 0, 0)]
+    with pytest.raises(ZfdbError, match="float16"):
+        source("float16").reduce("mean", (0,))
@@ -0,0 +1,77 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import io
+
+import eccodes
+import numpy as np
+import pytest
+
+from zfdb import BoundingBox, ChunkAxisType, FdbSource, Request
+from zfdb.decoding import SimplePacking, decode_values
+from zfdb.utils.fakes import make_fakes
+from zfdb.utils.synthetic import SyntheticDataset
+
+
+def repack(message: bytes, **keys) -> eccodes.Message:
+    handle = eccodes.codes_new_from_message(message)
+    values = eccodes.codes_get_values(handle)
+    for key, value in keys.items():
+        eccodes.codes_set(handle, key, value)
+    if keys.get("bitmapPresent"):
+        values[::7] = eccodes.codes_get(handle, "missingValue")
+    eccodes.codes_set_values(handle, values)
+    packed = eccodes.codes_get_message(handle)
+    eccodes.codes_release(handle)
+    return next(iter(eccodes.StreamReader(io.BytesIO(packed))))
+
+
+@pytest.mark.parametrize("bits", [1, 7, 8, 12, 16, 17, 24, 25, 31, 32, 40, 57])
+def test_decode_values_matches_eccodes(bits) -> None:
+    message = next(SyntheticDataset(grid="N32", dates=["20200101"]).messages())
+    msg = repack(message, bitsPerValue=bits, decimalScaleFactor=bits % 3)
+    assert SimplePacking.from_message(msg) is not None
+    expected = msg.data
+    np.testing.assert_array_equal(decode_values(msg, np.empty(len(expected))), expected)
+    np.testing.assert_array_equal(
+        decode_values(msg, np.empty(len(expected), dtype="float32")),
+        expected.astype("float32"),
+    )
+
+
+@pytest.mark.parametrize("bitmap", [False, True])
+def test_decode_values_falls_back_to_eccodes(bitmap) -> None:
+    dataset = SyntheticDataset(grid="N32", dates=["20200101"], steps=[0, 6])
+    messages = list(dataset.messages())
+    if bitmap:
+        messages = [repack(m, bitmapPresent=1).get_buffer() for m in messages]
+        msg = repack(messages[0])
+        assert SimplePacking.from_message(msg) is None
+        assert msg.get("numberOfValues") < msg.get("numberOfDataPoints")
+        np.testing.assert_array_equal(
+            decode_values(msg, np.empty(msg.get("numberOfDataPoints"))), msg.data
+        )
+    fdb, gribjump = make_fakes(messages)
+
+    def read(decoder, **kwargs):
+        source = FdbSource(
+            fdb=fdb,
+            gribjump=gribjump,
+            request=Request(
+                request=dataset.mars_request(), chunk_axis=ChunkAxisType.Step
+            ),
+            decoder=decoder,
+            **kwargs,
+        )
+        return [source[(idx, 0, 0, 0)].to_bytes() for idx in range(2)]
+
+    assert read("numpy") == read("eccodes")
+    region = BoundingBox(north=60, west=-20, south=30, east=40)
+    assert read("numpy", region=region, data_type="float16") == read(
+        "eccodes", region=region, data_type="float16"
+    )
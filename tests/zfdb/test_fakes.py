@@ -0,0 +1,85 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import time
+
+import numpy as np
+import pytest
+
+from zfdb import ChunkAxisType, FdbSource, Request
+from zfdb.utils.fakes import FakeFdb, LatencyModel, make_fakes
+from zfdb.utils.synthetic import SyntheticDataset
+
+DATASET = SyntheticDataset(
+    grid="N32",
+    dates=["20200101", "20200102"],
+    times=["0000", "1200"],
+    params=["2t", "10u", "msl"],
+)
+
+
+def test_fake_fdb_list_and_retrieve_follow_request_order() -> None:
+    fdb, _ = make_fakes(DATASET.messages())
+    request = DATASET.mars_request() | {"date": "2020-01-02", "param": "msl/2t"}
+
+    listed = list(fdb.list(request, keys=True))
+    assert [r["keys"]["param"] for r in listed] == ["151", "167", "151", "167"]
+    assert [r["keys"]["time"] for r in listed] == ["0000", "0000", "1200", "1200"]
+    assert fdb.retrieve(request).size() == sum(r["length"] for r in listed)
+    assert fdb.retrieve(request | {"date": "20210101"}).size() == 0
+
+
+def test_fake_fdb_archive_visible_after_flush() -> None:
+    fdb = FakeFdb()
+    fdb.archive(b"".join(DATASET.messages()))
+    assert list(fdb.list(DATASET.mars_request(), keys=True)) == []
+    fdb.flush()
+    assert len(list(fdb.list(DATASET.mars_request(), keys=True))) == len(DATASET)
+
+
+@pytest.mark.parametrize("extractor", ["eccodes", "gribjump"])
+def test_fdb_source_on_fakes(extractor) -> None:
+    fdb, gribjump = make_fakes(DATASET.messages())
+    request = Request(request=DATASET.mars_request(), chunk_axis=ChunkAxisType.DateTime)
+    source = FdbSource(fdb=fdb, gribjump=gribjump, extractor=extractor, request=request)
+    reference = FdbSource(fdb=fdb, gribjump=gribjump, request=request)
+
+    assert source.chunks() == (4, 1, 1, 1)
+    for idx in range(4):
+        chunk = np.frombuffer(source[(idx, 0, 0, 0)].to_bytes(), dtype="float32")
+        expected = np.frombuffer(reference[(idx, 0, 0, 0)].to_bytes(), dtype="float32")
+        assert np.array_equal(chunk, expected)
+
+
+def test_get_many_extracts_chunks_at_once() -> None:
+    fdb, gribjump = make_fakes(DATASET.messages())
+    request = Request(request=DATASET.mars_request(), chunk_axis=ChunkAxisType.DateTime)
+    source = FdbSource(
+        fdb=fdb, gribjump=gribjump, extractor="gribjump", request=request
+    )
+    keys = [(3, 0, 0, 0), (0, 0, 0, 0), (2, 0, 0, 0)]
+    expected = [source[key].to_bytes() for key in keys]
+
+    gribjump.calls.clear()
+    assert [c.to_bytes() for c in source.get_many(keys)] == expected
+    assert gribjump.calls["extract"] == 1
+    with pytest.raises(KeyError):
+        source.get_many([(0, 0, 0, 0), (4, 0, 0, 0)])
+
+
+def test_latency_model_delays_calls() -> None:
+    latency = LatencyModel(latency=0.01, bandwidth=1e6, jitter=0.01, seed=1)
+    fdb, _ = make_fakes(DATASET.messages(), retrieve_latency=latency)
+
+    t0 = time.perf_counter()
+    data = fdb.retrieve(DATASET.mars_request()).read()
+    elapsed = time.perf_counter() - t0
+    assert elapsed >= 0.01 + len(data) / 1e6
+
+    delays = [LatencyModel(jitter=0.01, seed=1).call_delay() for _ in range(2)]
+    assert delays[0] == delays[1]
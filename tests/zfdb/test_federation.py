@@ -0,0 +1,145 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+from collections.abc import Iterator
+
+import pytest
+
+from zfdb import (
+    ChunkAxisType,
+    FdbSource,
+    FederatedFdb,
+    FederatedGribJump,
+    Request,
+    Route,
+)
+from zfdb.error import ZfdbError
+from zfdb.utils.fakes import FakeFdb, FakeGribJump, make_fakes
+from zfdb.utils.synthetic import SyntheticDataset
+
+
+@pytest.fixture
+def dataset() -> SyntheticDataset:
+    return SyntheticDataset(
+        grid="N32", dates=["20191231", "20200101", "20200102"], times=["0000", "1200"]
+    )
+
+
+def make_federation(rules, messages) -> FederatedFdb:
+    routes = []
+    for rule in rules:
+        fdb = FakeFdb()
+        routes.append(Route(rule, fdb, FakeGribJump(fdb)))
+    federation = FederatedFdb(routes)
+    for message in messages:
+        federation.archive(message)
+    federation.flush()
+    return federation
+
+
+@pytest.fixture
+def federation(dataset) -> Iterator[FederatedFdb]:
+    rules = [{"date": lambda d: d < "20200101"}, {"date": "20200101"}, {}]
+    with make_federation(rules, dataset.messages()) as federation:
+        yield federation
+
+
+def test_federation_splits_requests_by_route(dataset, federation) -> None:
+    request = dataset.mars_request()
+    parts = federation.split(request)
+    assert [(federation.routes.index(r), p["date"]) for r, p in parts] == [
+        (0, "20191231"),
+        (1, "20200101"),
+        (2, "20200102"),
+    ]
+    for route, date in zip(federation.routes, dataset.dates):
+        assert [f["keys"]["date"] for f in route.fdb.list({}, keys=True)] == [date] * 4
+
+    assert len(list(federation.list(request, keys=True))) == 12
+    assert len(list(federation.list({"param": "10u"}, keys=True))) == 6
+    assert federation.retrieve(request).size() == sum(
+        len(m) for m in dataset.messages()
+    )
+    with FederatedFdb([Route({"date": "20200101"}, FakeFdb())]) as federation:
+        with pytest.raises(ZfdbError):
+            federation.split(request)
+
+
+@pytest.mark.parametrize("extractor", ["eccodes", "gribjump"])
+def test_federated_view_matches_single_fdb(dataset, federation, extractor) -> None:
+    request = Request(request=dataset.mars_request(), chunk_axis=ChunkAxisType.DateTime)
+
+    def read(fdb, gribjump):
+        source = FdbSource(
+            extractor=extractor, fdb=fdb, gribjump=gribjump, request=request
+        )
+        keys = [(idx, 0, 0, 0) for idx in range(source.chunks()[0])]
+        return [c.to_bytes() for c in source.get_many(keys)]
+
+    assert read(federation, FederatedGribJump(federation)) == read(
+        *make_fakes(dataset.messages())
+    )
+    if extractor == "gribjump":
+        # All chunks are extracted with a single call per instance
+        assert [r.gribjump.calls["extract"] for r in federation.routes] == [1, 1, 1]
+
+
+@pytest.mark.parametrize("extractor", ["eccodes", "gribjump"])
+def test_federated_chunk_spanning_routes_keeps_field_order(extractor) -> None:
+    dataset = SyntheticDataset(
+        grid="N32", dates=["20200101"], times=["0000", "0600", "1200"], steps=[0, 6]
+    )
+    request = Request(request=dataset.mars_request(), chunk_axis=ChunkAxisType.Step)
+
+    def read(fdb, gribjump):
+        source = FdbSource(
+            extractor=extractor, fdb=fdb, gribjump=gribjump, request=request
+        )
+        keys = [(idx, 0, 0, 0) for idx in range(source.chunks()[0])]
+        return [c.to_bytes() for c in source.get_many(keys)]
+
+    rules = [{"time": ["0000", "1200"]}, {}]
+    with make_federation(rules, dataset.messages()) as federation:
+        assert [
+            (federation.routes.index(r), p["time"])
+            for r, p in federation.split(request[0])
+        ] == [(0, "0000"), (1, "0600"), (0, "1200")]
+        assert read(federation, FederatedGribJump(federation)) == read(
+            *make_fakes(dataset.messages())
+        )
+
+
+def test_federation_routes_params_by_short_name_and_param_id() -> None:
+    dataset = SyntheticDataset(grid="N32", dates=["20200101"], times=["0000"])
+    for rule in ["10u", 165, "165.128"]:
+        with make_federation([{"param": rule}, {}], dataset.messages()) as federation:
+            assert [
+                f["keys"]["param"] for f in federation.routes[0].fdb.list({}, keys=True)
+            ] == ["165"]
+            request = dataset.mars_request()
+            assert federation.retrieve(request).size() == sum(
+                len(m) for m in dataset.messages()
+            )
+            assert (
+                federation.retrieve(request | {"param": "165"}).size()
+                == federation.retrieve(request | {"param": "10u"}).size()
+                > 0
+            )
+
+
+def test_federation_raises_on_routed_part_without_data() -> None:
+    dataset = SyntheticDataset(grid="N32", dates=["20200101"], times=["0000"])
+    fdb = FakeFdb()
+    for message in dataset.messages():
+        fdb.archive(message)
+    fdb.flush()
+    with FederatedFdb(
+        [Route({"param": "10u"}, FakeFdb()), Route({}, fdb)]
+    ) as federation:
+        with pytest.raises(ZfdbError):
+            federation.retrieve(dataset.mars_request())
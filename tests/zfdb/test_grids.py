@@ -0,0 +1,41 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import numpy as np
+
+from zfdb.grids import GridCache, decode_coordinates, grid_key
+from zfdb.utils.synthetic import SyntheticDataset
+
+
+def test_grid_cache_shares_coordinates(tmp_path) -> None:
+    messages = list(SyntheticDataset(grid="N32", dates=["20200101"]).messages())
+    other_grid = next(SyntheticDataset(grid="2.0", dates=["20200101"]).messages())
+    assert grid_key(messages[0]) == grid_key(messages[-1])
+    assert grid_key(messages[0]) != grid_key(other_grid)
+
+    cache = GridCache(tmp_path)
+    lat, lon = cache.coordinates(messages[0])
+    assert cache.coordinates(messages[-1])[0] is lat
+    assert not lat.flags.writeable
+    expected_lat, expected_lon = decode_coordinates(messages[0])
+    np.testing.assert_array_equal(lat, expected_lat)
+    np.testing.assert_array_equal(lon, expected_lon)
+
+    # The nearest point index is built once per grid
+    index = cache.index(messages[0])
+    assert cache.index(messages[-1]) is index
+    assert index.nearest([lat[7]], [lon[7]]).tolist() == [7]
+
+    cache.coordinates(other_grid)
+    assert len(cache) == 2
+    assert len(list(tmp_path.glob("*.npy"))) == 2
+
+    # Another process using the same directory maps the stored coordinates
+    lat, lon = GridCache(tmp_path).coordinates(messages[1])
+    assert isinstance(lat.base, np.memmap)
+    np.testing.assert_array_equal(lon, expected_lon)
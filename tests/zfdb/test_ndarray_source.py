@@ -0,0 +1,52 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import numpy as np
+import pytest
+import zarr
+
+from zfdb import FdbZarrArray, FdbZarrGroup, FdbZarrStore
+from zfdb.datasources import NDarraySource, make_dates_source
+
+
+def open_array(source: NDarraySource) -> zarr.Array:
+    return zarr.open_group(
+        FdbZarrStore(
+            FdbZarrGroup(children=[FdbZarrArray(name="x", datasource=source)])
+        ),
+        mode="r",
+        zarr_format=3,
+    )["x"]
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float64", "int16", "uint8", "bool"])
+def test_ndarray_source_chunks_without_copies(dtype) -> None:
+    array = (np.arange(7 * 3 * 5) % 7).astype(dtype).reshape(7, 3, 5)
+    source = NDarraySource(array, chunk_shape=(2, 3, 5))
+    assert source.chunks() == (4, 1, 1)
+    assert np.shares_memory(source[(1, 0, 0)].as_numpy_array(), array)
+
+    zarray = open_array(source)
+    assert zarray.dtype == np.dtype(dtype)
+    assert zarray.chunks == (2, 3, 5)
+    np.testing.assert_array_equal(zarray[:], array)
+
+    zarray = open_array(NDarraySource(array, chunk_shape=(3, 2, 4)))
+    np.testing.assert_array_equal(zarray[:], array)
+
+
+def test_ndarray_source_datetimes() -> None:
+    source = make_dates_source(
+        np.datetime64("2020-01-01T00:00:00"),
+        np.datetime64("2020-01-02T00:00:00"),
+        np.timedelta64(6, "h"),
+    )
+    dates = open_array(source)[:]
+    assert dates.dtype == np.dtype("datetime64[s]")
+    assert dates[-1] == np.datetime64("2020-01-02T00:00:00")
+    assert len(dates) == 5
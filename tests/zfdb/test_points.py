@@ -0,0 +1,91 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import eccodes
+import numpy as np
+import pytest
+import zarr
+
+from zfdb import ChunkAxisType, Request, make_points_view
+from zfdb.datasources import grid_coordinates
+from zfdb.region import GridIndex
+from zfdb.utils.fakes import make_fakes
+from zfdb.utils.synthetic import SyntheticDataset
+
+
+def test_grid_index_finds_nearest_point() -> None:
+    lat = np.array([0.0, 0.0, 45.0, -45.0, 89.0])
+    lon = np.array([0.0, 180.0, 90.0, 359.0, 0.0])
+    index = GridIndex(lat, lon)
+    nearest = index.nearest(
+        [1.0, -2.0, 44.0, -40.0, 90.0], [-1.0, 179.0, 91.0, -2.0, 0]
+    )
+    assert nearest.tolist() == [0, 1, 2, 3, 4]
+
+
+def test_grid_index_matches_brute_force_on_reduced_gaussian_grid() -> None:
+    lat, lon = grid_coordinates(
+        next(SyntheticDataset(grid="N96", dates=["20200101"]).messages())
+    )
+    rng = np.random.default_rng(0)
+    query_lat = np.concatenate([rng.uniform(-90, 90, 500), [90, -90, 0, 0]])
+    query_lon = np.concatenate([rng.uniform(-180, 360, 500), [0, 0, 359.99, -0.01]])
+
+    def vectors(lat, lon):
+        lat, lon = np.radians(lat), np.radians(lon)
+        return np.stack(
+            [np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)],
+            axis=1,
+        )
+
+    queries = vectors(query_lat, query_lon)
+    grid = vectors(lat, lon)
+    expected = np.max(queries @ grid.T, axis=1)
+    nearest = GridIndex(lat, lon).nearest(query_lat, query_lon)
+    # Equally near points may be found instead of the brute force one
+    np.testing.assert_allclose(
+        np.einsum("ij,ij->i", queries, grid[nearest]), expected, rtol=0, atol=1e-15
+    )
+
+
+@pytest.mark.parametrize("extractor", ["eccodes", "gribjump"])
+def test_points_view_serves_time_series(extractor) -> None:
+    dataset = SyntheticDataset(
+        grid="N32", dates=["20200101", "20200102"], times=["0000", "1200"]
+    )
+    fdb, gribjump = make_fakes(dataset.messages())
+    points = [(51.5, -0.1), (48.8, 2.35), (-33.9, 151.2), (51.5, -0.1)]
+    group = zarr.open_group(
+        make_points_view(
+            fdb=fdb,
+            gribjump=gribjump,
+            request=Request(
+                request=dataset.mars_request(), chunk_axis=ChunkAxisType.DateTime
+            ),
+            points=points,
+            time_chunk=3,
+            extractor=extractor,
+        ),
+        mode="r",
+        zarr_format=3,
+    )
+    assert group["data"].shape == (4, 2, 4)
+    assert group["data"].chunks == (3, 2, 4)
+
+    lat, lon = grid_coordinates(next(dataset.messages()))
+    grid_points = GridIndex(lat, lon).nearest(*zip(*points))
+    np.testing.assert_array_equal(group["latitudes"][:], lat[grid_points])
+
+    expected = []
+    for message in dataset.messages():
+        handle = eccodes.codes_new_from_message(message)
+        expected.append(eccodes.codes_get_values(handle)[grid_points])
+        eccodes.codes_release(handle)
+    np.testing.assert_allclose(
+        group["data"][:], np.reshape(expected, (4, 2, 4)), rtol=1e-6
+    )
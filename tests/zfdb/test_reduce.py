@@ -0,0 +1,95 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import numpy as np
+import pytest
+
+from zfdb import ChunkAxisType, FdbSource, Request, make_forecast_data_view
+from zfdb.error import ZfdbError
+from zfdb.utils.fakes import make_fakes
+from zfdb.utils.synthetic import SyntheticDataset
+
+
+@pytest.fixture
+def source() -> FdbSource:
+    dataset = SyntheticDataset(
+        grid="N32", dates=["20200101"], steps=[0, 6, 12], params=["2t", "10u"]
+    )
+    fdb, gribjump = make_fakes(dataset.messages())
+    view = make_forecast_data_view(
+        fdb=fdb,
+        gribjump=gribjump,
+        request=Request(request=dataset.mars_request(), chunk_axis=ChunkAxisType.Step),
+    )
+    return view.datasource("data")
+
+
+def read_all(source: FdbSource) -> np.ndarray:
+    return np.concatenate(
+        [
+            source[(idx, 0, 0, 0)]
+            .as_numpy_array()
+            .view("float32")
+            .reshape(source.chunk_shape())
+            for idx in range(source.chunks()[0])
+        ]
+    ).astype("float64")
+
+
+@pytest.mark.parametrize(
+    "operation,axes",
+    [("mean", (0, 2, 3)), ("sum", (2, 3)), ("min", (0,)), ("max", ()), ("count", (3,))],
+)
+def test_reduce_matches_numpy(source, operation, axes) -> None:
+    data = read_all(source)
+    expected = {
+        "mean": np.mean,
+        "sum": np.sum,
+        "min": np.min,
+        "max": np.max,
+        "count": lambda a, axis: np.ones_like(a).sum(axis=axis),
+    }[operation](data, axis=axes)
+    np.testing.assert_allclose(source.reduce(operation, axes, workers=2), expected)
+
+
+def test_reduce_over_selection(source) -> None:
+    data = read_all(source)
+    selection = {0: [2, 0], 3: [5, 1, 100]}
+    result = source.reduce("mean", [3], selection=selection)
+    np.testing.assert_allclose(result, data[[2, 0]][..., [5, 1, 100]].mean(axis=3))
+
+    with pytest.raises(ZfdbError):
+        source.reduce("mean", [3], selection={3: [data.shape[3]]})
+    with pytest.raises(ZfdbError):
+        source.reduce("median", [3])
+
+
+@pytest.mark.parametrize(
+    "axes,selection",
+    [
+        ([1.5], None),
+        (["x"], None),
+        (3, None),
+        ([0], {"a": [0]}),
+        ([0], {3: []}),
+        ([0], {3: [0.5, 1]}),
+        ([0], {3: ["0"]}),
+        ([0], {3: [[0], [1, 2]]}),
+        ([0], [3, [0]]),
+    ],
+)
+def test_reduce_rejects_invalid_arguments(source, axes, selection) -> None:
+    with pytest.raises(ZfdbError):
+        source.reduce("mean", axes, selection=selection)
+
+
+def test_reduce_accepts_json_axes(source) -> None:
+    np.testing.assert_array_equal(
+        source.reduce("count", ["3"], selection={"3": [0, 1]}),
+        source.reduce("count", [3], selection={3: np.array([0, 1])}),
+    )
@@ -0,0 +1,76 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import numpy as np
+import pytest
+import zarr
+
+from zfdb import BoundingBox, Polygon, make_anemoi_dataset_like_view
+from zfdb.datasources import grid_coordinates
+from zfdb.region import GridSelection
+from zfdb.utils.fakes import make_fakes
+from zfdb.utils.synthetic import SyntheticDataset
+
+
+def test_grid_selection_ranges() -> None:
+    selection = GridSelection.from_mask(
+        np.array([0, 1, 1, 0, 0, 1, 1, 1, 0, 1], dtype=bool)
+    )
+    assert selection.ranges.tolist() == [[1, 3], [5, 8], [9, 10]]
+    assert selection.size == 6
+    assert selection.indices().tolist() == [1, 2, 5, 6, 7, 9]
+    assert selection.ranges_for(1, 4) == [(2, 3), (5, 7)]
+    assert selection.ranges_for(5, 6) == [(9, 10)]
+
+    lat = np.array([0.0, 0.0, 0.0, 50.0])
+    lon = np.array([175.0, 185.0, 10.0, 180.0])
+    box = BoundingBox(north=10, west=170, south=-10, east=-170)
+    assert box.contains(lat, lon).tolist() == [True, True, False, False]
+
+
+@pytest.mark.parametrize("extractor", ["eccodes", "gribjump"])
+@pytest.mark.parametrize(
+    "region",
+    [
+        BoundingBox(north=60, west=-20, south=30, east=40),
+        Polygon([(30, -10), (60, 0), (40, 30)]),
+    ],
+)
+def test_regional_view_reads_region_only(extractor, region) -> None:
+    dataset = SyntheticDataset(grid="N32", dates=["20200101"], times=["0000", "1200"])
+    fdb, gribjump = make_fakes(dataset.messages())
+    recipe = {
+        "dates": {
+            "start": "2020-01-01T00:00:00",
+            "end": "2020-01-01T12:00:00",
+            "frequency": "12h",
+        },
+        "input": {"join": [{"mars": {"param": ["10u", "10v"], "levtype": "sfc"}}]},
+    }
+
+    def read_data(**kwargs):
+        store = make_anemoi_dataset_like_view(
+            fdb=fdb, gribjump=gribjump, recipe=recipe, extractor=extractor, **kwargs
+        )
+        source = store.datasource("data")
+        chunks = [
+            source[(idx, 0, 0, 0)].as_numpy_array().view("float32")
+            for idx in range(source.chunks()[0])
+        ]
+        return store, np.stack(chunks).reshape(len(chunks), 2, -1)
+
+    lat, lon = grid_coordinates(next(dataset.messages()))
+    inside = region.contains(lat, lon)
+    store, regional = read_data(region=region)
+    _, full = read_data()
+    assert regional.shape == (2, 2, inside.sum())
+    np.testing.assert_array_equal(regional, full[..., inside])
+
+    coordinates = zarr.open_group(store, mode="r", zarr_format=3)
+    np.testing.assert_array_equal(coordinates["latitudes"][:], lat[inside])
+    np.testing.assert_array_equal(coordinates["longitudes"][:], lon[inside])
@@ -0,0 +1,56 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import numpy as np
+import pytest
+
+from zfdb import ChunkAxisType, Request
+from zfdb.request import into_mars_request_dict
+
+
+def test_request_plans_match_per_chunk_conversion() -> None:
+    dates = np.arange(np.datetime64("2020-01-30"), np.datetime64("2020-02-02"))
+    times = ["0000", 1200]
+    request = Request(
+        request={
+            "class": "od",
+            "date": dates,
+            "time": times,
+            "param": ["2t", "10u"],
+            "levelist": [1000, 850],
+        },
+        chunk_axis=ChunkAxisType.DateTime,
+    )
+    assert len(request) == 6
+    for idx in range(len(request)):
+        expected = into_mars_request_dict(
+            {
+                "class": "od",
+                "param": ["2t", "10u"],
+                "levelist": [1000, 850],
+                "date": dates[idx // 2],
+                "time": times[idx % 2],
+            }
+        )
+        assert request[idx] == expected
+    assert request[5]["date"] == "20200201"
+    assert request[-1] == request[5]
+
+    # Returned requests are independent of the plan
+    request[0]["param"] = "msl"
+    assert request[0]["param"] == "2t/10u"
+
+
+def test_request_plans_steps() -> None:
+    request = Request(
+        request={"date": "20200101", "time": "0000", "step": np.arange(0, 12, 6)},
+        chunk_axis=ChunkAxisType.Step,
+    )
+    assert [request[i]["step"] for i in range(len(request))] == ["0", "6"]
+    with pytest.raises(IndexError):
+        request[2]
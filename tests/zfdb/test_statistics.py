@@ -0,0 +1,83 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import eccodes
+import numpy as np
+import zarr
+
+from zfdb import make_anemoi_dataset_like_view
+from zfdb.statistics import RunningStatistics
+from zfdb.utils.fakes import make_fakes
+from zfdb.utils.synthetic import SyntheticDataset
+
+
+def test_running_statistics_merges_batches() -> None:
+    rng = np.random.default_rng(0)
+    values = 1e6 + rng.normal(size=(3, 1000))
+    values[1, 10] = np.nan
+    statistics = RunningStatistics(3)
+    for batch in np.array_split(values, 7, axis=1):
+        statistics.update(batch)
+    result = statistics.result()
+
+    np.testing.assert_allclose(result["mean"], np.nanmean(values, axis=1))
+    np.testing.assert_allclose(result["stdev"], np.nanstd(values, axis=1), rtol=1e-9)
+    np.testing.assert_array_equal(result["minimum"], np.nanmin(values, axis=1))
+    np.testing.assert_array_equal(result["count"], [1000, 999, 1000])
+    np.testing.assert_array_equal(result["has_nans"], [False, True, False])
+
+
+def test_anemoi_view_serves_cached_statistics(tmp_path) -> None:
+    dataset = SyntheticDataset(
+        grid="N32", dates=["20200101"], times=["0000", "0600", "1200", "1800"]
+    )
+    fdb, gribjump = make_fakes(dataset.messages())
+    recipe = {
+        "dates": {
+            "start": "2020-01-01T00:00:00",
+            "end": "2020-01-01T18:00:00",
+            "frequency": "6h",
+        },
+        "input": {"join": [{"mars": {"param": ["10u", "10v"], "levtype": "sfc"}}]},
+    }
+
+    def open_view():
+        return zarr.open_group(
+            make_anemoi_dataset_like_view(
+                fdb=fdb,
+                gribjump=gribjump,
+                recipe=recipe,
+                statistics=True,
+                statistics_cache=tmp_path,
+                statistics_workers=3,
+            ),
+            mode="r",
+            zarr_format=3,
+        )
+
+    group = open_view()
+    retrieves = fdb.calls["retrieve"]
+    cached = open_view()
+    # Statistics are read from the cache, only the view metadata is retrieved
+    assert fdb.calls["retrieve"] - retrieves == 2
+
+    values = {"10u": [], "10v": []}
+    for message in dataset.messages():
+        handle = eccodes.codes_new_from_message(message)
+        values[eccodes.codes_get(handle, "shortName")].append(
+            eccodes.codes_get_values(handle)
+        )
+        eccodes.codes_release(handle)
+    expected = np.array([np.mean(values["10u"]), np.mean(values["10v"])])
+    np.testing.assert_allclose(group["mean"][:], expected, rtol=1e-6, atol=1e-6)
+    np.testing.assert_array_equal(cached["mean"][:], group["mean"][:])
+    assert group["count"][:].tolist() == [4 * 6114] * 2
+    tendencies = np.diff(np.array(values["10v"]), axis=0)
+    np.testing.assert_allclose(
+        cached["statistics_tendencies_6h_stdev"][1], tendencies.std(), rtol=1e-5
+    )
@@ -14,6 +14,7 @@ import yaml
 import zarr
 import zarr.storage
 from utils.util import copy as store_copy
+from zarr.abc.store import RangeByteRequest, SuffixByteRequest
 
 from zfdb import (
     ChunkAxisType,
@@ -23,6 +24,7 @@ from zfdb import (
     FdbZarrArray,
     FdbZarrGroup,
     FdbZarrStore,
+    RecordingTracer,
     Request,
     make_anemoi_dataset_like_view,
     make_dates_source,
@@ -210,3 +212,111 @@ async def test_access_listing_test(read_only_fdb_setup) -> None:
 #     zstore = zarr.storage.LocalStore(root=tmp_path / "tt.zarr")
 #     await store_copy(mapping, store, zstore)
 #     assert compare_zarr_stores(store.store, zstore)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("extractor", ["eccodes", "gribjump"])
+async def test_byte_range_matches_full_chunk(read_only_fdb_setup, extractor) -> None:
+    mapping = FdbZarrStore(
+        FdbZarrGroup(
+            children=[
+                FdbZarrArray(
+                    name="data",
+                    datasource=FdbSource(
+                        extractor=extractor,
+                        request=[
+                            Request(
+                                request={
+                                    "date": np.arange(
+                                        np.datetime64("2020-01-01"),
+                                        np.datetime64("2020-01-03"),
+                                    ),
+                                    "time": ["00", "06", "12", "18"],
+                                    "class": "ea",
+                                    "domain": "g",
+                                    "expver": "0001",
+                                    "stream": "oper",
+                                    "type": "an",
+                                    "step": "0",
+                                    "levtype": "sfc",
+                                    "param": ["10u", "10v"],
+                                },
+                                chunk_axis=ChunkAxisType.DateTime,
+                            )
+                        ],
+                    ),
+                )
+            ]
+        )
+    )
+    full = (await mapping.get("data/c/1/0/0/0")).to_bytes()
+    assert await mapping.getsize("data/c/1/0/0/0") == len(full)
+
+    # Range spanning the boundary between the first and second field
+    field_bytes = len(full) // 2
+    start, end = field_bytes - 10, field_bytes + 6
+    partial = await mapping.get(
+        "data/c/1/0/0/0", byte_range=RangeByteRequest(start, end)
+    )
+    assert partial.to_bytes() == full[start:end]
+
+    suffix = await mapping.get("data/c/1/0/0/0", byte_range=SuffixByteRequest(8))
+    assert suffix.to_bytes() == full[-8:]
+
+
+@pytest.mark.asyncio
+async def test_get_many_matches_get() -> None:
+    mapping = FdbZarrStore(
+        FdbZarrGroup(
+            children=[
+                FdbZarrArray(
+                    name="value",
+                    datasource=ConstantValueField(
+                        value=123, shape=(100, 10, 1000), chunks=(100, 10, 100)
+                    ),
+                ),
+            ]
+        )
+    )
+    keys = ["zarr.json", "value/zarr.json", "value/c/0/0/0", "value/c/0/0/3"]
+    values = await mapping.get_many(keys)
+    for key, value in zip(keys, values, strict=True):
+        assert value.to_bytes() == (await mapping.get(key)).to_bytes()
+
+    assert all(key in mapping for key in keys + [".zmetadata", "value/c/0/0/9"])
+    for key in ["value/c/0/0/10", "value/c/0/x/0", "value/c/0/0", "other/zarr.json"]:
+        assert key not in mapping
+
+
+@pytest.mark.parametrize("extractor", ["eccodes", "gribjump"])
+def test_tracer_records_chunk_spans(read_only_fdb_setup, extractor) -> None:
+    tracer = RecordingTracer()
+    source = FdbSource(
+        extractor=extractor,
+        tracer=tracer,
+        request=Request(
+            request={
+                "date": np.datetime64("2020-01-01"),
+                "time": ["00", "06"],
+                "class": "ea",
+                "domain": "g",
+                "expver": "0001",
+                "stream": "oper",
+                "type": "an",
+                "step": "0",
+                "levtype": "sfc",
+                "param": ["10u", "10v"],
+            },
+            chunk_axis=ChunkAxisType.DateTime,
+        ),
+    )
+    chunk = source[1, 0, 0, 0]
+
+    assert len(tracer.spans) == 1
+    span = tracer.spans[0]
+    assert span.key == (1, 0, 0, 0)
+    assert span.extractor == extractor
+    assert span.field_count == 2
+    assert span.nbytes == len(chunk)
+    assert span.end >= span.start
+    assert set(tracer.summary()) == set(span.stages)
@@ -0,0 +1,50 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import eccodes
+
+from zfdb.utils.synthetic import SyntheticDataset
+
+
+def test_synthetic_dataset_covers_all_combinations() -> None:
+    dataset = SyntheticDataset(
+        grid="N32",
+        dates=["20200101", "20200102"],
+        times=["0000", "1200"],
+        steps=[0, 6],
+        params=["t", "u"],
+        levels=[500, 850],
+        members=[1, 2],
+    )
+    messages = list(dataset.messages())
+    assert len(messages) == len(dataset) == 64
+
+    keys = set()
+    for message in messages:
+        handle = eccodes.codes_new_from_message(message)
+        keys.add(
+            tuple(
+                eccodes.codes_get(handle, k, ktype=str)
+                for k in ["date", "time", "step", "number", "levelist", "shortName"]
+            )
+        )
+        assert eccodes.codes_get(handle, "stream") == "enfo"
+        assert eccodes.codes_get(handle, "levtype") == "pl"
+        eccodes.codes_release(handle)
+    assert len(keys) == len(messages)
+
+
+def test_synthetic_dataset_regular_grid() -> None:
+    dataset = SyntheticDataset(grid="2.0", dates=["20200101"], params=["2t"])
+    (message,) = dataset.messages()
+    handle = eccodes.codes_new_from_message(message)
+    assert eccodes.codes_get(handle, "numberOfDataPoints") == 180 * 91
+    assert eccodes.codes_get(handle, "levtype") == "sfc"
+    assert eccodes.codes_get(handle, "type") == "an"
+    eccodes.codes_release(handle)
+    assert dataset.mars_request()["param"] == ["2t"]
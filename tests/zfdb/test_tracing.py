@@ -0,0 +1,74 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import json
+import threading
+
+import pytest
+
+from zfdb import ChunkAxisType, FdbSource, JsonlTracer, RecordingTracer, Request
+from zfdb.utils.fakes import make_fakes
+from zfdb.utils.synthetic import SyntheticDataset
+
+
+def test_jsonl_tracer_writes_chunk_log(tmp_path) -> None:
+    dataset = SyntheticDataset(grid="N32", dates=["20200101"], times=["0000", "1200"])
+    fdb, gribjump = make_fakes(dataset.messages())
+    log_path = tmp_path / "chunks.jsonl"
+    tracer = JsonlTracer(log_path)
+    source = FdbSource(
+        fdb=fdb,
+        gribjump=gribjump,
+        request=Request(
+            request=dataset.mars_request(), chunk_axis=ChunkAxisType.DateTime
+        ),
+        tracer=tracer.with_view("view-a"),
+    )
+    source[(1, 0, 0, 0)]
+    tracer.close()
+
+    (line,) = log_path.read_text().splitlines()
+    entry = json.loads(line)
+    assert entry["view"] == "view-a"
+    assert entry["key"] == [1, 0, 0, 0]
+    assert entry["tid"] == threading.get_native_id()
+    assert entry["start"] <= entry["end"]
+    assert entry["field_count"] == 2
+    assert entry["error"] is False
+    assert "retrieve" in entry["stages"]
+
+
+@pytest.mark.parametrize("extractor", ["eccodes", "gribjump"])
+def test_failed_extraction_finishes_span(monkeypatch, extractor) -> None:
+    dataset = SyntheticDataset(grid="N32", dates=["20200101"], steps=[0, 6])
+    fdb, gribjump = make_fakes(dataset.messages())
+    tracer = RecordingTracer()
+    source = FdbSource(
+        extractor=extractor,
+        fdb=fdb,
+        gribjump=gribjump,
+        request=Request(request=dataset.mars_request(), chunk_axis=ChunkAxisType.Step),
+        tracer=tracer,
+    )
+    source[(0, 0, 0, 0)]
+
+    def fail(*args, **kwargs):
+        raise OSError("backend unavailable")
+
+    monkeypatch.setattr(fdb, "retrieve", fail)
+    monkeypatch.setattr(gribjump, "extract", fail)
+    for access in (
+        lambda: source[(1, 0, 0, 0)],
+        lambda: source.get_many([(0, 0, 0, 0), (1, 0, 0, 0)]),
+        lambda: source.get_byte_range((1, 0, 0, 0), slice(8, 16)),
+    ):
+        with pytest.raises(OSError):
+            access()
+
+    assert [span.error for span in tracer.spans] == [False, True, True, True]
+    assert all(span.end is not None for span in tracer.spans)
@@ -0,0 +1,354 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import json
+import logging
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+from database import open_database
+
+log = logging.getLogger(__name__)
+
+PERCENTILES = [50, 90, 99, 99.9]
+
+# Event kinds used when reconstructing file positions
+OPEN, SEEK, READ = 0, 1, 2
+
+
+def register(parent_parser):
+    parser = parent_parser.add_parser(
+        "analyze",
+        help="Reports IO patterns and syscall latencies from extracted syscalls.",
+    )
+    parser.set_defaults(func=cmd)
+    parser.add_argument(
+        "database",
+        help="Database with extracted syscalls, see extract-io-syscalls",
+        type=Path,
+    )
+    parser.add_argument(
+        "--top", help="Number of files listed in per file reports", type=int, default=20
+    )
+    parser.add_argument("--json", help="Write the full report as JSON", type=Path)
+
+
+def cmd(args):
+    con = open_database(args.database)
+    tables = existing_call_tables(con)
+    if "read" not in tables:
+        raise Exception(
+            "Table 'read_calls' is missing. Did you forget to run extract-io-syscalls first?"
+        )
+    report = {
+        "syscalls": syscall_summary(con, tables),
+        "files": file_summary(con, tables),
+        "read_sizes": read_size_histogram(con),
+        "access_pattern": access_pattern(con, tables),
+    }
+    print_report(report, args.top)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+        print(f"Report written to {args.json}")
+
+
+def existing_call_tables(con: sqlite3.Connection) -> list[str]:
+    return [
+        name.removesuffix("_calls")
+        for (name,) in con.execute(
+            "select name from sqlite_master where type = 'table' and name like '%\\_calls' escape '\\'"
+        )
+    ]
+
+
+def fetch_column(con: sqlite3.Connection, query: str, dtype, params=()) -> np.ndarray:
+    cursor = con.execute(query, params)
+    return np.fromiter((row[0] for row in cursor), dtype=dtype)
+
+
+def syscall_summary(con: sqlite3.Connection, tables: list[str]) -> dict:
+    """
+    Count, total time and latency percentiles of every extracted syscall.
+    """
+    summary = {}
+    for call in tables:
+        durations = fetch_column(con, f"select duration from {call}_calls", np.float64)
+        if len(durations) == 0:
+            continue
+        summary[call] = {
+            "count": int(len(durations)),
+            "total_seconds": float(durations.sum()),
+            "mean_seconds": float(durations.mean()),
+            **{
+                f"p{p:g}_seconds": float(v)
+                for p, v in zip(PERCENTILES, np.percentile(durations, PERCENTILES))
+            },
+            "max_seconds": float(durations.max()),
+        }
+    return summary
+
+
+def file_summary(con: sqlite3.Connection, tables: list[str]) -> list[dict]:
+    """
+    Per file counts of reads, bytes read, time spent reading, seeks, opens and
+    closes, ordered by bytes read.
+    """
+    files: dict[str, dict] = {}
+
+    def merge(query: str, columns: list[str]):
+        for path, *values in con.execute(query):
+            entry = files.setdefault(path, {"path": path})
+            entry.update(zip(columns, values))
+
+    merge(
+        """
+        select path, count(*), sum(max(return_code, 0)), sum(duration)
+        from read_calls group by path
+        """,
+        ["reads", "bytes_read", "read_seconds"],
+    )
+    for call, column in [("lseek", "seeks"), ("openat", "opens"), ("close", "closes")]:
+        if call in tables:
+            merge(
+                f"select path, count(*) from {call}_calls group by path",
+                [column],
+            )
+    columns = ["reads", "bytes_read", "read_seconds", "seeks", "opens", "closes"]
+    result = [
+        {c: entry.get(c, 0) for c in ["path", *columns]} for entry in files.values()
+    ]
+    result.sort(key=lambda e: e["bytes_read"], reverse=True)
+    return result
+
+
+def read_size_histogram(con: sqlite3.Connection) -> list[dict]:
+    """
+    Number of reads and bytes per power of two bucket of the returned size.
+    Bucket 'n' holds reads of at most 2**n bytes, failed and empty reads are
+    counted in bucket 0.
+    """
+    buckets: dict[int, list[int]] = {}
+    for size, count in con.execute(
+        "select max(return_code, 0), count(*) from read_calls group by 1"
+    ):
+        bucket = int(size - 1).bit_length() if size > 0 else 0
+        counts = buckets.setdefault(bucket, [0, 0])
+        counts[0] += count
+        counts[1] += size * count
+    return [
+        {"max_size": 2**bucket, "reads": reads, "bytes": nbytes}
+        for bucket, (reads, nbytes) in sorted(buckets.items())
+    ]
+
+
+def reconstruct_positions(
+    group_start: np.ndarray, kind: np.ndarray, value: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Reconstructs the file position before each event.
+
+    Events have to be sorted by group (a file in a process) and time. An open
+    sets the position to 0, a seek to its return code and a read advances it by
+    its return code. Positions before the first open or seek of a group are
+    unknown.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        Position before every event and whether it is known.
+    """
+    reset = kind != READ
+    segment_start = np.flatnonzero(reset | group_start)
+    segment = np.cumsum(reset | group_start) - 1
+    base = np.where(kind[segment_start] == OPEN, 0, value[segment_start])
+    known = reset[segment_start]
+
+    advance = np.where((kind == READ) & (value > 0), value, 0)
+    cumulative = np.cumsum(advance)
+    after = base[segment] + cumulative - cumulative[segment_start][segment]
+    after_known = known[segment]
+
+    before = np.zeros_like(after)
+    before[1:] = after[:-1]
+    before_known = np.zeros_like(after_known)
+    before_known[1:] = after_known[:-1] & ~group_start[1:]
+    return before, before_known
+
+
+def access_pattern(con: sqlite3.Connection, tables: list[str]) -> dict:
+    """
+    Classifies reads as sequential, when they start where the previous read of
+    the same file in the same process ended, or random, and reports seek
+    distances.
+    """
+    parts = [
+        "select syscall_events_id as id, pid, path, 2 as kind, return_code as value from read_calls"
+    ]
+    if "lseek" in tables:
+        parts.append(
+            "select syscall_events_id, pid, path, 1, return_code from lseek_calls where return_code >= 0"
+        )
+    if "openat" in tables:
+        parts.append(
+            "select syscall_events_id, pid, path, 0, return_code from openat_calls where return_code >= 0"
+        )
+    con.execute("create temp table if not exists paths(path text primary key)")
+    with con:
+        for call in ["read", "lseek", "openat"]:
+            if call in tables:
+                con.execute(
+                    f"insert or ignore into temp.paths select path from {call}_calls"
+                )
+    query = f"""
+        select e.pid, p.rowid, e.kind, e.value from (
+            {" union all ".join(parts)}
+        ) as e
+        join temp.paths as p on p.path = e.path
+        order by e.pid, p.rowid, e.id
+    """
+    events = np.fromiter(
+        con.execute(query),
+        dtype=[("pid", "i8"), ("path", "i8"), ("kind", "i8"), ("value", "i8")],
+    )
+    if len(events) == 0:
+        return {}
+    pid, path_id, kind, value = (events[c] for c in events.dtype.names)
+
+    group_start = np.ones(len(pid), dtype=bool)
+    group_start[1:] = (pid[1:] != pid[:-1]) | (path_id[1:] != path_id[:-1])
+    group = np.cumsum(group_start)
+    before, known = reconstruct_positions(group_start, kind, value)
+
+    reads = np.flatnonzero(kind == READ)
+    read_group = group[reads]
+    start = before[reads]
+    end = start + np.maximum(value[reads], 0)
+    read_known = known[reads]
+    # Compare every read with the previous read of the same file
+    has_previous = np.zeros(len(reads), dtype=bool)
+    has_previous[1:] = (
+        (read_group[1:] == read_group[:-1]) & read_known[1:] & read_known[:-1]
+    )
+    gap = np.zeros(len(reads), dtype=np.int64)
+    gap[1:] = start[1:] - end[:-1]
+    gap = gap[has_previous]
+    sequential = int(np.count_nonzero(gap == 0))
+
+    seeks = np.flatnonzero((kind == SEEK) & known)
+    distance = value[seeks] - before[seeks]
+    return {
+        "reads_classified": int(len(gap)),
+        "sequential_reads": sequential,
+        "random_reads": int(len(gap) - sequential),
+        "forward_gaps": int(np.count_nonzero(gap > 0)),
+        "backward_gaps": int(np.count_nonzero(gap < 0)),
+        "mean_abs_gap_bytes": float(np.abs(gap).mean()) if len(gap) else 0.0,
+        "seeks_classified": int(len(distance)),
+        "noop_seeks": int(np.count_nonzero(distance == 0)),
+        "forward_seeks": int(np.count_nonzero(distance > 0)),
+        "backward_seeks": int(np.count_nonzero(distance < 0)),
+        "seek_distance_bytes": {
+            f"p{p:g}": float(v)
+            for p, v in zip(
+                PERCENTILES,
+                np.percentile(np.abs(distance), PERCENTILES)
+                if len(distance)
+                else [0] * len(PERCENTILES),
+            )
+        },
+    }
+
+
+def format_bytes(n: float) -> str:
+    for unit in ["B", "KiB", "MiB", "GiB", "TiB"]:
+        if abs(n) < 1024 or unit == "TiB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+def print_table(title: str, headers: list[str], rows: list[list]) -> None:
+    cells = [headers] + [[str(c) for c in row] for row in rows]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(headers))]
+    print(f"\n{title}")
+    for idx, row in enumerate(cells):
+        # First column left aligned, numbers right aligned
+        print(
+            "  ".join(
+                c.ljust(w) if i == 0 else c.rjust(w)
+                for i, (c, w) in enumerate(zip(row, widths))
+            )
+        )
+        if idx == 0:
+            print("  ".join("-" * w for w in widths))
+
+
+def print_report(report: dict, top: int) -> None:
+    print_table(
+        "Syscalls",
+        [
+            "syscall",
+            "count",
+            "total s",
+            "mean us",
+            *[f"p{p:g} us" for p in PERCENTILES],
+            "max us",
+        ],
+        [
+            [
+                call,
+                s["count"],
+                f"{s['total_seconds']:.3f}",
+                f"{s['mean_seconds'] * 1e6:.1f}",
+                *[f"{s[f'p{p:g}_seconds'] * 1e6:.1f}" for p in PERCENTILES],
+                f"{s['max_seconds'] * 1e6:.1f}",
+            ]
+            for call, s in sorted(
+                report["syscalls"].items(), key=lambda i: -i[1]["total_seconds"]
+            )
+        ],
+    )
+    print_table(
+        f"Files (top {top} of {len(report['files'])} by bytes read)",
+        ["path", "reads", "read", "read s", "seeks", "opens", "closes"],
+        [
+            [
+                f["path"],
+                f["reads"],
+                format_bytes(f["bytes_read"]),
+                f"{f['read_seconds']:.3f}",
+                f["seeks"],
+                f["opens"],
+                f["closes"],
+            ]
+            for f in report["files"][:top]
+        ],
+    )
+    print_table(
+        "Read sizes",
+        ["up to", "reads", "bytes"],
+        [
+            [format_bytes(b["max_size"]), b["reads"], format_bytes(b["bytes"])]
+            for b in report["read_sizes"]
+        ],
+    )
+    pattern = report["access_pattern"]
+    if pattern:
+        print_table(
+            "Access pattern",
+            ["metric", "value"],
+            [
+                [k, f"{v:.1f}" if isinstance(v, float) else v]
+                for k, v in pattern.items()
+                if not isinstance(v, dict)
+            ]
+            + [
+                [f"seek distance {k}", format_bytes(v)]
+                for k, v in pattern["seek_distance_bytes"].items()
+            ],
+        )
@@ -0,0 +1,212 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import json
+import logging
+import sqlite3
+from pathlib import Path
+
+from commands.analyze import format_bytes, print_table
+from database import open_database
+from tqdm import tqdm
+
+log = logging.getLogger(__name__)
+
+BATCH_SIZE = 10_000
+
+
+def register(parent_parser):
+    parser = parent_parser.add_parser(
+        "import-chunk-log",
+        help="Imports a zfdb chunk access log and attributes syscalls to chunk accesses.",
+    )
+    parser.set_defaults(func=cmd)
+    parser.add_argument(
+        "database",
+        help="Database with syscall events",
+        type=Path,
+    )
+    parser.add_argument(
+        "log",
+        help="Chunk access log written by zfdb.JsonlTracer, e.g. the server's --chunk-log",
+        type=Path,
+        nargs="+",
+    )
+    parser.add_argument(
+        "--top", help="Number of slowest chunk accesses listed", type=int, default=20
+    )
+
+
+def cmd(args):
+    con = open_database(args.database)
+    create_tables(con)
+    import_chunk_log(con, args.log, args.progress)
+    attribute_syscalls(con)
+    print_report(con, args.top)
+
+
+def create_tables(con: sqlite3.Connection):
+    with con:
+        con.execute("drop table if exists chunk_attribution")
+        con.execute("drop table if exists chunk_accesses")
+        con.execute(
+            """
+            create table chunk_accesses(
+                id integer primary key autoincrement,
+                view text,
+                key text,
+                extractor text,
+                pid integer,
+                tid integer,
+                start_time real,
+                end_time real,
+                duration real,
+                nbytes integer,
+                field_count integer,
+                stages text
+            )
+            """
+        )
+
+
+def parse_chunk_log_line(line: str) -> tuple:
+    entry = json.loads(line)
+    return (
+        entry["view"],
+        json.dumps(entry["key"]),
+        entry["extractor"],
+        entry["pid"],
+        entry["tid"],
+        entry["start"],
+        entry["end"],
+        entry["end"] - entry["start"],
+        entry["nbytes"],
+        entry["field_count"],
+        json.dumps(entry["stages"]),
+    )
+
+
+def import_chunk_log(con: sqlite3.Connection, files: list[Path], show_progress: bool):
+    insert = "insert into chunk_accesses values(null,?,?,?,?,?,?,?,?,?,?,?)"
+    for file in files:
+        with open(file) as f, con:
+            batch = []
+            for line in tqdm(f, desc=f"Importing {file}", disable=not show_progress):
+                if not line.strip():
+                    continue
+                batch.append(parse_chunk_log_line(line))
+                if len(batch) == BATCH_SIZE:
+                    con.executemany(insert, batch)
+                    batch = []
+            con.executemany(insert, batch)
+
+
+def attribute_syscalls(con: sqlite3.Connection):
+    """
+    Attributes to every chunk access the syscalls issued by the same thread
+    while the access was in progress. With 'strace -ff' the pid of an event is
+    the id of the thread that issued it, zfdb logs the same native thread id.
+    """
+    with con:
+        con.execute(
+            "create index if not exists syscall_events_pid_time_idx on syscall_events(pid, unix_time)"
+        )
+        con.execute(
+            """
+            create table chunk_attribution as
+            select
+                c.id as chunk_access_id,
+                count(e.id) as syscalls,
+                coalesce(sum(e.duration), 0) as syscall_seconds,
+                coalesce(sum(case when e.syscall in ('read', 'pread64') and e.return_code > 0
+                    then e.return_code end), 0) as bytes_read,
+                count(case when e.syscall = 'openat' then 1 end) as opens
+            from chunk_accesses c
+            left join syscall_events e
+                on e.pid = c.tid and e.unix_time between c.start_time and c.end_time
+            group by c.id
+            """
+        )
+        has_read_calls = con.execute(
+            "select 1 from sqlite_master where type = 'table' and name = 'read_calls'"
+        ).fetchone()
+        con.execute("alter table chunk_attribution add column files_read integer")
+        if has_read_calls:
+            con.execute(
+                "create index if not exists read_calls_pid_time_idx on read_calls(pid, unix_time)"
+            )
+            con.execute(
+                """
+                update chunk_attribution set files_read = (
+                    select count(distinct r.path)
+                    from chunk_accesses c
+                    join read_calls r
+                        on r.pid = c.tid and r.unix_time between c.start_time and c.end_time
+                    where c.id = chunk_attribution.chunk_access_id
+                )
+                """
+            )
+        else:
+            log.info("No read_calls table, run extract-io-syscalls to count files")
+
+
+def print_report(con: sqlite3.Connection, top: int):
+    count, chunk_seconds, syscall_seconds, bytes_read, nbytes = con.execute(
+        """
+        select count(*), sum(c.duration), sum(a.syscall_seconds), sum(a.bytes_read),
+            sum(c.nbytes)
+        from chunk_accesses c join chunk_attribution a on a.chunk_access_id = c.id
+        """
+    ).fetchone()
+    if not count:
+        print("No chunk accesses imported")
+        return
+    print(
+        f"{count} chunk accesses, {chunk_seconds:.3f} s in total of which "
+        f"{syscall_seconds:.3f} s ({syscall_seconds / chunk_seconds * 100:.1f}%) "
+        f"were spent in syscalls, {format_bytes(bytes_read)} read from files "
+        f"for {format_bytes(nbytes)} of chunk data"
+    )
+    rows = con.execute(
+        """
+        select c.view, c.key, c.extractor, c.duration, a.syscalls, a.syscall_seconds,
+            a.bytes_read, a.opens, a.files_read
+        from chunk_accesses c join chunk_attribution a on a.chunk_access_id = c.id
+        order by c.duration desc
+        limit ?
+        """,
+        (top,),
+    ).fetchall()
+    print_table(
+        f"Slowest {len(rows)} chunk accesses",
+        [
+            "view",
+            "key",
+            "extractor",
+            "ms",
+            "syscalls",
+            "syscall ms",
+            "read",
+            "opens",
+            "files",
+        ],
+        [
+            [
+                view,
+                key,
+                extractor,
+                f"{duration * 1e3:.2f}",
+                syscalls,
+                f"{syscall_seconds * 1e3:.2f}",
+                format_bytes(bytes_read),
+                opens,
+                "-" if files is None else files,
+            ]
+            for view, key, extractor, duration, syscalls, syscall_seconds, bytes_read, opens, files in rows
+        ],
+    )
@@ -0,0 +1,244 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import json
+import logging
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+from database import open_database
+from tqdm import tqdm
+
+log = logging.getLogger(__name__)
+
+# Text columns with few distinct values, stored as integer codes plus categories
+CATEGORICAL_COLUMNS = {"syscall", "path", "flags", "whence", "view", "extractor"}
+# Text columns holding numbers
+NUMERIC_TEXT_COLUMNS = {"size", "offset"}
+
+
+def register(parent_parser):
+    parser = parent_parser.add_parser(
+        "export",
+        help="Exports tables into columnar files for offline analysis.",
+    )
+    parser.set_defaults(func=cmd)
+    parser.add_argument("database", help="Database with syscall events", type=Path)
+    parser.add_argument("output", help="Output directory", type=Path)
+    parser.add_argument(
+        "--format",
+        help="One .npy file per column, or one Parquet file per table (requires pyarrow)",
+        choices=["npy", "parquet"],
+        default="npy",
+    )
+    parser.add_argument(
+        "--tables",
+        help="Tables to export, defaults to syscall_events and all *_calls tables",
+        nargs="+",
+    )
+    parser.add_argument(
+        "--batch-size",
+        help="Rows held in memory at once",
+        type=int,
+        default=1_000_000,
+    )
+
+
+def cmd(args):
+    con = open_database(args.database)
+    tables = args.tables or default_tables(con)
+    args.output.mkdir(parents=True, exist_ok=True)
+    exporter = export_table_parquet if args.format == "parquet" else export_table_npy
+    for table in tables:
+        exporter(con, table, args.output, args.batch_size, args.progress)
+
+
+def default_tables(con: sqlite3.Connection) -> list[str]:
+    return ["syscall_events"] + [
+        name
+        for (name,) in con.execute(
+            "select name from sqlite_master where type = 'table' and name like '%\\_calls' escape '\\' order by name"
+        )
+    ]
+
+
+class Column:
+    """
+    Export of a single column. Integer and real columns are stored as int64
+    and float64, categorical text columns as int32 codes into `categories`.
+    Other text columns, e.g. the raw strace args, are not exported.
+    """
+
+    def __init__(self, name: str, declared_type: str):
+        self.name = name
+        declared_type = declared_type.lower()
+        self.categories: dict[str, int] | None = None
+        if name in CATEGORICAL_COLUMNS:
+            self.dtype = np.dtype("int32")
+            self.categories = {}
+            self.select = name
+        elif name in NUMERIC_TEXT_COLUMNS or "int" in declared_type:
+            self.dtype = np.dtype("int64")
+            self.select = f"cast({name} as integer)"
+        elif declared_type in ("real", "float", "double"):
+            self.dtype = np.dtype("float64")
+            self.select = name
+        else:
+            self.dtype = None
+
+    @property
+    def exported(self) -> bool:
+        return self.dtype is not None
+
+    def encode(self, values: list) -> np.ndarray:
+        if self.categories is None:
+            if self.dtype.kind == "f":
+                return np.array(values, dtype=object).astype(self.dtype)
+            # Missing integers become -1
+            return np.array([-1 if v is None else v for v in values], dtype=self.dtype)
+        uniques, inverse = np.unique(
+            np.array(["" if v is None else v for v in values], dtype=object),
+            return_inverse=True,
+        )
+        codes = np.array(
+            [self.categories.setdefault(u, len(self.categories)) for u in uniques],
+            dtype=self.dtype,
+        )
+        return codes[inverse]
+
+    def category_list(self) -> list[str]:
+        return list(self.categories) if self.categories is not None else []
+
+    def describe(self) -> dict:
+        return {
+            "dtype": str(self.dtype),
+            "encoding": "categorical" if self.categories is not None else "plain",
+        }
+
+
+def table_columns(con: sqlite3.Connection, table: str) -> list[Column]:
+    columns = [
+        Column(name, declared_type)
+        for _, name, declared_type, *_ in con.execute(f"pragma table_info({table})")
+    ]
+    if not columns:
+        raise Exception(f"Table '{table}' does not exist")
+    skipped = [c.name for c in columns if not c.exported]
+    if skipped:
+        log.info(f"Not exporting text columns {skipped} of {table}")
+    return [c for c in columns if c.exported]
+
+
+def read_batches(
+    con: sqlite3.Connection, table: str, columns: list[Column], batch_size: int
+):
+    cursor = con.execute(
+        f"select {', '.join(c.select for c in columns)} from {table} order by rowid"
+    )
+    while rows := cursor.fetchmany(batch_size):
+        yield (
+            [column.encode(values) for column, values in zip(columns, zip(*rows))],
+            len(rows),
+        )
+
+
+def export_table_npy(
+    con: sqlite3.Connection,
+    table: str,
+    output: Path,
+    batch_size: int,
+    show_progress: bool,
+):
+    """
+    Writes every column of `table` into '<output>/<table>/<column>.npy'. The
+    row count is determined first so columns are written into preallocated
+    memory maps, memory use is bounded by `batch_size`.
+    """
+    columns = table_columns(con, table)
+    (count,) = con.execute(f"select count(*) from {table}").fetchone()
+    directory = output / table
+    directory.mkdir(parents=True, exist_ok=True)
+    arrays = [
+        np.lib.format.open_memmap(
+            directory / f"{c.name}.npy", mode="w+", dtype=c.dtype, shape=(count,)
+        )
+        for c in columns
+    ]
+    offset = 0
+    with tqdm(
+        total=count, desc=f"Exporting {table}", disable=not show_progress
+    ) as pbar:
+        for encoded, n in read_batches(con, table, columns, batch_size):
+            for array, values in zip(arrays, encoded):
+                array[offset : offset + n] = values
+            offset += n
+            pbar.update(n)
+    for array in arrays:
+        array.flush()
+    del arrays
+
+    for column in columns:
+        if column.categories is not None:
+            (directory / f"{column.name}.categories.json").write_text(
+                json.dumps(column.category_list())
+            )
+    (directory / "schema.json").write_text(
+        json.dumps(
+            {"rows": count, "columns": {c.name: c.describe() for c in columns}},
+            indent=2,
+        )
+    )
+    log.info(f"Exported {count} rows of {table} to {directory}")
+
+
+def export_table_parquet(
+    con: sqlite3.Connection,
+    table: str,
+    output: Path,
+    batch_size: int,
+    show_progress: bool,
+):
+    """
+    Writes `table` into '<output>/<table>.parquet', one row group per batch.
+    Categorical columns are stored as dictionary arrays.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise Exception("Parquet export requires pyarrow to be installed")
+
+    columns = table_columns(con, table)
+    (count,) = con.execute(f"select count(*) from {table}").fetchone()
+    path = output / f"{table}.parquet"
+    writer = None
+    with tqdm(
+        total=count, desc=f"Exporting {table}", disable=not show_progress
+    ) as pbar:
+        for encoded, n in read_batches(con, table, columns, batch_size):
+            arrays = []
+            for column, values in zip(columns, encoded):
+                if column.categories is None:
+                    arrays.append(pa.array(values))
+                else:
+                    # Categories only grow, earlier codes stay valid
+                    arrays.append(
+                        pa.DictionaryArray.from_arrays(
+                            pa.array(values),
+                            pa.array(column.category_list(), type=pa.string()),
+                        )
+                    )
+            batch = pa.RecordBatch.from_arrays(arrays, names=[c.name for c in columns])
+            if writer is None:
+                writer = pq.ParquetWriter(path, batch.schema)
+            writer.write_batch(batch)
+            pbar.update(n)
+    if writer is not None:
+        writer.close()
+    log.info(f"Exported {count} rows of {table} to {path}")
@@ -9,6 +9,8 @@
 import logging
 import re
 import sqlite3
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 from database import open_database
@@ -28,25 +30,127 @@ def register(parent_parser):
         help="Databse with syscall events",
         type=Path,
     )
+    parser.add_argument(
+        "--batch-size",
+        help="Number of consecutive events fetched, parsed and inserted at once",
+        type=int,
+        default=100_000,
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        help="Number of processes parsing events, 1 parses in the writing process",
+        type=int,
+        default=1,
+    )
 
 
-def extract_syscalls(con, handlers, show_progress):
-    with con:
-        for handler in handlers:
-            log.info(f"Extracting {handler.call}")
-            res = con.execute(
-                "select id, pid, unix_time, syscall, return_code, duration, args from syscall_events where syscall = ?",
-                (handler.call,),
-            )
-            for row in tqdm(
-                res,
-                desc=f"Extracting {handler.call} ",
-                disable=not show_progress,
-            ):
-                args_str = row[-1]
-                args = handler.handle(args_str)
-                data = (*row[:-1], *args)
-                con.execute(handler.insert(), data)
+# 'not indexed' makes sqlite walk the rowid range instead of the syscall index,
+# which would visit all events of a syscall for every batch.
+SELECT_EVENTS = """
+    select id, pid, unix_time, syscall, return_code, duration, args
+    from syscall_events not indexed
+    where id >= ? and id < ? and syscall in ({})
+    order by id
+"""
+
+# Connection and handlers of a worker process, created on first use
+_worker_state: tuple[sqlite3.Connection, list["SyscallHandler"]] | None = None
+
+
+def extract_range(
+    con: sqlite3.Connection, handlers: list["SyscallHandler"], start: int, stop: int
+) -> tuple[list[list[tuple]], int]:
+    """
+    Reads the events with ids in [start, stop) handled by `handlers` in a
+    single pass.
+
+    Returns
+    -------
+    tuple[list[list[tuple]], int]
+        Rows for the table of each handler and the number of ids covered.
+    """
+    calls = {handler.call: idx for idx, handler in enumerate(handlers)}
+    query = SELECT_EVENTS.format(",".join("?" * len(calls)))
+    events = [[] for _ in handlers]
+    for row in con.execute(query, (start, stop, *calls)):
+        events[calls[row[3]]].append(row)
+    rows = []
+    for handler, handler_events in zip(handlers, events):
+        args = handler.handle_many([event[-1] for event in handler_events])
+        rows.append([(*event[:-1], *a) for event, a in zip(handler_events, args)])
+    return rows, stop - start
+
+
+def _extract_range_in_worker(
+    database: Path, start: int, stop: int
+) -> tuple[list[list[tuple]], int]:
+    global _worker_state
+    if _worker_state is None:
+        con = sqlite3.connect(f"file:{database}?mode=ro", uri=True)
+        _worker_state = (con, make_handlers())
+    return extract_range(*_worker_state, start, stop)
+
+
+def make_work(con, batch_size: int) -> list[tuple[int, int]]:
+    """
+    Splits the ids of syscall_events into [start, stop) ranges of `batch_size`.
+    """
+    first, last = con.execute("select min(id), max(id) from syscall_events").fetchone()
+    if first is None:
+        return []
+    return [
+        (start, min(start + batch_size, last + 1))
+        for start in range(first, last + 1, batch_size)
+    ]
+
+
+def extract_syscalls(
+    con,
+    handlers,
+    show_progress,
+    *,
+    batch_size: int = 100_000,
+    jobs: int = 1,
+    database: Path | None = None,
+):
+    """
+    Extracts events in batches of `batch_size` consecutive ids. With `jobs` > 1
+    the batches are read and parsed by a process pool, this process only
+    inserts.
+    """
+    work = make_work(con, batch_size)
+    pbar = tqdm(
+        total=sum(stop - start for start, stop in work),
+        desc="Extracting",
+        disable=not show_progress,
+        unit="events",
+        unit_scale=True,
+    )
+
+    def insert(rows: list[list[tuple]], covered: int):
+        with con:
+            for handler, handler_rows in zip(handlers, rows):
+                con.executemany(handler.insert(), handler_rows)
+        pbar.update(covered)
+
+    if jobs > 1:
+        if database is None:
+            raise Exception("Parallel extraction requires the database path")
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            pending = deque()
+            for start, stop in work:
+                pending.append(
+                    pool.submit(_extract_range_in_worker, database, start, stop)
+                )
+                if len(pending) >= 2 * jobs:
+                    insert(*pending.popleft().result())
+            while pending:
+                insert(*pending.popleft().result())
+    else:
+        for start, stop in work:
+            insert(*extract_range(con, handlers, start, stop))
+    pbar.close()
 
 
 def create_tables(con: sqlite3.Connection, handlers):
@@ -59,9 +163,20 @@ def create_tables(con: sqlite3.Connection, handlers):
 
 def command_extract_io_events(args):
     con = open_database(args.database)
+    con.execute("pragma synchronous=off")
+    if args.jobs > 1:
+        # Lets worker processes read while this process writes
+        con.execute("pragma journal_mode=wal")
     handlers = make_handlers()
     create_tables(con, handlers)
-    extract_syscalls(con, handlers, args.progress)
+    extract_syscalls(
+        con,
+        handlers,
+        args.progress,
+        batch_size=args.batch_size,
+        jobs=args.jobs,
+        database=args.database,
+    )
 
 
 class SyscallHandler:
@@ -69,7 +184,11 @@ class SyscallHandler:
         self.call = call
         self.table = f"{call}_calls"
         self.expected_args = expected_args
-        self.regex = re.compile(regex)
+        # Args with newlines, e.g. in paths, break the batched match and are
+        # matched one by one
+        self.regex = re.compile(regex, re.DOTALL)
+        # Same pattern applied to many newline separated args at once
+        self.regex_many = re.compile(regex, re.MULTILINE)
         num_values = 6 + len(expected_args)
         part = ",".join(["?"] * num_values)
         self.insert_smt = f"insert into {self.table} values(null, {part})"
@@ -80,6 +199,15 @@ class SyscallHandler:
             raise Exception(f"Cannot match {self.call} args: {args}")
         return m.groups()
 
+    def handle_many(self, args: list[str]) -> list[tuple]:
+        matches = self.regex_many.findall("\n".join(args))
+        if len(matches) != len(args):
+            # At least one of the args does not match, handle() reports it
+            return [self.handle(a) for a in args]
+        if self.regex.groups == 1:
+            return [(m,) for m in matches]
+        return matches
+
     def create_table(self) -> str:
         return f"""
             create table {self.table}(
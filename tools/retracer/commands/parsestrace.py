@@ -6,17 +6,70 @@
 # granted to it by virtue of its status as an intergovernmental organisation
 # nor does it submit to any jurisdiction.
 
+import glob
 import logging
-import mmap
+import os
+import queue
 import re
+import select
 import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-from database import create_database
+from database import (
+    configure_bulk_load,
+    configure_streaming,
+    create_database,
+    create_indexes,
+)
 from tqdm import tqdm
 
 log = logging.getLogger(__name__)
 
+# Tool expects strace to be collected with the following flags:
+# strace -ff --decode-fds=path -ttt -qqq -T -s0  -o
+# '-ff'
+#       Follow forks and output into seperate files, the seperate files part is important
+#       because otherwise calls can be interrupted in the output and have to be put back together
+# '--decode-fds=path'
+#       Decode fds to allow context free parsing of syscalls
+# '-ttt'
+#       Use 'us' precision timestamps
+# '-qqq'
+#       Be quiet
+# '-T'
+#       Collect syscall duration
+# '-s0'
+#       Do not truncate lines
+#
+# Match: "<PID> <FRACTIONAL_UNITX_TIME_MICORSECONDS> <SYSCALL>(<ARGS>) = <RETURNCODE> <<DURATION_IN_SECONDS>>
+# Example: "1740472038.603714 close(3)       = 0 <0.000460>"
+# All whitespaces can be of arbitray length due to straces column aligned output and must be matched with ' +'
+# The pattern is applied to whole chunks of lines at once, hence multiline mode.
+MATCHER = re.compile(
+    rb"^(\d+\.\d+) +(\w+)\((.*)\) += +(-?\d+).*\<(\d+.\d+)\>$", re.MULTILINE
+)
+
+INSERT = "insert into syscall_events values(null,?,?,?,?,?,?)"
+
+# Streaming input may come from 'strace -f' without '-ff', where every line is
+# prefixed with the pid and calls of different threads interleave:
+# "1234 1740472038.603714 read(3</data/x>, <unfinished ...>"
+# "1234 1740472038.603801 <... read resumed>""..., 4096) = 4096 <0.000087>"
+LINE_MATCHER = re.compile(MATCHER.pattern.decode())
+PID_PREFIX = re.compile(r"^(\d+) +(\d+\.\d+ .*)$")
+UNFINISHED = re.compile(r"^(.*?)<unfinished \.\.\.>$")
+RESUMED = re.compile(r"^\d+\.\d+ +<\.\.\. \w+ resumed>(.*)$")
+
+# Seconds between polls of followed inputs that did not grow
+POLL_INTERVAL = 0.1
+# Maximum seconds parsed events of a followed input are held back
+FLUSH_INTERVAL = 0.5
+
 
 def register(parent_parser):
     parser = parent_parser.add_parser(
@@ -34,42 +87,168 @@ def register(parent_parser):
         help="Force overwrite of existing output database",
         action="store_true",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        help="Number of parser processes, 1 parses in the writing process",
+        type=int,
+        default=os.cpu_count(),
+    )
+    parser.add_argument(
+        "--chunk-size",
+        help="Size of the line aligned chunks handed to parser processes in MiB",
+        type=int,
+        default=16,
+    )
+    parser.add_argument(
+        "--follow",
+        help="Parses inputs while they are written: '-' reads stdin, FIFOs are read until "
+        "closed, regular files are followed until idle. Quoted glob patterns pick up "
+        "new '-ff' files as they appear.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        help="With --follow, stop following a file after it did not grow for this many seconds",
+        type=float,
+        default=60,
+    )
+    parser.add_argument(
+        "--commit-interval",
+        help="With --follow, maximum seconds between commits",
+        type=float,
+        default=1,
+    )
 
 
 def cmd(args):
     db = create_database(args.output, args.force)
-    parse_strace_file_into_database(args.input, db, args.progress)
+    if args.follow:
+        configure_streaming(db)
+        # Indexes are maintained from the start to allow queries during ingestion
+        create_indexes(db)
+        stream_strace_into_database(
+            [str(i) for i in args.input],
+            db,
+            args.progress,
+            idle_timeout=args.idle_timeout,
+            commit_interval=args.commit_interval,
+        )
+        return
+    configure_bulk_load(db)
+    parse_strace_file_into_database(
+        args.input,
+        db,
+        args.progress,
+        jobs=args.jobs,
+        chunk_size=args.chunk_size * 1024 * 1024,
+    )
+    create_indexes(db)
 
 
 def count_bytes(files: list[Path]) -> int:
     return sum(file.stat().st_size for file in files)
 
 
+def pid_from_path(file: Path) -> int | str:
+    # strace -ff -o <name> writes one file per pid named <name>.<pid>
+    pid = file.suffix[1:]
+    return int(pid) if pid.isdigit() else pid
+
+
+def split_into_chunks(file: Path, chunk_size: int) -> list[tuple[int, int]]:
+    """
+    Splits `file` into (start, end) byte ranges of roughly `chunk_size` bytes
+    that begin and end on line boundaries.
+    """
+    size = file.stat().st_size
+    chunks = []
+    start = 0
+    with open(file, "rb") as f:
+        while start < size:
+            end = start + chunk_size
+            if end < size:
+                f.seek(end)
+                f.readline()
+                end = f.tell()
+            end = min(end, size)
+            chunks.append((start, end))
+            start = end
+    return chunks
+
+
+def parse_lines(pid: int | str, data: bytes) -> tuple[list[tuple], int]:
+    """
+    Parses a block of complete strace lines.
+
+    Returns
+    -------
+    tuple[list[tuple], int]
+        Rows ready for insertion into syscall_events and the number of lines
+        that could not be matched.
+    """
+    rows = [
+        (
+            pid,
+            float(unix_time),
+            syscall.decode(),
+            args.decode("utf-8", errors="replace"),
+            int(return_code),
+            float(duration),
+        )
+        for unix_time, syscall, args, return_code, duration in MATCHER.findall(data)
+    ]
+    lines = data.count(b"\n") + (0 if not data or data.endswith(b"\n") else 1)
+    return rows, lines - len(rows)
+
+
+def parse_chunk(file: Path, start: int, end: int) -> tuple[list[tuple], int, int]:
+    with open(file, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    rows, unmatched = parse_lines(pid_from_path(file), data)
+    return rows, unmatched, end - start
+
+
+def _parse_serial(work):
+    for args in work:
+        yield parse_chunk(*args)
+
+
+def _parse_parallel(work, jobs: int):
+    # Bounds the number of parsed chunks waiting for the writer
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = deque()
+        for args in work:
+            pending.append(pool.submit(parse_chunk, *args))
+            if len(pending) >= 2 * jobs:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
 def parse_strace_file_into_database(
-    files: list[Path], database: sqlite3.Connection, show_progress: bool
+    files: list[Path],
+    database: sqlite3.Connection,
+    show_progress: bool,
+    *,
+    jobs: int = 1,
+    chunk_size: int = 16 * 1024 * 1024,
 ):
-    # Tool expects strace to be collected with the following flags:
-    # strace -ff --decode-fds=path -ttt -qqq -T -s0  -o
-    # '-ff'
-    #       Follow forks and output into seperate files, the seperate files part is important
-    #       because otherwise calls can be interrupted in the output and have to be put back together
-    # '--decode-fds=path'
-    #       Decode fds to allow context free parsing of syscalls
-    # '-ttt'
-    #       Use 'us' precision timestamps
-    # '-qqq'
-    #       Be quiet
-    # '-T'
-    #       Collect syscall duration
-    # '-s0'
-    #       Do not truncate lines
-    #
-    # Match: "<PID> <FRACTIONAL_UNITX_TIME_MICORSECONDS> <SYSCALL>(<ARGS>) = <RETURNCODE> <<DURATION_IN_SECONDS>>
-    # Example: "1740472038.603714 close(3)       = 0 <0.000460>"
-    # All whitespaces can be of arbitray length due to straces column aligned output and must be matched with ' +'
-    matcher = re.compile(r"^(\d+\.\d+) +(\w+)\((.*)\) += +(-?\d+).*\<(\d+.\d+)\>$")
-    pbar = tqdm(
-        files,
+    """
+    Parses `files` in line aligned chunks, in parallel if `jobs` > 1. Parsed
+    rows are written by this process only, one transaction per chunk, in file
+    order so that ids follow the order of the input.
+    """
+    work = [
+        (file, start, end)
+        for file in files
+        for start, end in split_into_chunks(file, chunk_size)
+    ]
+    log.info(f"Parsing {len(files)} files in {len(work)} chunks with {jobs} jobs")
+    results = _parse_parallel(work, jobs) if jobs > 1 else _parse_serial(work)
+    unmatched_total = 0
+    with tqdm(
         disable=not show_progress,
         total=count_bytes(files),
         unit="B",
@@ -77,20 +256,205 @@ def parse_strace_file_into_database(
         unit_divisor=1024,
         smoothing=0.7,
         mininterval=0.5,
-    )
-    for file in files:
-        pid = file.suffix[1:]
-        pbar.set_description(f"Processing {file}")
-        with open(file, "r+") as f:
-            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mmap_obj:
-                for line in iter(mmap_obj.readline, b""):
-                    pbar.update(len(line))
-                    m = matcher.match(line.decode("utf-8"))
-                    if not m:
-                        log.debug(f"Cannot match line: '{line}'")
-                    else:
-                        database.execute(
-                            "insert into syscall_events values(null,?,?,?,?,?,?)",
-                            tuple([pid, *m.groups()]),
-                        )
-    database.commit()
+    ) as pbar:
+        for rows, unmatched, nbytes in results:
+            with database:
+                database.executemany(INSERT, rows)
+            unmatched_total += unmatched
+            pbar.update(nbytes)
+    if unmatched_total:
+        log.debug(f"Skipped {unmatched_total} lines not matching a syscall")
+
+
+def to_row(pid: int | str, groups: tuple[str, ...]) -> tuple:
+    unix_time, syscall, args, return_code, duration = groups
+    return (pid, float(unix_time), syscall, args, int(return_code), float(duration))
+
+
+class LineAssembler:
+    """
+    Turns lines of a strace output stream into syscall_events rows, joining
+    '<unfinished ...>' lines with their '<... resumed>' continuation.
+    """
+
+    def __init__(self, default_pid: int | str):
+        self._default_pid = default_pid
+        self._unfinished: dict[int | str, str] = {}
+        self.unmatched = 0
+
+    def feed(self, line: str) -> tuple | None:
+        pid = self._default_pid
+        if m := PID_PREFIX.match(line):
+            pid = int(m.group(1))
+            line = m.group(2)
+        if m := UNFINISHED.match(line):
+            self._unfinished[pid] = m.group(1)
+            return None
+        if m := RESUMED.match(line):
+            start = self._unfinished.pop(pid, None)
+            if start is None:
+                self.unmatched += 1
+                return None
+            line = start + m.group(1)
+        if m := LINE_MATCHER.match(line):
+            return to_row(pid, m.groups())
+        self.unmatched += 1
+        return None
+
+
+def _follow_pipe(fd: int, stop: threading.Event):
+    """
+    Yields complete lines read from the pipe `fd` until the writer closes it
+    and None whenever no data arrived for `POLL_INTERVAL` seconds.
+    """
+    partial = b""
+    while not stop.is_set():
+        ready, _, _ = select.select([fd], [], [], POLL_INTERVAL)
+        if not ready:
+            yield None
+            continue
+        data = os.read(fd, 1 << 16)
+        if not data:
+            break
+        *lines, partial = (partial + data).split(b"\n")
+        for line in lines:
+            yield (line + b"\n").decode("utf-8", errors="replace")
+    if partial:
+        yield partial.decode("utf-8", errors="replace")
+
+
+def follow_lines(source: str, idle_timeout: float, stop: threading.Event):
+    """
+    Yields complete lines of `source`. stdin and FIFOs are read until the
+    writer closes them, regular files until they did not grow for
+    `idle_timeout` seconds. None is yielded whenever no line arrived for
+    `POLL_INTERVAL` seconds, which lets callers flush what they buffered.
+    """
+    if source == "-":
+        yield from _follow_pipe(sys.stdin.fileno(), stop)
+        return
+    with open(source, "rb") as f:
+        if not os.path.isfile(source):
+            yield from _follow_pipe(f.fileno(), stop)
+            return
+        partial = b""
+        last_data = time.monotonic()
+        while not stop.is_set():
+            line = f.readline()
+            if not line:
+                if time.monotonic() - last_data > idle_timeout:
+                    break
+                yield None
+                time.sleep(POLL_INTERVAL)
+                continue
+            last_data = time.monotonic()
+            partial += line
+            # The writer may be in the middle of a line
+            if partial.endswith(b"\n"):
+                yield partial.decode("utf-8", errors="replace")
+                partial = b""
+
+
+def read_source(
+    source: str,
+    rows: queue.Queue,
+    idle_timeout: float,
+    stop: threading.Event,
+    batch_size: int = 1024,
+):
+    pid = pid_from_path(Path(source)) if source != "-" else None
+    assembler = LineAssembler(pid)
+    batch = []
+    last_put = time.monotonic()
+    for line in follow_lines(source, idle_timeout, stop):
+        if line is not None:
+            row = assembler.feed(line.rstrip("\n"))
+            if row is not None:
+                batch.append(row)
+        # Small batches keep the queue cheap, the time limit keeps slow and
+        # idle sources live
+        if len(batch) >= batch_size or (
+            batch and time.monotonic() - last_put > FLUSH_INTERVAL
+        ):
+            rows.put(batch)
+            batch = []
+            last_put = time.monotonic()
+    if batch:
+        rows.put(batch)
+    if assembler.unmatched:
+        log.debug(f"Skipped {assembler.unmatched} lines of {source}")
+    log.info(f"Finished reading {source}")
+
+
+def stream_strace_into_database(
+    sources: list[str],
+    database: sqlite3.Connection,
+    show_progress: bool,
+    *,
+    idle_timeout: float = 60,
+    commit_interval: float = 1,
+    max_queued_batches: int = 256,
+):
+    """
+    Reads all `sources` concurrently and inserts their events as they arrive.
+
+    One thread per source parses lines into small batches and hands them to
+    this thread through a bounded queue, readers block when the writer falls
+    behind so memory stays bounded. Events are committed at least every
+    `commit_interval` seconds. Sources containing glob characters are expanded
+    repeatedly so files created later, e.g. by 'strace -ff' for new threads,
+    are picked up.
+    """
+    rows: queue.Queue = queue.Queue(maxsize=max_queued_batches)
+    stop = threading.Event()
+    readers: dict[str, threading.Thread] = {}
+    patterns = [s for s in sources if glob.has_magic(s)]
+
+    def start_readers(paths):
+        for path in paths:
+            if path not in readers:
+                thread = threading.Thread(
+                    target=read_source,
+                    args=(path, rows, idle_timeout, stop),
+                    daemon=True,
+                )
+                thread.start()
+                readers[path] = thread
+
+    start_readers(s for s in sources if not glob.has_magic(s))
+    pending = []
+    last_commit = time.monotonic()
+    last_discovery = 0.0
+    with tqdm(disable=not show_progress, unit="events", unit_scale=True) as pbar:
+        try:
+            while True:
+                if patterns and time.monotonic() - last_discovery > 1:
+                    start_readers(
+                        sorted(p for pattern in patterns for p in glob.glob(pattern))
+                    )
+                    last_discovery = time.monotonic()
+                try:
+                    pending.extend(rows.get(timeout=0.1))
+                except queue.Empty:
+                    pass
+                now = time.monotonic()
+                if pending and now - last_commit >= commit_interval:
+                    with database:
+                        database.executemany(INSERT, pending)
+                    pbar.update(len(pending))
+                    pending = []
+                    last_commit = now
+                if (
+                    rows.empty()
+                    and not any(t.is_alive() for t in readers.values())
+                    and (not patterns or readers)
+                ):
+                    break
+        except KeyboardInterrupt:
+            log.info("Interrupted, writing remaining events")
+            stop.set()
+        while not rows.empty():
+            pending.extend(rows.get())
+        with database:
+            database.executemany(INSERT, pending)
+        pbar.update(len(pending))
@@ -0,0 +1,303 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from commands.analyze import PERCENTILES, format_bytes, print_table
+from database import open_database
+from tqdm import tqdm
+
+log = logging.getLogger(__name__)
+
+REPLAYED_CALLS = ["openat", "lseek", "read", "close"]
+
+# Events replayed between progress updates
+PROGRESS_INTERVAL = 1024
+
+
+def register(parent_parser):
+    parser = parent_parser.add_parser(
+        "replay",
+        help="Replays recorded openat/lseek/read/close calls against a directory.",
+    )
+    parser.set_defaults(func=cmd)
+    parser.add_argument(
+        "database",
+        help="Database with extracted syscalls, see extract-io-syscalls",
+        type=Path,
+    )
+    parser.add_argument(
+        "target",
+        help="Directory recorded paths are replayed in, e.g. '/data/x' becomes '<target>/data/x'",
+        type=Path,
+    )
+    parser.add_argument(
+        "-m",
+        "--map",
+        help="Maps a recorded path prefix to a replay path prefix, OLD=NEW, takes precedence over target",
+        action="append",
+        default=[],
+    )
+    parser.add_argument(
+        "--speed",
+        help="Replays the recorded timing sped up by this factor, 0 replays as fast as possible",
+        type=float,
+        default=0,
+    )
+    parser.add_argument(
+        "-s",
+        "--streams",
+        help="Number of recorded processes replayed concurrently",
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        "--pid", help="Only replay these recorded pids", type=int, nargs="+"
+    )
+    parser.add_argument("--json", help="Write the results as JSON", type=Path)
+
+
+class PathMapper:
+    def __init__(self, target: Path, mappings: list[str]):
+        self._target = target
+        self._mappings = []
+        for mapping in mappings:
+            old, sep, new = mapping.partition("=")
+            if not sep:
+                raise Exception(f"Invalid path mapping '{mapping}', expected OLD=NEW")
+            self._mappings.append((old, new))
+        # Longest prefix wins
+        self._mappings.sort(key=lambda m: len(m[0]), reverse=True)
+
+    def __call__(self, path: str) -> str:
+        for old, new in self._mappings:
+            if path.startswith(old):
+                return new + path[len(old) :]
+        return str(self._target / path.lstrip("/"))
+
+
+class ReplayStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = {call: array("d") for call in REPLAYED_CALLS}
+        self.bytes_read = 0
+        self.errors = 0
+
+    def merge(self, latencies: dict[str, array], bytes_read: int, errors: int):
+        with self._lock:
+            for call, values in latencies.items():
+                self.latencies[call].extend(values)
+            self.bytes_read += bytes_read
+            self.errors += errors
+
+
+def create_replay_indexes(con: sqlite3.Connection):
+    with con:
+        for call in REPLAYED_CALLS:
+            con.execute(
+                f"create index if not exists {call}_calls_pid_idx on {call}_calls(pid, syscall_events_id)"
+            )
+
+
+def recorded_pids(con: sqlite3.Connection) -> list[int]:
+    return [pid for (pid,) in con.execute("select distinct pid from openat_calls")]
+
+
+# Replayed value and row filter of each call, failed calls are not replayed
+REPLAYED_EVENTS = {
+    "openat": ("null", "return_code >= 0"),
+    "lseek": ("return_code", "return_code >= 0"),
+    "read": ("return_code", "return_code >= 0"),
+    "close": ("null", None),
+}
+
+
+def replayed_events_query(columns: str, pids: str) -> str:
+    return " union all ".join(
+        f"select {columns.format(value=value)} from {call}_calls "
+        f"where pid in ({pids})" + (f" and {condition}" if condition else "")
+        for call, (value, condition) in REPLAYED_EVENTS.items()
+    )
+
+
+def recorded_events(
+    con: sqlite3.Connection, pids: list[int]
+) -> tuple[int, float | None]:
+    """
+    Number of replayed events of `pids` and the time of the first one.
+    """
+    query = replayed_events_query("count(*), min(unix_time)", ",".join("?" * len(pids)))
+    counts = con.execute(query, pids * len(REPLAYED_EVENTS)).fetchall()
+    starts = [start for _, start in counts if start is not None]
+    return sum(count for count, _ in counts), min(starts, default=None)
+
+
+def stream_events(con: sqlite3.Connection, pid: int):
+    """
+    Yields (unix_time, call, path, value) of a process in recorded order.
+    `value` is the new offset for lseek and the number of bytes read for read.
+    """
+    query = replayed_events_query(
+        "syscall_events_id, unix_time, syscall, path, {value}", ":pid"
+    )
+    for _, *event in con.execute(query + " order by 1", {"pid": pid}):
+        yield event
+
+
+def replay_stream(
+    database: Path,
+    pid: int,
+    mapper: PathMapper,
+    speed: float,
+    recorded_start: float,
+    replay_start: float,
+    stats: ReplayStats,
+    progress,
+):
+    con = sqlite3.connect(f"file:{database}?mode=ro", uri=True)
+    latencies = {call: array("d") for call in REPLAYED_CALLS}
+    # Grows to the largest read of the stream
+    view = memoryview(bytearray(0))
+    # Recorded paths can be opened multiple times, the latest open is used
+    fds: dict[str, list[int]] = {}
+    bytes_read = 0
+    errors = 0
+    replayed = 0
+    try:
+        for unix_time, call, path, value in stream_events(con, pid):
+            if speed > 0:
+                delay = replay_start + (unix_time - recorded_start) / speed
+                delay -= time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            open_fds = fds.setdefault(path, [])
+            # Calls on files opened before tracing started or whose open
+            # failed in the replay are skipped
+            skip = call != "openat" and not open_fds
+            try:
+                t0 = time.perf_counter()
+                if skip:
+                    pass
+                elif call == "openat":
+                    open_fds.append(os.open(mapper(path), os.O_RDONLY))
+                elif call == "close":
+                    os.close(open_fds.pop())
+                elif call == "lseek":
+                    os.lseek(open_fds[-1], int(value), os.SEEK_SET)
+                else:
+                    size = int(value)
+                    if len(view) < size:
+                        view = memoryview(bytearray(size))
+                    bytes_read += os.readv(open_fds[-1], [view[:size]])
+                if not skip:
+                    latencies[call].append(time.perf_counter() - t0)
+            except OSError as e:
+                log.debug(f"Replay of {call} on {path} failed: {e}")
+                errors += 1
+            replayed += 1
+            if replayed == PROGRESS_INTERVAL:
+                progress.update(replayed)
+                replayed = 0
+    finally:
+        progress.update(replayed)
+        for open_fds in fds.values():
+            for fd in open_fds:
+                os.close(fd)
+        con.close()
+    stats.merge(latencies, bytes_read, errors)
+
+
+def cmd(args):
+    con = open_database(args.database)
+    create_replay_indexes(con)
+    pids = args.pid or recorded_pids(con)
+    event_count, recorded_start = recorded_events(con, pids)
+    con.close()
+
+    mapper = PathMapper(args.target, args.map)
+    stats = ReplayStats()
+    log.info(f"Replaying {event_count} events of {len(pids)} processes")
+    with tqdm(
+        total=event_count, disable=not args.progress, unit="events", unit_scale=True
+    ) as progress:
+        replay_start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.streams) as pool:
+            futures = [
+                pool.submit(
+                    replay_stream,
+                    args.database,
+                    pid,
+                    mapper,
+                    args.speed,
+                    recorded_start,
+                    replay_start,
+                    stats,
+                    progress,
+                )
+                for pid in pids
+            ]
+            for future in futures:
+                future.result()
+        elapsed = time.perf_counter() - replay_start
+
+    results = {
+        "processes": len(pids),
+        "streams": args.streams,
+        "speed": args.speed,
+        "seconds": elapsed,
+        "bytes_read": stats.bytes_read,
+        "bytes_per_second": stats.bytes_read / elapsed if elapsed else 0.0,
+        "errors": stats.errors,
+        "calls": {},
+    }
+    for call, values in stats.latencies.items():
+        if not values:
+            continue
+        latencies = np.frombuffer(values, dtype=np.float64)
+        results["calls"][call] = {
+            "count": len(latencies),
+            "per_second": len(latencies) / elapsed if elapsed else 0.0,
+            "mean_seconds": float(latencies.mean()),
+            **{
+                f"p{p:g}_seconds": float(v)
+                for p, v in zip(PERCENTILES, np.percentile(latencies, PERCENTILES))
+            },
+            "max_seconds": float(latencies.max()),
+        }
+
+    print(
+        f"Replayed {len(pids)} processes in {elapsed:.3f} s, read "
+        f"{format_bytes(stats.bytes_read)} at {format_bytes(results['bytes_per_second'])}/s, "
+        f"{stats.errors} errors"
+    )
+    print_table(
+        "Latencies",
+        ["syscall", "count", "per s", "mean us", *[f"p{p:g} us" for p in PERCENTILES]],
+        [
+            [
+                call,
+                r["count"],
+                f"{r['per_second']:.0f}",
+                f"{r['mean_seconds'] * 1e6:.1f}",
+                *[f"{r[f'p{p:g}_seconds'] * 1e6:.1f}" for p in PERCENTILES],
+            ]
+            for call, r in results["calls"].items()
+        ],
+    )
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"Results written to {args.json}")
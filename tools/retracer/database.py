@@ -43,19 +43,49 @@ def create_database(file: Path, force: bool) -> sqlite3.Connection:
             )
             """
         )
+    return con
+
+
+def configure_bulk_load(con: sqlite3.Connection) -> None:
+    """
+    Trades durability for insert speed. A crash during ingestion leaves a
+    corrupt database, which is acceptable as ingestion can simply be rerun.
+    """
+    con.execute("pragma journal_mode=off")
+    con.execute("pragma synchronous=off")
+    con.execute("pragma temp_store=memory")
+    con.execute("pragma cache_size=-262144")
+    con.execute("pragma locking_mode=exclusive")
+
+
+def configure_streaming(con: sqlite3.Connection) -> None:
+    """
+    Lets other connections query the database while events are inserted.
+    """
+    con.execute("pragma journal_mode=wal")
+    con.execute("pragma synchronous=normal")
+    con.execute("pragma cache_size=-262144")
+
+
+def create_indexes(con: sqlite3.Connection) -> None:
+    """
+    Indexes are created once all events are inserted, maintaining them during
+    ingestion slows inserts down considerably.
+    """
+    logger.debug("Creating indexes on syscall_events")
+    with con:
         con.execute(
             """
-            create index syscall_events_syscall_pid_time_idx on syscall_events(
-                syscall, pid, unix_time
-            );
+            create index if not exists syscall_events_syscall_pid_time_idx
+                on syscall_events(syscall, pid, unix_time)
             """
         )
         con.execute(
             """
-             create index syscall_events_time_idx on syscall_events(unix_time);
+            create index if not exists syscall_events_time_idx
+                on syscall_events(unix_time)
             """
         )
-    return con
 
 
 def open_database(file: Path) -> sqlite3.Connection: